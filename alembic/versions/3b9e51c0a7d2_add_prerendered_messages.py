@@ -0,0 +1,30 @@
+"""Add pre-rendered Telegram messages to jobs
+
+Revision ID: 3b9e51c0a7d2
+Revises: 74069bee7d1c
+Create Date: 2026-10-19 09:12:31.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e51c0a7d2'
+down_revision: Union[str, None] = '74069bee7d1c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('message_markdown', sa.Text(), nullable=True))
+    op.add_column('jobs', sa.Column('message_plain', sa.Text(), nullable=True))
+    op.add_column('jobs', sa.Column('message_version', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'message_version')
+    op.drop_column('jobs', 'message_plain')
+    op.drop_column('jobs', 'message_markdown')
@@ -0,0 +1,48 @@
+"""Add runs table for scrape/send run history
+
+Revision ID: 5d2a7f3c9e14
+Revises: 8c4f2d6e1a93
+Create Date: 2026-10-19 14:21:08.318504
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a7f3c9e14'
+down_revision: Union[str, None] = '8c4f2d6e1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'runs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('operation', sa.String(length=20), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('duration_seconds', sa.Float(), nullable=True),
+        sa.Column('network_seconds', sa.Float(), nullable=True),
+        sa.Column('parse_seconds', sa.Float(), nullable=True),
+        sa.Column('db_seconds', sa.Float(), nullable=True),
+        sa.Column('send_seconds', sa.Float(), nullable=True),
+        sa.Column('rows_fetched', sa.Integer(), nullable=True),
+        sa.Column('new_rows', sa.Integer(), nullable=True),
+        sa.Column('duplicates', sa.Integer(), nullable=True),
+        sa.Column('sent_count', sa.Integer(), nullable=True),
+        sa.Column('error_class', sa.String(length=100), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_runs_category_operation', 'runs', ['category', 'operation', 'started_at'], unique=False)
+    op.create_index('idx_runs_started_at', 'runs', ['started_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_runs_started_at', table_name='runs')
+    op.drop_index('idx_runs_category_operation', table_name='runs')
+    op.drop_table('runs')
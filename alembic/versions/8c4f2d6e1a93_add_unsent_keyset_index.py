@@ -0,0 +1,29 @@
+"""Add keyset index for paging unsent jobs
+
+Revision ID: 8c4f2d6e1a93
+Revises: 3b9e51c0a7d2
+Create Date: 2026-10-19 10:03:54.662130
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4f2d6e1a93'
+down_revision: Union[str, None] = '3b9e51c0a7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_unsent_keyset',
+        'jobs',
+        ['category', 'sent_to_telegram', 'date_posted', 'created_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_unsent_keyset', table_name='jobs')
@@ -0,0 +1,33 @@
+"""Add schedule_state table for missed-run catch-up
+
+Revision ID: c71e0b4d2f58
+Revises: 5d2a7f3c9e14
+Create Date: 2026-10-19 15:02:41.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71e0b4d2f58'
+down_revision: Union[str, None] = '5d2a7f3c9e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'schedule_state',
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('operation', sa.String(length=20), nullable=False),
+        sa.Column('last_success_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('category', 'operation')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('schedule_state')
@@ -0,0 +1,255 @@
+"""
+Load-aware balancing of scrape_hours / send_hours from the run history
+"""
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import yaml
+
+from france_chomage.categories import CategoryConfig
+from france_chomage.database import connection
+from france_chomage.database.repository import RunRepository
+
+DEFAULT_HISTORY_DAYS = 14
+DEFAULT_SCRAPE_SECONDS = 60.0
+TELEGRAM_SITE = "telegram"  # Pseudo-site carrying the send load
+
+# category -> (scrape_hours, send_hours)
+SchedulePlan = Dict[str, Tuple[List[int], List[int]]]
+# hour -> site -> seconds
+HourlyLoad = Dict[int, Dict[str, float]]
+
+
+@dataclass
+class CategoryCost:
+    """Measured cost of one scrape of a category"""
+    name: str
+    scrape_seconds: float = DEFAULT_SCRAPE_SECONDS
+    new_jobs: float = 0.0
+    runs: int = 0
+
+    def scrape_load(self, sites: Iterable[str]) -> Dict[str, float]:
+        """
+        Scrape seconds per site, split evenly across the sites
+        The run history only keeps the total scrape duration, not a per-site
+        breakdown, so every site is charged the same share.
+        """
+        sites = list(sites)
+        return {site: self.scrape_seconds / len(sites) for site in sites}
+
+    def send_load(self, send_interval: float) -> Dict[str, float]:
+        """Seconds spent posting the jobs of one scrape"""
+        return {TELEGRAM_SITE: self.new_jobs * send_interval}
+
+
+def costs_from_averages(averages: Dict[str, Dict[str, float]]) -> Dict[str, CategoryCost]:
+    """Build category costs from RunRepository.get_average_costs() rows"""
+    return {
+        name: CategoryCost(
+            name=name,
+            scrape_seconds=row["duration_seconds"] or DEFAULT_SCRAPE_SECONDS,
+            new_jobs=row["new_rows"],
+            runs=row["runs"],
+        )
+        for name, row in averages.items()
+    }
+
+
+async def load_run_costs(days: int = DEFAULT_HISTORY_DAYS) -> Dict[str, CategoryCost]:
+    """Average scrape costs of the last `days` days from the run history"""
+    connection.initialize_database()
+    if connection.async_session_factory is None:
+        raise RuntimeError("Database not properly initialized")
+    async with connection.async_session_factory() as session:
+        averages = await RunRepository(session).get_average_costs("scrape", days=days)
+    return costs_from_averages(averages)
+
+
+def fill_missing_costs(
+    categories: Dict[str, CategoryConfig],
+    costs: Dict[str, CategoryCost]
+) -> Dict[str, CategoryCost]:
+    """Give categories without measurements the median measured cost"""
+    measured = [cost for name, cost in costs.items() if name in categories]
+    default_seconds = (
+        statistics.median(cost.scrape_seconds for cost in measured)
+        if measured else DEFAULT_SCRAPE_SECONDS
+    )
+    default_new_jobs = statistics.median(cost.new_jobs for cost in measured) if measured else 0.0
+
+    return {
+        name: costs.get(name) or CategoryCost(
+            name=name, scrape_seconds=default_seconds, new_jobs=default_new_jobs
+        )
+        for name in categories
+    }
+
+
+def hourly_load(
+    plan: SchedulePlan,
+    costs: Dict[str, CategoryCost],
+    sites: Iterable[str],
+    send_interval: float = 2.0
+) -> HourlyLoad:
+    """Seconds of work per hour and per site for a plan"""
+    sites = list(sites)
+    load: HourlyLoad = {hour: {} for hour in range(24)}
+    for name, (scrape_hours, send_hours) in plan.items():
+        cost = costs[name]
+        for hour in scrape_hours:
+            for site, seconds in cost.scrape_load(sites).items():
+                load[hour][site] = load[hour].get(site, 0.0) + seconds
+        for hour in send_hours:
+            for site, seconds in cost.send_load(send_interval).items():
+                load[hour][site] = load[hour].get(site, 0.0) + seconds
+    return load
+
+
+def peak_load(load: HourlyLoad) -> float:
+    """Highest per-site load of any hour"""
+    return max((seconds for sites in load.values() for seconds in sites.values()), default=0.0)
+
+
+def current_plan(categories: Dict[str, CategoryConfig]) -> SchedulePlan:
+    """Plan as currently configured in categories.yml"""
+    return {
+        name: (list(config.scrape_hours), list(config.send_hours))
+        for name, config in categories.items()
+    }
+
+
+def balance_schedule(
+    categories: Dict[str, CategoryConfig],
+    costs: Dict[str, CategoryCost],
+    sites: Iterable[str],
+    send_offset: int = 1,
+    max_per_hour: int = 3,
+    send_interval: float = 2.0
+) -> SchedulePlan:
+    """
+    Place scrapes so that the peak per-site load of any hour is minimal
+    Each category keeps its number of scrapes and sends; each send follows
+    a scrape by `send_offset` hours. Placement is greedy, most expensive
+    categories first (LPT), preferring the hour with the lowest resulting
+    peak, then the fewest categories, then the currently configured hour.
+    Sends beyond the number of scrapes are then placed on their own, at the
+    hour with the lowest Telegram load. Per-site scrape load is an even
+    split (see CategoryCost.scrape_load).
+    """
+    sites = list(sites)
+    costs = fill_missing_costs(categories, costs)
+    load: HourlyLoad = {hour: {} for hour in range(24)}
+    scrape_count = {hour: 0 for hour in range(24)}
+    plan: SchedulePlan = {name: ([], []) for name in categories}
+
+    occurrences = []
+    for name, config in categories.items():
+        for index, hour in enumerate(config.scrape_hours):
+            occurrences.append((name, index, hour))
+    occurrences.sort(key=lambda item: (-costs[item[0]].scrape_seconds, item[0], item[1]))
+
+    for name, index, configured_hour in occurrences:
+        cost = costs[name]
+        config = categories[name]
+        scrape_load = cost.scrape_load(sites)
+        with_send = index < len(config.send_hours)
+        send_load = cost.send_load(send_interval) if with_send else {}
+
+        # Keep repeated scrapes of a category apart
+        taken = plan[name][0]
+        min_gap = 24 // (len(config.scrape_hours) * 2) if len(config.scrape_hours) > 1 else 0
+
+        def score(hour: int):
+            send_hour = (hour + send_offset) % 24
+            peak = 0.0
+            for site, seconds in scrape_load.items():
+                peak = max(peak, load[hour].get(site, 0.0) + seconds)
+            for site, seconds in send_load.items():
+                peak = max(peak, load[send_hour].get(site, 0.0) + seconds)
+            too_close = any(min((hour - t) % 24, (t - hour) % 24) < min_gap for t in taken)
+            return (
+                scrape_count[hour] >= max_per_hour,
+                too_close,
+                round(peak, 6),
+                scrape_count[hour],
+                min((hour - configured_hour) % 24, (configured_hour - hour) % 24),
+            )
+
+        hour = min(range(24), key=score)
+        send_hour = (hour + send_offset) % 24
+
+        for site, seconds in scrape_load.items():
+            load[hour][site] = load[hour].get(site, 0.0) + seconds
+        for site, seconds in send_load.items():
+            load[send_hour][site] = load[send_hour].get(site, 0.0) + seconds
+        scrape_count[hour] += 1
+
+        plan[name][0].append(hour)
+        if with_send:
+            plan[name][1].append(send_hour)
+
+    extra_sends = [
+        (name, hour)
+        for name, config in categories.items()
+        for hour in config.send_hours[len(config.scrape_hours):]
+    ]
+    extra_sends.sort(key=lambda item: (-costs[item[0]].new_jobs, item[0], item[1]))
+
+    for name, configured_hour in extra_sends:
+        send_load = costs[name].send_load(send_interval)
+        taken = plan[name][1]
+
+        def send_score(hour: int):
+            peak = max(
+                (load[hour].get(site, 0.0) + seconds for site, seconds in send_load.items()),
+                default=0.0
+            )
+            return (
+                hour in taken,
+                round(peak, 6),
+                min((hour - configured_hour) % 24, (configured_hour - hour) % 24),
+            )
+
+        hour = min(range(24), key=send_score)
+        for site, seconds in send_load.items():
+            load[hour][site] = load[hour].get(site, 0.0) + seconds
+        taken.append(hour)
+
+    return {
+        name: (sorted(scrape_hours), sorted(send_hours))
+        for name, (scrape_hours, send_hours) in plan.items()
+    }
+
+
+def diff_plan(old: SchedulePlan, new: SchedulePlan) -> List[str]:
+    """Human-readable changes between two plans"""
+    def hours(values: List[int]) -> str:
+        return ', '.join(f"{hour:02d}:00" for hour in sorted(values)) or "-"
+
+    lines = []
+    for name in sorted(new):
+        old_scrape, old_send = old.get(name, ([], []))
+        new_scrape, new_send = new[name]
+        if sorted(old_scrape) != new_scrape or sorted(old_send) != new_send:
+            lines.append(
+                f"{name}: scrape {hours(old_scrape)} -> {hours(new_scrape)}, "
+                f"send {hours(old_send)} -> {hours(new_send)}"
+            )
+    return lines
+
+
+def apply_plan(plan: SchedulePlan, config_path: str = "categories.yml") -> None:
+    """Write the planned scrape_hours / send_hours to categories.yml"""
+    path = Path(config_path)
+    with path.open('r', encoding='utf-8') as f:
+        data = yaml.safe_load(f)
+
+    for name, (scrape_hours, send_hours) in plan.items():
+        if name in data.get('categories', {}):
+            data['categories'][name]['scrape_hours'] = scrape_hours
+            data['categories'][name]['send_hours'] = send_hours
+
+    with path.open('w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f, sort_keys=False, allow_unicode=True, default_flow_style=False)
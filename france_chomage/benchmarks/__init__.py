@@ -0,0 +1,14 @@
+"""
+Benchmarks for the scraping and sending pipeline
+"""
+from .sender import run_sender_benchmark, make_synthetic_jobs
+from .simulation import run_simulation, SimulatedProvider
+from .pipeline import run_pipeline_benchmark
+
+__all__ = [
+    "run_sender_benchmark",
+    "make_synthetic_jobs",
+    "run_simulation",
+    "SimulatedProvider",
+    "run_pipeline_benchmark"
+]
@@ -0,0 +1,198 @@
+"""
+Scraping pipeline benchmark on recorded jobspy responses
+
+Replays the fixtures recorded with SCRAPE_RECORD_DIR (see
+france_chomage.scraping.fixtures) with no network:
+
+- parsing: `_dataframe_to_jobs` on each category's rows, repeated, best and
+  median times reported;
+- with a database: two full `scrape()` passes per category through
+  ReplayProvider, the first inserting every row (URLs get a per-run suffix
+  so earlier runs do not turn them into duplicates), the second finding
+  them all as duplicates. The job URL cache starts empty, so both passes
+  hit the database for each lookup. Stage times come from
+  `ScraperBase.timings()`.
+
+Jobs are saved under `bench_<category>` so no scheduled send picks them up,
+and deleted once the passes are done.
+"""
+import contextlib
+import json
+import logging
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from france_chomage import __version__
+from france_chomage.categories import CategoryConfig
+from france_chomage.config import settings
+from france_chomage.database.manager import JobManager
+from france_chomage.scraping.base import STAGES
+from france_chomage.scraping.category_scraper import CategoryScraper
+from france_chomage.scraping.fixtures import FIXTURE_VERSION, ReplayProvider, list_fixtures
+
+logger = logging.getLogger(__name__)
+
+PASSES = ("insert", "duplicate")
+
+
+class FreshReplayProvider(ReplayProvider):
+    """Replay with a suffix on every job URL, unique to the benchmark run"""
+
+    def __init__(self, directory: str, category: str, url_suffix: str):
+        super().__init__(directory, category=category)
+        self.url_suffix = url_suffix
+
+    def load(self, category: str, sites: List[str]):
+        df = super().load(category, sites)
+        return df.assign(job_url=df["job_url"].astype(str) + self.url_suffix)
+
+
+def _bench_parse(scraper: CategoryScraper, df, repeat: int) -> Dict[str, Any]:
+    """Time `_dataframe_to_jobs` `repeat` times"""
+    walls, cpus = [], []
+    for _ in range(max(1, repeat)):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        jobs = scraper._dataframe_to_jobs(df)
+        walls.append(time.perf_counter() - wall_start)
+        cpus.append(time.process_time() - cpu_start)
+    return {
+        "rows": len(df),
+        "jobs": len(jobs),
+        "best_seconds": round(min(walls), 6),
+        "median_seconds": round(statistics.median(walls), 6),
+        "cpu_per_row_us": round(min(cpus) / max(1, len(df)) * 1e6, 3),
+    }
+
+
+async def _bench_scrape(
+    directory: Path,
+    fixtures: Dict[str, List[str]],
+    url_suffix: str
+) -> List[Dict[str, Any]]:
+    """Run the insert and duplicate passes through ScraperBase.scrape()"""
+    overrides = {"scrape_delay_min": 0.0, "scrape_delay_max": 0.0, "max_retries": 1}
+    passes = []
+    with contextlib.ExitStack() as stack:
+        for name, value in overrides.items():
+            stack.callback(setattr, settings, name, getattr(settings, name))
+            setattr(settings, name, value)
+        # JSON backups of the scrapers go to a scratch directory
+        stack.enter_context(contextlib.chdir(stack.enter_context(tempfile.TemporaryDirectory())))
+
+        for pass_name in PASSES:
+            manager = JobManager()
+            manager._cache_loaded = True  # Every lookup goes to the database
+            categories = []
+            for category, sites in fixtures.items():
+                scraper = CategoryScraper(CategoryConfig(
+                    name=f"bench_{category}", search_terms=category,
+                    telegram_topic_id=1, schedule_hour=0
+                ))
+                scraper.provider = FreshReplayProvider(str(directory), category, url_suffix)
+                scraper.manager = manager
+                scraper.sites = sites
+                started = time.perf_counter()
+                await scraper.scrape()
+                categories.append({
+                    "category": category,
+                    "wall_seconds": round(time.perf_counter() - started, 6),
+                    "rows": scraper.stats.get("rows_fetched", 0),
+                    "new_rows": scraper.stats.get("new_rows", 0),
+                    "duplicates": scraper.stats.get("duplicates", 0),
+                    "timings": scraper.timings(),
+                })
+            passes.append({
+                "pass": pass_name,
+                "wall_seconds": round(sum(item["wall_seconds"] for item in categories), 6),
+                "new_rows": sum(item["new_rows"] for item in categories),
+                "duplicates": sum(item["duplicates"] for item in categories),
+                "stage_seconds": {
+                    name: round(sum(item["timings"].get(name, 0.0) for item in categories), 6)
+                    for name, _ in STAGES
+                },
+                "categories": categories,
+            })
+    return passes
+
+
+async def _delete_bench_jobs(categories: List[str]) -> None:
+    """Remove the `bench_<category>` jobs written by the scrape passes"""
+    try:
+        names = [f"bench_{category}" for category in categories]
+        deleted = await JobManager().delete_categories(names)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not delete the benchmark jobs: {e}")
+        return
+    logger.info(f"🧹 Deleted {deleted} benchmark jobs")
+
+
+async def run_pipeline_benchmark(
+    fixtures_dir: str,
+    repeat: int = 5,
+    database: bool = True,
+    output: Optional[str] = None
+) -> Dict[str, Any]:
+    """Benchmark parsing (and persistence) on recorded fixtures, write a JSON report"""
+    # Absolute: the scrape passes run from a scratch directory
+    directory = Path(fixtures_dir).resolve()
+    fixtures = list_fixtures(directory)
+    if not fixtures:
+        raise FileNotFoundError(f"No fixtures in {directory} (record some with SCRAPE_RECORD_DIR)")
+
+    parsing = []
+    for category, sites in fixtures.items():
+        df = ReplayProvider(str(directory)).load(category, sites)
+        scraper = CategoryScraper(CategoryConfig(
+            name=f"bench_{category}", search_terms=category, telegram_topic_id=1, schedule_hour=0
+        ))
+        parsing.append({"category": category, "sites": sites, **_bench_parse(scraper, df, repeat)})
+
+    rows = sum(item["rows"] for item in parsing)
+    best = sum(item["best_seconds"] for item in parsing)
+    logger.info(
+        f"📊 Parsing: {rows} rows from {len(parsing)} categories "
+        f"in {best * 1000:.1f}ms (best of {repeat})"
+    )
+
+    passes = []
+    if database:
+        try:
+            url_suffix = f"#bench-{datetime.now():%Y%m%d%H%M%S}"
+            passes = await _bench_scrape(directory, fixtures, url_suffix)
+        finally:
+            await _delete_bench_jobs(list(fixtures))
+        for result in passes:
+            stages = result["stage_seconds"]
+            logger.info(
+                f"📊 {result['pass'].capitalize()} pass: {result['new_rows']} new, "
+                f"{result['duplicates']} duplicates in {result['wall_seconds']:.2f}s "
+                f"(parse {stages['parse']:.2f}s, dedup {stages['dedup']:.2f}s, "
+                f"insert {stages['insert']:.2f}s, backup {stages['backup']:.2f}s)"
+            )
+
+    report = {
+        "benchmark": "scraping_pipeline",
+        "version": __version__,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "parameters": {
+            "fixtures_dir": str(directory),
+            "fixture_version": FIXTURE_VERSION,
+            "repeat": repeat,
+            "database": database,
+        },
+        "parsing": parsing,
+        "passes": passes,
+    }
+
+    if output is None:
+        output = f"bench_pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with Path(output).open("w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logger.info(f"💾 Benchmark results written to {output}")
+
+    report["output"] = output
+    return report
@@ -0,0 +1,307 @@
+"""
+Telegram sender throughput benchmark
+
+Pushes synthetic DBJob batches through format_job_message, escape_markdown
+and send_jobs_from_database against a fake bot (or the local stub Telegram
+server) and an in-memory job store, then writes the results to JSON.
+With the in-memory store, marking jobs as sent only costs the simulated
+`mark_latency` (`mark_simulated_seconds` in the report). With `database`,
+the batch is inserted under `bench_sender` and the real SentJobBuffer
+flushes are timed (`mark_db_seconds`); the rows are deleted afterwards.
+"""
+import asyncio
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from france_chomage import __version__
+from france_chomage.config import settings
+from france_chomage.database import connection
+from france_chomage.database.manager import JobManager
+from france_chomage.database.models import Job as DBJob
+from france_chomage.formatting import (
+    MESSAGE_TEMPLATE_VERSION,
+    escape_markdown,
+    format_job_message,
+    render_job_messages,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZES = (100, 1000, 10000)
+DATABASE_CATEGORY = "bench_sender"
+
+
+def make_synthetic_jobs(count: int, prerendered: bool = True) -> List[DBJob]:
+    """Build `count` realistic unsent jobs, newest first"""
+    today = date.today()
+    now = datetime.utcnow()
+    jobs = []
+    for i in range(count):
+        job = DBJob(
+            id=i + 1,
+            title=f"Chargé(e) de communication digitale #{i} - CDI (H/F) [Paris 75011]",
+            company=f"Agence_{i % 37} & Associés",
+            location="Paris, Île-de-France",
+            date_posted=today - timedelta(days=i % 30),
+            job_url=f"https://fr.indeed.com/viewjob?jk=bench{i:08d}",
+            site="indeed" if i % 2 else "linkedin",
+            salary_source="35k-42k EUR/an" if i % 3 else None,
+            description=(
+                "Rejoignez une équipe *créative* ! Missions : stratégie social-media, "
+                "rédaction (print + web), suivi des KPIs... Profil : Bac+5, 2-3 ans "
+                "d'expérience. Télétravail 2j/semaine. " * 3
+            ),
+            is_remote=bool(i % 4 == 0),
+            category="benchmark",
+            created_at=now - timedelta(seconds=i),
+            sent_to_telegram=False,
+        )
+        if prerendered:
+            job.message_markdown, job.message_plain = render_job_messages(job)
+            job.message_version = MESSAGE_TEMPLATE_VERSION
+        jobs.append(job)
+    return jobs
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class InMemoryJobStore(JobManager):
+    """JobManager replacement keeping unsent jobs in memory"""
+
+    def __init__(self, jobs: List[DBJob], mark_latency: float = 0.0):
+        super().__init__()
+        self._jobs = {job.id: job for job in jobs}
+        self._order = [job.id for job in jobs]
+        self._position = {job_id: i for i, job_id in enumerate(self._order)}
+        self.mark_latency = mark_latency
+        self.mark_seconds = 0.0
+        self.mark_calls = 0
+
+    def _unsent(self, start: int = 0):
+        for job_id in self._order[start:]:
+            job = self._jobs[job_id]
+            if not job.sent_to_telegram:
+                yield job
+
+    async def count_unsent_jobs(self, category: str, max_age_days: int = 30) -> int:
+        return sum(1 for _ in self._unsent())
+
+    async def get_unsent_jobs(self, category, max_age_days=30, limit=None, after=None):
+        # Jobs are kept newest first, so the keyset cursor is a list position
+        start = 0 if after is None else self._position[after[2]] + 1
+        page = []
+        for job in self._unsent(start):
+            if limit is not None and len(page) >= limit:
+                break
+            page.append(job)
+        return page
+
+    async def mark_jobs_as_sent(self, job_ids: List[int]) -> int:
+        started = time.perf_counter()
+        if self.mark_latency:
+            await asyncio.sleep(self.mark_latency)
+        for job_id in job_ids:
+            self._jobs[job_id].sent_to_telegram = True
+        self.mark_seconds += time.perf_counter() - started
+        self.mark_calls += 1
+        return len(job_ids)
+
+
+class TimedJobManager(JobManager):
+    """Database JobManager timing the mark-as-sent calls of SentJobBuffer flushes"""
+
+    def __init__(self):
+        super().__init__()
+        self.mark_seconds = 0.0
+        self.mark_calls = 0
+
+    async def mark_jobs_as_sent(self, job_ids: List[int]) -> int:
+        started = time.perf_counter()
+        try:
+            return await super().mark_jobs_as_sent(job_ids)
+        finally:
+            self.mark_seconds += time.perf_counter() - started
+            self.mark_calls += 1
+
+
+async def _insert_jobs(jobs: List[DBJob], category: str) -> None:
+    """Insert the synthetic jobs under `category`, with IDs from the database"""
+    connection.initialize_database()
+    if connection.async_session_factory is None:
+        raise RuntimeError("Database not properly initialized")
+    # Unique per run: job_url is unique in the table
+    suffix = f"#{category}-{datetime.now():%Y%m%d%H%M%S%f}"
+    for job in jobs:
+        job.id = None
+        job.category = category
+        job.job_url += suffix
+    async with connection.async_session_factory() as session:
+        session.add_all(jobs)
+        await session.commit()
+
+
+class FakeTelegramApi:
+    """Stand-in for telegram.Bot answering send_message after a delay"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.messages = 0
+
+    async def send_message(self, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.messages += 1
+
+
+def _time_stage(func, items) -> Dict[str, float]:
+    """Run func over items, returning wall/CPU time"""
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    for item in items:
+        func(item)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    return {
+        "wall_seconds": round(wall, 6),
+        "cpu_seconds": round(cpu, 6),
+        "per_item_us": round(cpu / max(1, len(items)) * 1e6, 3),
+    }
+
+
+async def _bench_send(
+    jobs: List[DBJob],
+    api_latency: float,
+    mark_latency: float,
+    stub_url: Optional[str],
+    database: bool = False
+) -> Dict[str, Any]:
+    """Send all jobs through send_jobs_from_database"""
+    if database:
+        store, category = TimedJobManager(), DATABASE_CATEGORY
+    else:
+        store, category = InMemoryJobStore(jobs, mark_latency=mark_latency), "benchmark"
+    # Imported here: the module creates the global bot (TELEGRAM_BOT_TOKEN)
+    from france_chomage.telegram.bot import TelegramJobBot
+
+    if stub_url is None:
+        bot = TelegramJobBot(manager=store, api=FakeTelegramApi(latency=api_latency))
+    else:
+        token = settings.telegram_bot_token or "123:benchmark"
+        bot = TelegramJobBot(manager=store, base_url=stub_url, token=token)
+
+    latencies: List[float] = []
+    send_job = bot.send_job
+
+    async def timed_send_job(job, topic_id, job_type):
+        started = time.perf_counter()
+        try:
+            return await send_job(job, topic_id, job_type)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    bot.send_job = timed_send_job
+
+    try:
+        if database:
+            await _insert_jobs(jobs, category)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            sent = await bot.send_jobs_from_database(
+                category, topic_id=1, max_jobs=len(jobs), interval=0.0, budget=float("inf")
+            )
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    finally:
+        await bot.close()
+        if database:
+            try:
+                deleted = await store.delete_categories([category])
+                logger.debug("🧹 Deleted %d %s jobs", deleted, category)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not delete the {category} jobs: {e}")
+
+    return {
+        "sent": sent,
+        "wall_seconds": round(wall, 6),
+        "cpu_seconds": round(cpu, 6),
+        "messages_per_second": round(sent / wall, 2) if wall else 0.0,
+        "send_latency_p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "send_latency_p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        # In-memory store: only the simulated mark_latency, not database time
+        "mark_db_seconds" if database else "mark_simulated_seconds": round(store.mark_seconds, 6),
+        "mark_calls": store.mark_calls,
+    }
+
+
+async def run_sender_benchmark(
+    batch_sizes=DEFAULT_BATCH_SIZES,
+    api_latency: float = 0.0,
+    mark_latency: float = 0.0,
+    stub_url: Optional[str] = None,
+    output: Optional[str] = None,
+    database: bool = False
+) -> Dict[str, Any]:
+    """
+    Run the sender benchmark for each batch size and write a JSON report
+    `database` sends from real rows and times the real mark-as-sent flushes.
+    """
+    results = []
+    for size in batch_sizes:
+        raw_jobs = make_synthetic_jobs(size, prerendered=False)
+        fields = [
+            text for job in raw_jobs for text in (job.display_title, job.company, job.description)
+        ]
+
+        result = {
+            "batch_size": size,
+            "format_job_message": _time_stage(format_job_message, raw_jobs),
+            "escape_markdown": _time_stage(escape_markdown, fields),
+            "send_jobs_from_database": await _bench_send(
+                make_synthetic_jobs(size), api_latency, mark_latency, stub_url, database
+            ),
+        }
+        results.append(result)
+
+        send = result["send_jobs_from_database"]
+        logger.info(
+            f"📊 {size} jobs: {send['messages_per_second']} msg/s, "
+            f"p50 {send['send_latency_p50_ms']}ms, p95 {send['send_latency_p95_ms']}ms, "
+            f"format {result['format_job_message']['cpu_seconds']}s CPU, "
+            + (
+                f"mark in database {send['mark_db_seconds']}s" if database
+                else f"simulated mark latency {send['mark_simulated_seconds']}s"
+            )
+        )
+
+    report = {
+        "benchmark": "telegram_sender",
+        "version": __version__,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "parameters": {
+            "api_latency": api_latency,
+            "mark_latency": mark_latency,
+            "stub_url": stub_url,
+            "database": database,
+            "send_mark_batch_size": settings.send_mark_batch_size,
+            "send_page_size": settings.send_page_size,
+        },
+        "results": results,
+    }
+
+    if output is None:
+        output = f"bench_sender_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with Path(output).open("w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logger.info(f"💾 Benchmark results written to {output}")
+
+    report["output"] = output
+    return report
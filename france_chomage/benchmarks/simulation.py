@@ -0,0 +1,474 @@
+"""
+Offline end-to-end load simulation
+
+Generates N synthetic categories and runs them through the real scheduler:
+CategoryScraper, JobManager, the repository and the Telegram sender,
+against the configured (local) database. Two modes:
+
+- warmup: the startup warm-up (`run_startup_jobs`) once per round;
+- schedule: the categories are registered with `schedule_categories()` on
+  an AsyncScheduler whose clock runs a simulated day in `day_seconds`, and
+  `run_pending` dispatches them hour by hour, so the per-category locks,
+  send continuations and (with send_on_scrape) the debounced sends are
+  exercised. Each round is one simulated day.
+
+jobspy is
+replaced by SimulatedProvider (latency, result size, duplicate ratio, 403
+rate) and Telegram by the local stub server. The report covers throughput,
+queueing delay before each run, run durations, scrape stage totals, the top
+SQL statements and process resources (CPU, RSS, threads, event loop lag).
+The synthetic jobs, runs and last successes are deleted at the end, and
+the settings and scheduler globals swapped for the run are restored.
+"""
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from sqlalchemy.engine import make_url
+
+from france_chomage import __version__
+from france_chomage.benchmarks.sender import percentile
+from france_chomage.categories import CategoryConfig, category_manager
+from france_chomage.config import settings
+from france_chomage.database.manager import job_manager
+from france_chomage.database.profiling import query_profiler
+from france_chomage.database.runs import RunRecorder, delete_run_history
+from france_chomage.memory import rss_bytes
+from france_chomage.scraping.base import STAGES
+from france_chomage.scraping.providers import JobProvider, set_provider
+from france_chomage.telegram.stub_server import StubTelegramServer
+
+logger = logging.getLogger(__name__)
+
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1", "db", "postgres")
+SAMPLE_INTERVAL = 0.1
+# Longest real sleep of the compressed schedule loop (picks up new runs)
+SCHEDULE_TICK = 0.5
+SIMULATION_MODES = ("warmup", "schedule")
+
+
+class SimulatedProvider(JobProvider):
+    """
+    Fake jobspy answering after a delay from the default thread pool
+    Like jobspy, each call holds an executor thread while "on the network",
+    so thread pool saturation shows up in the simulation. Duplicates reuse
+    URLs already returned for the same category.
+    """
+
+    name = "simulated"
+
+    def __init__(
+        self,
+        latency: float = 1.0,
+        latency_jitter: float = 0.5,
+        results: Optional[int] = None,
+        duplicate_ratio: float = 0.3,
+        block_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.results = results
+        self.duplicate_ratio = duplicate_ratio
+        self.block_rate = block_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._seen: Dict[str, List[str]] = defaultdict(list)
+        self.stats: Dict[str, int] = {"calls": 0, "blocked": 0, "rows": 0, "duplicates": 0}
+
+    async def fetch(self, category: str, params: Dict[str, Any]):
+        return await asyncio.get_event_loop().run_in_executor(None, self._scrape, category, params)
+
+    def _scrape(self, category: str, params: Dict[str, Any]) -> pd.DataFrame:
+        with self._lock:
+            self.stats["calls"] += 1
+            jitter = self._random.uniform(-1, 1) * self.latency * self.latency_jitter
+            delay = max(0.0, self.latency + jitter)
+            blocked = self._random.random() < self.block_rate
+            if blocked:
+                self.stats["blocked"] += 1
+            else:
+                rows = self._rows(category, params)
+        time.sleep(delay)
+        if blocked:
+            raise RuntimeError("HTTP 403 Forbidden (simulated block)")
+        return pd.DataFrame(rows)
+
+    def _rows(self, category: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        count = self.results or params.get("results_wanted") or settings.results_wanted
+        sites = list(params.get("site_name") or ["linkedin"])
+        seen = self._seen[category]
+        today = date.today()
+        rows = []
+        for i in range(count):
+            if seen and self._random.random() < self.duplicate_ratio:
+                url = self._random.choice(seen)
+                self.stats["duplicates"] += 1
+            else:
+                url = f"https://simulated.invalid/{category}/{next(self._ids)}"
+                seen.append(url)
+            rows.append({
+                "title": f"{params.get('search_term', category)} - offre simulée {i} (H/F)",
+                "company": f"Entreprise {self._random.randint(1, 500)}",
+                "location": params.get("location", settings.location),
+                "date_posted": today - timedelta(days=self._random.randint(0, 20)),
+                "job_url": url,
+                "site": sites[i % len(sites)],
+                "description": "Missions : pilotage, rédaction, suivi des indicateurs. " * 8,
+                "is_remote": self._random.random() < 0.25,
+                "salary_source": "35k-42k EUR/an" if i % 3 else None,
+            })
+        self.stats["rows"] += len(rows)
+        return rows
+
+
+def make_categories(count: int, cities: Sequence[str] = ("Paris",)) -> Dict[str, CategoryConfig]:
+    """`count` synthetic categories per city, spread over the day"""
+    categories = {}
+    for city in cities:
+        for i in range(count):
+            index = len(categories)
+            name = f"sim_{i:04d}_{city.lower()}" if len(cities) > 1 else f"sim_{i:04d}"
+            categories[name] = CategoryConfig(
+                name=name,
+                search_terms=f"métier simulé {i} {city}",
+                telegram_topic_id=index + 1,
+                schedule_hour=index % 24,
+            )
+    return categories
+
+
+def is_local_database(url: str) -> bool:
+    """Whether a database URL points at this machine (or a compose service)"""
+    host = make_url(url).host
+    return host is None or host in LOCAL_HOSTS
+
+
+class CompressedClock:
+    """Local time running `speed` times faster than real time from now"""
+
+    def __init__(self, speed: float):
+        self.speed = speed
+        self.start = datetime.now()
+        self._started = time.perf_counter()
+
+    def __call__(self) -> datetime:
+        return self.start + timedelta(seconds=(time.perf_counter() - self._started) * self.speed)
+
+    def real_seconds(self, simulated: float) -> float:
+        return simulated / self.speed
+
+
+class RunProbe:
+    """Queueing delay (due or dispatched -> start) and duration of each run"""
+
+    def __init__(self):
+        self.dispatched: Dict[Tuple[str, str], float] = {}
+        self.waits: Dict[str, List[float]] = defaultdict(list)
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+
+    def mark_due(self, categories, operation: str) -> None:
+        """Runs due now, before any slot or lock lets them be dispatched"""
+        now = time.perf_counter()
+        for category in categories:
+            self.dispatched[(category, operation)] = now
+
+    def wrap_dispatch(self, dispatch):
+        def timed_dispatch(category: str, operation: str):
+            self.dispatched.setdefault((category, operation), time.perf_counter())
+            return dispatch(category, operation)
+        return timed_dispatch
+
+    def wrap_runner(self, operation: str, runner):
+        async def timed_runner(category: str) -> None:
+            started = time.perf_counter()
+            dispatched = self.dispatched.pop((category, operation), started)
+            self.waits[operation].append(started - dispatched)
+            try:
+                await runner(category)
+            finally:
+                self.durations[operation].append(time.perf_counter() - started)
+        return timed_runner
+
+    def summary(self) -> Dict[str, Any]:
+        result = {}
+        for operation in sorted(self.durations):
+            waits, durations = self.waits[operation], self.durations[operation]
+            result[operation] = {
+                "runs": len(durations),
+                "queue_p50_seconds": round(percentile(waits, 50), 3),
+                "queue_p95_seconds": round(percentile(waits, 95), 3),
+                "queue_max_seconds": round(max(waits, default=0.0), 3),
+                "duration_p50_seconds": round(percentile(durations, 50), 3),
+                "duration_p95_seconds": round(percentile(durations, 95), 3),
+            }
+        return result
+
+
+class ResourceSampler:
+    """Peak RSS and threads, and event loop lag, sampled on the loop"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_rss = rss_bytes()
+        self.peak_threads = threading.active_count()
+        self.lags: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+            self.peak_rss = max(self.peak_rss, rss_bytes())
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+
+def _override(stack: contextlib.ExitStack, target: Any, name: str, value: Any) -> None:
+    """Set `target.name` for the simulation, the previous value is restored when `stack` closes"""
+    stack.callback(setattr, target, name, getattr(target, name))
+    setattr(target, name, value)
+
+
+async def _delete_simulated_data(names: List[str], recorder: RunRecorder) -> None:
+    """Remove what the synthetic categories wrote to the database"""
+    try:
+        # Buffered run rows first, or they would be written after the delete
+        await recorder.close()
+        jobs = await job_manager.delete_categories(names)
+        runs = await delete_run_history(names)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not delete the simulation data: {e}")
+        return
+    logger.info(f"🧹 Deleted {jobs} simulated jobs and {runs} run history rows")
+
+
+async def _run_simulated_day(simulated_scheduler, clock: CompressedClock, until: datetime) -> None:
+    """Dispatch due runs, like AsyncScheduler.run, until `until` on the compressed clock"""
+    while clock() < until:
+        simulated_scheduler.run_pending()
+        remaining = (until - clock()).total_seconds()
+        wait = simulated_scheduler.seconds_until_next_run()
+        wait = remaining if wait is None else min(wait, remaining)
+        await asyncio.sleep(min(SCHEDULE_TICK, clock.real_seconds(max(0.0, wait))))
+
+
+def _round_totals(job_stats: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    totals: Dict[str, Any] = defaultdict(int)
+    stages: Dict[str, float] = defaultdict(float)
+    for stats in job_stats.values():
+        for key in ("jobs_scraped", "jobs_new", "jobs_sent"):
+            totals[key] += stats.get(key, 0)
+        totals["errors"] += sum(1 for key in ("scrape_error", "send_error") if key in stats)
+        for stage, seconds in stats.get("scrape_timings", {}).items():
+            stages[stage] += seconds
+    totals["stage_seconds"] = {
+        name: round(stages.get(name, 0.0), 3) for name, _ in STAGES
+    }
+    return dict(totals)
+
+
+async def run_simulation(
+    categories: int = 100,
+    cities: Sequence[str] = ("Paris",),
+    rounds: int = 2,
+    provider: Optional[SimulatedProvider] = None,
+    api_latency: float = 0.0,
+    overrides: Optional[Dict[str, Any]] = None,
+    output: Optional[str] = None,
+    mode: str = "warmup",
+    day_seconds: float = 240.0
+) -> Dict[str, Any]:
+    """
+    Run `rounds` warm-ups (or simulated days) over synthetic categories
+    Later rounds see the URLs saved by earlier ones, like successive
+    scheduled scrapes. `overrides` replaces settings for the run
+    (startup_concurrency, send_interval...). In schedule mode a simulated
+    day lasts `day_seconds`.
+    """
+    if mode not in SIMULATION_MODES:
+        raise ValueError(f"Unknown simulation mode '{mode}', expected one of {SIMULATION_MODES}")
+    provider = provider or SimulatedProvider()
+    clock = CompressedClock(86400 / day_seconds) if mode == "schedule" else None
+    configs = make_categories(categories, cities)
+    probe = RunProbe()
+    sampler = ResourceSampler()
+    settings_overrides = {
+        "skip_init_job": 0,
+        "send_on_scrape": False,
+        "telegram_bot_token": settings.telegram_bot_token or "123:simulation",
+        **(overrides or {}),
+    }
+    if clock is not None:
+        # Real-time debounce, shortened like the simulated day
+        settings_overrides.setdefault("send_debounce", clock.real_seconds(settings.send_debounce))
+
+    with StubTelegramServer(latency=api_latency) as server, contextlib.ExitStack() as stack:
+        for name, value in settings_overrides.items():
+            _override(stack, settings, name, value)
+        # Imported here so a missing TELEGRAM_BOT_TOKEN is already overridden
+        from france_chomage import scheduler as scheduler_module
+        from france_chomage.telegram.bot import TelegramJobBot
+
+        simulated_scheduler = scheduler_module.AsyncScheduler(clock=clock or datetime.now)
+        simulated_scheduler.dispatch = probe.wrap_dispatch(simulated_scheduler.dispatch)
+        bot = TelegramJobBot(base_url=server.base_url, token=settings.telegram_bot_token)
+        bot.group_id = settings.telegram_group_id or "-1001"
+        _override(stack, category_manager, "_categories", configs)
+        _override(stack, category_manager, "_loaded", True)
+        _override(stack, scheduler_module, "scheduler", simulated_scheduler)
+        _override(stack, scheduler_module, "telegram_bot", bot)
+        _override(stack, scheduler_module, "_send_semaphore", None)
+        # Own run recorder: the global one is neither flushed nor closed here
+        recorder = RunRecorder(
+            batch_size=settings.run_record_batch_size, interval=settings.run_record_interval
+        )
+        _override(stack, scheduler_module, "run_recorder", recorder)
+        for operation, runner in (
+            ("scrape", scheduler_module.run_scrape_job),
+            ("send", scheduler_module.run_send_job),
+        ):
+            wrapped = probe.wrap_runner(operation, runner)
+            _override(stack, scheduler_module, runner.__name__, wrapped)
+        job_stats = scheduler_module.job_stats
+        stack.callback(job_stats.update, dict(job_stats))
+        stack.callback(job_stats.clear)
+        stack.callback(set_provider, set_provider(provider))
+
+        query_profiler.reset()
+        sampler.start()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        round_results = []
+        try:
+            if clock is not None:
+                scheduler_module.schedule_categories()
+            for index in range(rounds):
+                job_stats.clear()
+                round_start = time.perf_counter()
+                if clock is None:
+                    # Warm-up scrapes are all due now, queued behind STARTUP_CONCURRENCY
+                    probe.mark_due(configs, "scrape")
+                    await scheduler_module.run_startup_jobs()
+                else:
+                    await _run_simulated_day(
+                        simulated_scheduler, clock, clock.start + timedelta(days=index + 1)
+                    )
+                # Runs left over by the warm-up deadline (or the last day)
+                # finish under their own timeout
+                while (clock is None or index == rounds - 1) and simulated_scheduler.running:
+                    await asyncio.wait(set(simulated_scheduler.running))
+                round_seconds = time.perf_counter() - round_start
+                totals = _round_totals(job_stats)
+                round_results.append(
+                    {"round": index + 1, "wall_seconds": round(round_seconds, 3), **totals}
+                )
+                logger.info(
+                    f"🔁 Round {index + 1}/{rounds}: {len(configs)} categories "
+                    f"in {round_seconds:.1f}s, {totals['jobs_scraped']} scraped, "
+                    f"{totals['jobs_new']} new, {totals['jobs_sent']} sent, "
+                    f"{totals['errors']} errors"
+                )
+        finally:
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            await sampler.stop()
+            simulated_scheduler.stop()
+            await bot.close()
+            await _delete_simulated_data(list(configs), recorder)
+
+    messages = server.stats["messages_sent"]
+    scraped = sum(result["jobs_scraped"] for result in round_results)
+    report = {
+        "benchmark": "simulation",
+        "version": __version__,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "parameters": {
+            "mode": mode,
+            "day_seconds": day_seconds if clock is not None else None,
+            "categories": len(configs),
+            "cities": list(cities),
+            "rounds": rounds,
+            "provider_latency": provider.latency,
+            "results": provider.results,
+            "duplicate_ratio": provider.duplicate_ratio,
+            "block_rate": provider.block_rate,
+            "api_latency": api_latency,
+            "startup_concurrency": settings_overrides.get(
+                "startup_concurrency", settings.startup_concurrency
+            ),
+            "send_concurrency": settings_overrides.get(
+                "send_concurrency", settings.send_concurrency
+            ),
+            "send_interval": settings_overrides.get("send_interval", settings.send_interval),
+        },
+        "throughput": {
+            "wall_seconds": round(wall, 3),
+            "categories_per_minute": (
+                round(len(configs) * len(round_results) / wall * 60, 2) if wall else 0.0
+            ),
+            "jobs_scraped_per_second": round(scraped / wall, 2) if wall else 0.0,
+            "messages_per_second": round(messages / wall, 2) if wall else 0.0,
+        },
+        "runs": probe.summary(),
+        "rounds": round_results,
+        "provider": dict(provider.stats),
+        "telegram": dict(server.stats),
+        "database": [
+            {
+                "statement": stat.statement,
+                "count": stat.count,
+                "total_seconds": round(stat.total_seconds, 3),
+                "p95_ms": round(stat.percentile(0.95) * 1000, 2),
+            }
+            for stat in query_profiler.top(5)
+        ],
+        "resources": {
+            "cpu_seconds": round(cpu, 3),
+            "cpu_percent": round(cpu / wall * 100, 1) if wall else 0.0,
+            "peak_rss_bytes": sampler.peak_rss,
+            "peak_threads": sampler.peak_threads,
+            "loop_lag_p95_ms": round(percentile(sampler.lags, 95) * 1000, 1),
+            "loop_lag_max_ms": round(max(sampler.lags, default=0.0) * 1000, 1),
+        },
+    }
+
+    runs = report["runs"]
+    logger.info(
+        f"📊 {len(configs)} categories x {rounds} rounds in {wall:.1f}s: "
+        f"{report['throughput']['categories_per_minute']} categories/min, "
+        f"{report['throughput']['messages_per_second']} msg/s, "
+        f"scrape queue p95 {runs.get('scrape', {}).get('queue_p95_seconds', 0)}s, "
+        f"send queue p95 {runs.get('send', {}).get('queue_p95_seconds', 0)}s, "
+        f"CPU {report['resources']['cpu_percent']}%, "
+        f"peak RSS {sampler.peak_rss / 1024 / 1024:.0f} MiB, "
+        f"loop lag max {report['resources']['loop_lag_max_ms']}ms"
+    )
+
+    if output is None:
+        output = f"bench_simulation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with Path(output).open("w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logger.info(f"💾 Simulation results written to {output}")
+
+    report["output"] = output
+    return report
@@ -1,10 +1,11 @@
 """
 Configuration-driven category management system
 """
+import hashlib
 import os
 import yaml
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 
@@ -60,22 +61,33 @@ class CategoryManager:
         self.config_path = config_path or "categories.yml"
         self._categories: Dict[str, CategoryConfig] = {}
         self._loaded = False
+        # (mtime_ns, size) and content hash of the last loaded file
+        self._file_stat: Optional[Tuple[int, int]] = None
+        self._file_hash: Optional[str] = None
+        # Content hash of the last file that failed to load (reported once)
+        self._failed_hash: Optional[str] = None
     
     def load_categories(self) -> None:
-        """Load categories from configuration file"""
+        """Load categories from configuration file
+        
+        The new configuration replaces the current one only once it has been
+        fully parsed and validated, so a broken file keeps the last good one.
+        """
         config_file = Path(self.config_path)
         
         if not config_file.exists():
             raise FileNotFoundError(f"Categories configuration file not found: {config_file}")
         
+        raw = None
         try:
-            with config_file.open('r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            stat = config_file.stat()
+            raw = config_file.read_bytes()
+            data = yaml.safe_load(raw.decode('utf-8'))
             
             if not data or 'categories' not in data:
                 raise ValueError("Invalid configuration: 'categories' section not found")
             
-            self._categories = {}
+            categories: Dict[str, CategoryConfig] = {}
             for name, config in data['categories'].items():
                 category_config = CategoryConfig(
                     name=name,
@@ -88,23 +100,38 @@ class CategoryManager:
                     scrape_hours=config.get('scrape_hours'),
                     send_hours=config.get('send_hours')
                 )
-                self._categories[name] = category_config
+                categories[name] = category_config
             
-            self._validate_configuration()
+            self._validate_configuration(categories)
+            self._categories = categories
+            self._file_stat = (stat.st_mtime_ns, stat.st_size)
+            self._file_hash = hashlib.sha1(raw).hexdigest()
+            self._failed_hash = None
             self._loaded = True
             
         except yaml.YAMLError as e:
+            self._remember_failure(raw)
             raise ValueError(f"Invalid YAML in configuration file: {e}")
         except Exception as e:
+            self._remember_failure(raw)
             raise ValueError(f"Error loading categories configuration: {e}")
     
-    def _validate_configuration(self) -> None:
+    def _remember_failure(self, raw: Optional[bytes]) -> None:
+        """Record a broken file version so config_changed() skips it until edited"""
+        if raw is not None:
+            self._failed_hash = hashlib.sha1(raw).hexdigest()
+    
+    def _validate_configuration(
+        self, categories: Optional[Dict[str, CategoryConfig]] = None
+    ) -> None:
         """Validate the loaded configuration for conflicts and requirements"""
-        if not self._categories:
+        if categories is None:
+            categories = self._categories
+        if not categories:
             raise ValueError("No categories defined in configuration")
         
         # Check for duplicate telegram topic IDs
-        topic_ids = [cat.telegram_topic_id for cat in self._categories.values() if cat.enabled]
+        topic_ids = [cat.telegram_topic_id for cat in categories.values() if cat.enabled]
         if len(topic_ids) != len(set(topic_ids)):
             duplicates = [tid for tid in set(topic_ids) if topic_ids.count(tid) > 1]
             raise ValueError(f"Duplicate Telegram topic IDs found: {duplicates}")
@@ -112,7 +139,7 @@ class CategoryManager:
         # Check for conflicting scrape/send hours (optional warning)
         all_scrape_hours = []
         all_send_hours = []
-        for cat in self._categories.values():
+        for cat in categories.values():
             if cat.enabled:
                 all_scrape_hours.extend(cat.scrape_hours)
                 all_send_hours.extend(cat.send_hours)
@@ -173,8 +200,36 @@ class CategoryManager:
     
     def reload_categories(self) -> None:
         """Reload categories from configuration file"""
-        self._loaded = False
         self.load_categories()
+    
+    def config_changed(self) -> bool:
+        """Check whether the configuration file changed since it was loaded
+        
+        The mtime and size are checked first; the content is only hashed when
+        they differ, so touching the file without editing it is not a change.
+        A version that already failed to load is not a change either, so a
+        broken edit is reported once rather than at every check.
+        """
+        if not self._loaded:
+            return True
+        
+        try:
+            stat = Path(self.config_path).stat()
+        except OSError:
+            return False  # File missing: keep the current configuration
+        
+        file_stat = (stat.st_mtime_ns, stat.st_size)
+        if file_stat == self._file_stat:
+            return False
+        
+        try:
+            file_hash = hashlib.sha1(Path(self.config_path).read_bytes()).hexdigest()
+        except OSError:
+            return False
+        if file_hash in (self._file_hash, self._failed_hash):
+            self._file_stat = file_stat
+            return False
+        return True
 
 
 # Global instance
@@ -1,10 +1,16 @@
 """
 France Chômage CLI - Main application
 """
+from pathlib import Path
+from typing import Optional
+
 import typer
+from france_chomage.config import settings
+from france_chomage.logging_config import setup_logging
 from france_chomage.scheduler import main as scheduler_main
 
-from . import scraping, sending, workflow, database, migration, utils
+from . import scraping, sending, workflow, database, migration, utils, benchmark
+from .profiler import PROFILERS, CommandProfiler, default_output
 
 app = typer.Typer(
     help="🇫🇷 France Chômage Bot - Job scraping and Telegram posting"
@@ -17,6 +23,33 @@ app.add_typer(workflow.app, name="workflow")
 app.add_typer(database.app, name="db")
 app.add_typer(migration.app, name="migrate")
 app.add_typer(utils.app, name="utils")
+app.add_typer(benchmark.app, name="bench")
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    log_level: Optional[str] = typer.Option(
+        None, "--log-level", help="DEBUG, INFO, WARNING... (default: LOG_LEVEL)"
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Profile the command and print the top 20 functions"
+    ),
+    profile_output: Optional[Path] = typer.Option(None, help="Profile file path without extension"),
+    profiler: str = typer.Option(
+        "auto", help=f"One of {', '.join(PROFILERS)} (auto: pyinstrument if installed)"
+    )
+):
+    """Configure logging (and profiling) before any command runs"""
+    if log_level:
+        settings.log_level = log_level
+    setup_logging()
+    
+    if profile:
+        output = profile_output or default_output(ctx.invoked_subcommand)
+        command_profiler = CommandProfiler(output, profiler)
+        command_profiler.start()
+        ctx.call_on_close(lambda: typer.echo(command_profiler.stop(), err=True))
 
 
 @app.command()
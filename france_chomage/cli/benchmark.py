@@ -0,0 +1,178 @@
+"""
+Benchmark commands
+"""
+import typer
+
+app = typer.Typer(help="Performance benchmark commands")
+
+
+@app.command()
+def sender(
+    sizes: str = typer.Option("100,1000,10000", help="Comma-separated batch sizes"),
+    api_latency: float = typer.Option(0.0, help="Simulated Telegram latency per message (seconds)"),
+    mark_latency: float = typer.Option(
+        0.0, help="Simulated DB latency per mark-as-sent call (seconds)"
+    ),
+    stub: bool = typer.Option(False, "--stub", help="Send through a local stub Telegram server"),
+    database: bool = typer.Option(
+        False, "--database", help="Send from real rows and time the mark-as-sent flushes"
+    ),
+    allow_remote_db: bool = typer.Option(
+        False, "--allow-remote-db", help="Run against a non-local DATABASE_URL"
+    ),
+    output: str = typer.Option(
+        None, help="JSON output file (default: bench_sender_<timestamp>.json)"
+    )
+):
+    """Benchmark Telegram sender throughput on synthetic jobs"""
+    import asyncio
+    from france_chomage.benchmarks.sender import run_sender_benchmark
+    from france_chomage.benchmarks.simulation import is_local_database
+    from france_chomage.database.connection import get_database_url
+    from france_chomage.telegram.stub_server import StubTelegramServer
+    
+    if database and not allow_remote_db and not is_local_database(get_database_url()):
+        typer.echo(
+            "❌ DATABASE_URL is not local: --database inserts synthetic jobs "
+            "(use --allow-remote-db)",
+            err=True
+        )
+        raise typer.Exit(1)
+    
+    batch_sizes = [int(size) for size in sizes.split(",") if size.strip()]
+    
+    async def _bench():
+        if stub:
+            with StubTelegramServer(latency=api_latency) as server:
+                return await run_sender_benchmark(
+                    batch_sizes, mark_latency=mark_latency, stub_url=server.base_url,
+                    output=output, database=database
+                )
+        return await run_sender_benchmark(
+            batch_sizes, api_latency=api_latency, mark_latency=mark_latency,
+            output=output, database=database
+        )
+    
+    report = asyncio.run(_bench())
+    typer.echo(f"✅ Benchmark completed: {report['output']}")
+
+
+@app.command()
+def pipeline(
+    fixtures: str = typer.Option(
+        "fixtures/jobspy", help="Fixtures recorded with SCRAPE_RECORD_DIR"
+    ),
+    repeat: int = typer.Option(5, help="Parsing repetitions per category"),
+    no_db: bool = typer.Option(False, "--no-db", help="Parsing only, no dedup/insert passes"),
+    allow_remote_db: bool = typer.Option(
+        False, "--allow-remote-db", help="Run against a non-local DATABASE_URL"
+    ),
+    output: str = typer.Option(
+        None, help="JSON output file (default: bench_pipeline_<timestamp>.json)"
+    )
+):
+    """Benchmark parsing, dedup and persistence on recorded jobspy responses"""
+    import asyncio
+    from france_chomage.benchmarks.pipeline import run_pipeline_benchmark
+    from france_chomage.benchmarks.simulation import is_local_database
+    from france_chomage.database.connection import get_database_url
+    
+    if not no_db and not allow_remote_db and not is_local_database(get_database_url()):
+        typer.echo(
+            "❌ DATABASE_URL is not local: the benchmark inserts jobs "
+            "(use --no-db or --allow-remote-db)",
+            err=True
+        )
+        raise typer.Exit(1)
+    
+    try:
+        report = asyncio.run(
+            run_pipeline_benchmark(fixtures, repeat=repeat, database=not no_db, output=output)
+        )
+    except FileNotFoundError as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo(f"✅ Benchmark completed: {report['output']}")
+
+@app.command()
+def simulate(
+    categories: int = typer.Option(100, help="Synthetic categories (per city)"),
+    cities: str = typer.Option(
+        "Paris", help="Comma-separated cities, categories are generated for each"
+    ),
+    rounds: int = typer.Option(
+        2, help="Warm-ups (or simulated days) in a row, later rounds hit duplicates"
+    ),
+    mode: str = typer.Option(
+        "warmup",
+        help="warmup (startup warm-up) or schedule (hourly schedule on a compressed clock)"
+    ),
+    day_seconds: float = typer.Option(
+        240.0, help="Real seconds per simulated day in schedule mode"
+    ),
+    latency: float = typer.Option(1.0, help="Simulated jobspy latency per call (seconds)"),
+    results: int = typer.Option(None, help="Rows per call (default: RESULTS_WANTED)"),
+    duplicate_ratio: float = typer.Option(
+        0.3, help="Share of rows repeating an already returned job"
+    ),
+    block_rate: float = typer.Option(0.0, help="Share of calls failing with a 403"),
+    api_latency: float = typer.Option(0.0, help="Stub Telegram latency per message (seconds)"),
+    startup_concurrency: int = typer.Option(None, help="Override STARTUP_CONCURRENCY"),
+    send_concurrency: int = typer.Option(None, help="Override SEND_CONCURRENCY"),
+    send_interval: float = typer.Option(
+        None, help="Override SEND_INTERVAL (0 measures raw capacity)"
+    ),
+    no_delays: bool = typer.Option(
+        False, "--no-delays", help="Skip anti-detection and retry sleeps"
+    ),
+    seed: int = typer.Option(None, help="Random seed for reproducible runs"),
+    allow_remote_db: bool = typer.Option(
+        False, "--allow-remote-db", help="Run against a non-local DATABASE_URL"
+    ),
+    output: str = typer.Option(
+        None, help="JSON output file (default: bench_simulation_<timestamp>.json)"
+    )
+):
+    """Simulate the whole pipeline offline on synthetic categories"""
+    import asyncio
+    from france_chomage.benchmarks.simulation import (
+        SimulatedProvider,
+        is_local_database,
+        run_simulation,
+    )
+    from france_chomage.database.connection import get_database_url
+    
+    if not allow_remote_db and not is_local_database(get_database_url()):
+        typer.echo(
+            "❌ DATABASE_URL is not local: the simulation inserts synthetic jobs "
+            "(use --allow-remote-db)",
+            err=True
+        )
+        raise typer.Exit(1)
+    
+    overrides = {
+        name: value for name, value in (
+            ("startup_concurrency", startup_concurrency),
+            ("send_concurrency", send_concurrency),
+            ("send_interval", send_interval),
+        ) if value is not None
+    }
+    if no_delays:
+        overrides.update(scrape_delay_min=0.0, scrape_delay_max=0.0, retry_delay_base=0)
+    
+    provider = SimulatedProvider(
+        latency=latency, results=results, duplicate_ratio=duplicate_ratio, block_rate=block_rate,
+        seed=seed
+    )
+    report = asyncio.run(run_simulation(
+        categories=categories,
+        cities=[city.strip() for city in cities.split(",") if city.strip()],
+        rounds=rounds,
+        provider=provider,
+        api_latency=api_latency,
+        overrides=overrides,
+        output=output,
+        mode=mode,
+        day_seconds=day_seconds
+    ))
+    typer.echo(f"✅ Simulation completed: {report['output']}")
@@ -131,3 +131,117 @@ def backup(
             raise typer.Exit(1)
     
     asyncio.run(_backup())
+
+
+@app.command()
+def runs(
+    category: str = typer.Option(None, help="Category to show (default: all)"),
+    operation: str = typer.Option(None, help="'scrape' or 'send' (default: both)"),
+    limit: int = typer.Option(20, help="Number of runs to show")
+):
+    """Show the latest scrape/send runs with their stage timings"""
+    import asyncio
+    from france_chomage.database.repository import RunRepository
+    
+    def seconds(value):
+        return f"{value:.1f}s" if value is not None else "-"
+    
+    async def _runs():
+        try:
+            connection.initialize_database()
+            
+            if connection.async_session_factory is None:
+                raise RuntimeError("Database not properly initialized")
+            
+            async with connection.async_session_factory() as session:
+                recent_runs = await RunRepository(session).get_recent_runs(
+                    category=category, operation=operation, limit=limit
+                )
+            
+            if not recent_runs:
+                typer.echo("📭 No runs recorded")
+                return
+            
+            for run in recent_runs:
+                status = f"❌ {run.error_class}" if run.error_class else "✅"
+                line = (
+                    f"{run.started_at:%Y-%m-%d %H:%M} {run.category:<15} {run.operation:<6} "
+                    f"{seconds(run.duration_seconds):>7} {status}"
+                )
+                if run.operation == "scrape":
+                    line += (
+                        f" | net {seconds(run.network_seconds)}, "
+                        f"parse {seconds(run.parse_seconds)}, db {seconds(run.db_seconds)} "
+                        f"| {run.rows_fetched or 0} fetched, "
+                        f"{run.new_rows or 0} new, {run.duplicates or 0} dup"
+                    )
+                else:
+                    line += (
+                        f" | send {seconds(run.send_seconds)}, db {seconds(run.db_seconds)} "
+                        f"| {run.sent_count or 0} sent"
+                    )
+                typer.echo(line)
+                
+        except Exception as exc:
+            typer.echo(f"❌ Runs error: {exc}")
+            raise typer.Exit(1)
+    
+    asyncio.run(_runs())
+
+
+@app.command()
+def profile(
+    category: str = typer.Option(None, help="Category to profile (default: all enabled)"),
+    top: int = typer.Option(10, help="Number of statements to show"),
+    checks: int = typer.Option(20, help="Duplicate checks (job_exists) per category"),
+    scrape: bool = typer.Option(
+        False, "--scrape", help="Also run a real scrape of the category (writes new jobs)"
+    )
+):
+    """Time the bot's database queries and show the top statements"""
+    import asyncio
+    from france_chomage.categories import category_manager
+    from france_chomage.config import settings
+    from france_chomage.database.profiling import query_profiler
+    from france_chomage.database.repository import JobRepository
+    from france_chomage.scraping.category_scraper import create_category_scraper
+    
+    async def _profile():
+        try:
+            connection.initialize_database()
+            
+            if connection.async_session_factory is None:
+                raise RuntimeError("Database not properly initialized")
+            if not settings.db_profile:
+                query_profiler.install(connection.engine)
+            
+            categories = [category] if category else category_manager.get_enabled_category_names()
+            if scrape:
+                for name in categories:
+                    await create_category_scraper(category_manager.get_category(name)).scrape()
+            
+            # Read-only replay of the send and dedup paths
+            async with connection.async_session_factory() as session:
+                repository = JobRepository(session)
+                for name in categories:
+                    await repository.count_unsent(name)
+                    await repository.get_unsent_messages(name, limit=settings.send_page_size)
+                    for job in (await repository.get_jobs_by_category(name))[:checks]:
+                        await repository.job_exists(job.job_url)
+                await repository.get_job_stats()
+            
+            typer.echo(f"📊 Top {top} statements by total time ({len(categories)} categories):")
+            typer.echo(query_profiler.report(limit=top))
+            if query_profiler.slow_count:
+                typer.echo(
+                    f"🐌 {query_profiler.slow_count} statements over "
+                    f"{settings.db_slow_query_ms:.0f} ms"
+                )
+            
+        except Exception as exc:
+            typer.echo(f"❌ Profile error: {exc}")
+            raise typer.Exit(1)
+        finally:
+            await connection.close_database()
+    
+    asyncio.run(_profile())
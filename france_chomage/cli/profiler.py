@@ -0,0 +1,105 @@
+"""
+Profiling of whole CLI commands (global --profile option)
+
+cProfile writes a `.prof` file (snakeviz, pstats...); it sees only the main
+thread and counts each resume of a coroutine as a call. When pyinstrument is
+installed it is used instead: a sampling profiler with async mode, where
+time spent awaiting is attributed to the awaiting coroutine; its call tree
+is written as collapsed stacks (`.collapsed`, for flamegraph.pl or
+speedscope). Both print the top 20 functions when the command ends.
+"""
+import cProfile
+import io
+import pstats
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PROFILERS = ("auto", "cprofile", "pyinstrument")
+TOP_FUNCTIONS = 20
+
+
+def pyinstrument_available() -> bool:
+    try:
+        import pyinstrument  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def default_output(command: Optional[str]) -> Path:
+    return Path(f"profile-{command or 'cli'}-{time.strftime('%Y%m%d-%H%M%S')}")
+
+
+class CommandProfiler:
+    """Profiles the running command and writes its report when stopped"""
+
+    def __init__(self, output: Path, engine: str = "auto"):
+        if engine not in PROFILERS:
+            raise ValueError(f"Unknown profiler '{engine}', expected one of {PROFILERS}")
+        if engine == "auto":
+            engine = "pyinstrument" if pyinstrument_available() else "cprofile"
+        self.engine = engine
+        self.output = output
+        self._profiler = None
+
+    def start(self) -> None:
+        if self.engine == "pyinstrument":
+            from pyinstrument import Profiler
+            self._profiler = Profiler(async_mode="enabled")
+            self._profiler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self) -> str:
+        """Stop profiling, write the profile file and return the summary"""
+        if self.engine == "pyinstrument":
+            session = self._profiler.stop()
+            path = self.output.with_suffix(".collapsed")
+            stacks = collapsed_stacks(session.root_frame())
+            path.write_text(
+                "".join(f"{stack} {weight}\n" for stack, weight in stacks.items()), encoding="utf-8"
+            )
+            top = top_self_times(stacks)
+            lines = [f"📈 Profile written to {path} (pyinstrument, {session.duration:.1f}s)"]
+            lines += [f"{ms:>10.0f}ms  {name}" for name, ms in top]
+            return "\n".join(lines)
+
+        self._profiler.disable()
+        path = self.output.with_suffix(".prof")
+        self._profiler.dump_stats(str(path))
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        return f"📈 Profile written to {path} (cProfile)\n{out.getvalue().strip()}"
+
+
+def _frame_name(frame) -> str:
+    return f"{frame.function} ({frame.file_path_short}:{frame.line_no})"
+
+
+def collapsed_stacks(root) -> Dict[str, int]:
+    """Self time in ms of each stack of a pyinstrument call tree"""
+    stacks: Dict[str, int] = defaultdict(int)
+
+    def walk(frame, prefix: str) -> None:
+        stack = f"{prefix};{_frame_name(frame)}" if prefix else _frame_name(frame)
+        children = list(frame.children)
+        self_time = frame.time - sum(child.time for child in children)
+        if self_time > 0:
+            stacks[stack] += max(1, round(self_time * 1000))
+        for child in children:
+            walk(child, stack)
+
+    if root is not None:
+        walk(root, "")
+    return dict(stacks)
+
+
+def top_self_times(stacks: Dict[str, int], limit: int = TOP_FUNCTIONS) -> List[Tuple[str, int]]:
+    """Functions with the most self time across collapsed stacks"""
+    totals: Dict[str, int] = defaultdict(int)
+    for stack, weight in stacks.items():
+        totals[stack.rsplit(";", 1)[-1]] += weight
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
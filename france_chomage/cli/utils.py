@@ -132,3 +132,153 @@ def update():
             typer.echo("⚠️ No data to send")
     
     asyncio.run(_update())
+
+
+@app.command("stub-telegram")
+def stub_telegram(
+    host: str = typer.Option("127.0.0.1", help="Listen address"),
+    port: int = typer.Option(8081, help="Listen port"),
+    latency: float = typer.Option(0.0, help="Latency per request (seconds)"),
+    latency_jitter: float = typer.Option(0.0, help="Extra random latency (seconds)"),
+    retry_after_rate: float = typer.Option(0.0, help="Share of sendMessage answered with 429"),
+    retry_after: int = typer.Option(1, help="retry_after value of 429 responses (seconds)"),
+    parse_error_rate: float = typer.Option(0.0, help="Share of MarkdownV2 messages rejected"),
+    seed: int = typer.Option(None, help="Random seed for reproducible runs")
+):
+    """Run a local stand-in Telegram Bot API server (getMe, sendMessage)"""
+    from france_chomage.telegram.stub_server import StubTelegramServer
+    
+    server = StubTelegramServer(
+        host=host,
+        port=port,
+        latency=latency,
+        latency_jitter=latency_jitter,
+        retry_after_rate=retry_after_rate,
+        retry_after=retry_after,
+        parse_error_rate=parse_error_rate,
+        seed=seed
+    )
+    typer.echo(f"🧪 Stub Telegram API listening - set TELEGRAM_BASE_URL={server.base_url}")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        typer.echo(f"\n🛑 Stub stopped: {server.stats}")
+
+
+@app.command()
+def balance(
+    days: int = typer.Option(14, help="Days of run history to average"),
+    max_per_hour: int = typer.Option(3, help="Max category scrapes per hour"),
+    send_offset: int = typer.Option(1, help="Hours between a scrape and its send"),
+    write: bool = typer.Option(False, "--write", help="Write the plan to categories.yml")
+):
+    """Balance scrape/send hours from measured scrape durations and yields"""
+    import asyncio
+    from france_chomage.balancer import (
+        apply_plan,
+        balance_schedule,
+        current_plan,
+        diff_plan,
+        fill_missing_costs,
+        hourly_load,
+        load_run_costs,
+        peak_load,
+    )
+    from france_chomage.environments import get_sites_for_environment
+    
+    categories = settings.category_manager.get_enabled_categories()
+    try:
+        costs = asyncio.run(load_run_costs(days))
+    except Exception as exc:
+        typer.echo(f"❌ Could not read run history: {exc}")
+        raise typer.Exit(1)
+    sites = get_sites_for_environment()
+    
+    measured = [name for name in categories if name in costs]
+    typer.echo(f"📊 Measured costs for {len(measured)}/{len(categories)} categories")
+    if len(measured) < len(categories):
+        typer.echo("💡 Unmeasured categories use the median measured cost")
+    
+    plan = balance_schedule(
+        categories,
+        costs,
+        sites,
+        send_offset=send_offset,
+        max_per_hour=max_per_hour,
+        send_interval=settings.send_interval
+    )
+    
+    all_costs = fill_missing_costs(categories, costs)
+    old_plan = current_plan(categories)
+    old_peak = peak_load(hourly_load(old_plan, all_costs, sites, settings.send_interval))
+    new_load = hourly_load(plan, all_costs, sites, settings.send_interval)
+    new_peak = peak_load(new_load)
+    
+    typer.echo("\n🕒 Planned load per hour (seconds per site):")
+    for hour, site_load in new_load.items():
+        names = [name for name, (scrape_hours, _) in plan.items() if hour in scrape_hours]
+        load_str = ', '.join(
+            f"{site} {seconds:.0f}s" for site, seconds in sorted(site_load.items())
+        )
+        typer.echo(f"  {hour:02d}:00  {load_str or '-'}  | Scrape: {', '.join(names) or '-'}")
+    
+    typer.echo(f"\n📈 Peak per-site load: {old_peak:.0f}s -> {new_peak:.0f}s")
+    
+    changes = diff_plan(old_plan, plan)
+    if not changes:
+        typer.echo("✅ Current schedule is already balanced")
+        return
+    
+    typer.echo(f"\n📝 {len(changes)} categories would change:")
+    for line in changes:
+        typer.echo(f"  {line}")
+    
+    if write:
+        apply_plan(plan, settings.category_manager.config_path)
+        typer.echo(f"\n✅ Plan written to {settings.category_manager.config_path}")
+    else:
+        typer.echo("\n💡 Run with --write to update categories.yml")
+
+
+@app.command()
+def memory(
+    snapshot_dir: Path = typer.Option(
+        None, help="Snapshots of the memory watch (default: MEMORY_SNAPSHOT_DIR)"
+    ),
+    top: int = typer.Option(15, help="Allocation sites to show")
+):
+    """Show memory growth recorded by the scheduler's memory watch"""
+    from france_chomage.memory import (
+        format_growth,
+        format_size,
+        load_snapshots,
+        subsystem_sizes,
+        top_growth,
+    )
+    
+    directory = snapshot_dir or Path(settings.memory_snapshot_dir)
+    try:
+        baseline, latest = load_snapshots(str(directory))
+    except FileNotFoundError:
+        typer.echo(f"📭 No snapshots in {directory}")
+        typer.echo("💡 Run the scheduler with MEMORY_WATCH_INTERVAL=900 to record them")
+        raise typer.Exit(1)
+    
+    before, after = subsystem_sizes(baseline), subsystem_sizes(latest)
+    typer.echo(
+        f"🧠 Traced memory: {format_size(sum(before.values()))} -> "
+        f"{format_size(sum(after.values()))}"
+    )
+    
+    typer.echo("\n📦 Per subsystem:")
+    diffs = {name: after[name] - before.get(name, 0) for name in after}
+    for name in sorted(diffs, key=diffs.get, reverse=True)[:top]:
+        diff = diffs[name]
+        sign = '+' if diff >= 0 else ''
+        typer.echo(f"  {name:<30} {format_size(after[name]):>12}  ({sign}{format_size(diff)})")
+    
+    growth = top_growth(latest, baseline, top)
+    typer.echo(f"\n📈 Top {len(growth)} growing allocation sites:")
+    for item in growth:
+        typer.echo(f"  {format_growth(item)}")
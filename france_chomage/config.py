@@ -14,6 +14,10 @@ class Settings:
         # Telegram
         self.telegram_bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
         self.telegram_group_id = os.getenv("TELEGRAM_GROUP_ID")
+        # Local stub for load tests
+        self.telegram_base_url = os.getenv("TELEGRAM_BASE_URL", "https://api.telegram.org/bot")
+        # 429 retries per message
+        self.telegram_max_retry_after = int(os.getenv("TELEGRAM_MAX_RETRY_AFTER", "3"))
         
         # Topic IDs are now managed by CategoryManager
         # These properties are kept for backward compatibility
@@ -26,7 +30,64 @@ class Settings:
         
         # Scheduling  
         self.skip_init_job = int(os.getenv("SKIP_INIT_JOB", "0"))
+        # 1 = warm up every category at startup instead of the smoke test
+        self.startup_warmup = int(os.getenv("STARTUP_WARMUP", "0"))
+        # Scrapes at once during the startup warm-up
+        self.startup_concurrency = int(os.getenv("STARTUP_CONCURRENCY", "3"))
+        # seconds for the whole warm-up
+        self.startup_deadline = float(os.getenv("STARTUP_DEADLINE", "1200"))
+        # hours: missed slots older than this are not caught up
+        self.catchup_window = float(os.getenv("CATCHUP_WINDOW", "24"))
+        # seconds between queued catch-up runs
+        self.catchup_spacing = float(os.getenv("CATCHUP_SPACING", "120"))
+        
+        # Observability
+        # Local /metrics endpoint, 0 disables
+        self.metrics_port = int(os.getenv("METRICS_PORT", "0"))
+        self.metrics_host = os.getenv("METRICS_HOST", "127.0.0.1")
+        # seconds between loop lag samples
+        self.loop_lag_interval = float(os.getenv("LOOP_LAG_INTERVAL", "1.0"))
+        # seconds, log stacks of longer stalls (0 disables)
+        self.loop_watchdog_threshold = float(os.getenv("LOOP_WATCHDOG_THRESHOLD", "0"))
+        # seconds between tracemalloc snapshots (0 disables)
+        self.memory_watch_interval = float(os.getenv("MEMORY_WATCH_INTERVAL", "0"))
+        # Growing allocation sites reported
+        self.memory_watch_top = int(os.getenv("MEMORY_WATCH_TOP", "10"))
+        # Traceback depth kept by tracemalloc
+        self.memory_watch_frames = int(os.getenv("MEMORY_WATCH_FRAMES", "1"))
+        # Snapshots read by `utils memory`
+        self.memory_snapshot_dir = os.getenv("MEMORY_SNAPSHOT_DIR", "memory")
+        # DEBUG adds per-job and per-attempt details
+        self.log_level = os.getenv("LOG_LEVEL", "INFO")
+        self.log_format = os.getenv("LOG_FORMAT", "text")  # text or json (one object per line)
+        self.trace_export = os.getenv("TRACE_EXPORT", "off")  # Tracing spans: off, console or file
+        # JSON-lines file for TRACE_EXPORT=file
+        self.trace_file = os.getenv("TRACE_FILE", "traces.jsonl")
+        # Time SQL statements through engine events (opt-in)
+        self.db_profile = os.getenv("DB_PROFILE", "0") == "1"
+        # Log slower statements (0 disables)
+        self.db_slow_query_ms = float(os.getenv("DB_SLOW_QUERY_MS", "500"))
+        
+        # Multi-replica scheduling (Postgres advisory locks)
+        # off, global or category
+        self.scheduler_leader_mode = os.getenv("SCHEDULER_LEADER_MODE", "off")
+        # Max replicas sharing categories
+        self.scheduler_replica_slots = int(os.getenv("SCHEDULER_REPLICA_SLOTS", "4"))
+        # Split categories by rendezvous hashing
+        self.scheduler_leader_hashing = os.getenv("SCHEDULER_LEADER_HASHING", "1") == "1"
+        # seconds between lock checks
+        self.leader_poll_interval = float(os.getenv("LEADER_POLL_INTERVAL", "15"))
         self.update_hours = [20]
+        self.scrape_timeout = float(os.getenv("SCRAPE_TIMEOUT", "1800"))  # seconds per scrape run
+        self.send_timeout = float(os.getenv("SEND_TIMEOUT", "300"))  # seconds per send run
+        # seconds in-flight runs get to finish on stop
+        self.shutdown_grace = float(os.getenv("SHUTDOWN_GRACE", "60"))
+        # seconds, 0 disables hot reload
+        self.categories_watch_interval = float(os.getenv("CATEGORIES_WATCH_INTERVAL", "30"))
+        # Runs per history insert
+        self.run_record_batch_size = int(os.getenv("RUN_RECORD_BATCH_SIZE", "10"))
+        # Max seconds before a history insert
+        self.run_record_interval = float(os.getenv("RUN_RECORD_INTERVAL", "30"))
         
         # Retry configuration
         self.max_retries = int(os.getenv("MAX_RETRIES", "3"))
@@ -34,9 +95,33 @@ class Settings:
         self.scrape_delay_min = float(os.getenv("SCRAPE_DELAY_MIN", "1.0"))
         self.scrape_delay_max = float(os.getenv("SCRAPE_DELAY_MAX", "3.0"))
         
+        # Sending
+        # seconds between Telegram messages
+        self.send_interval = float(os.getenv("SEND_INTERVAL", "2.0"))
+        # Jobs per sent-mark flush
+        self.send_mark_batch_size = int(os.getenv("SEND_MARK_BATCH_SIZE", "5"))
+        # Max seconds between flushes
+        self.send_mark_interval = float(os.getenv("SEND_MARK_INTERVAL", "10.0"))
+        # Jobs sent per category run
+        self.send_max_per_run = int(os.getenv("SEND_MAX_PER_RUN", "50"))
+        # Unsent jobs fetched per query
+        self.send_page_size = int(os.getenv("SEND_PAGE_SIZE", "25"))
+        # seconds, below the 300s send timeout
+        self.send_run_budget = float(os.getenv("SEND_RUN_BUDGET", "240"))
+        # minutes before sending leftovers
+        self.send_continuation_delay = int(os.getenv("SEND_CONTINUATION_DELAY", "15"))
+        # Categories sending at the same time
+        self.send_concurrency = int(os.getenv("SEND_CONCURRENCY", "1"))
+        # Send right after a scrape saved new jobs
+        self.send_on_scrape = os.getenv("SEND_ON_SCRAPE", "0") == "1"
+        # Quiet window (seconds) before that send
+        self.send_debounce = float(os.getenv("SEND_DEBOUNCE", "60"))
+        
         # Anti-detection settings
         self.force_docker_mode = os.getenv("FORCE_DOCKER_MODE", "0") == "1"  # Force LinkedIn only
         self.indeed_max_results = int(os.getenv("INDEED_MAX_RESULTS", "10"))  # Limit Indeed results
+        # Save jobspy responses as replay fixtures (empty disables)
+        self.scrape_record_dir = os.getenv("SCRAPE_RECORD_DIR", "")
     
     @property
     def category_manager(self):
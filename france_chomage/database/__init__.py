@@ -1,10 +1,17 @@
 """
 Database module for job storage and management
 """
-from .models import Job, Base
-from .connection import get_database_url, create_engine, get_session, initialize_database
-from .repository import JobRepository
+from .models import Job, Run, ScheduleState, Base
+from .connection import (
+    get_database_url,
+    create_engine,
+    get_session,
+    initialize_database,
+    close_database,
+)
+from .repository import JobRepository, RunRepository, ScheduleStateRepository
 from .manager import JobManager, job_manager
+from .runs import RunRecord, RunRecorder, run_recorder
 from .migration_utils import (
     migrate_json_to_database,
     migrate_all_json_files,
@@ -16,14 +23,22 @@ from .migration_utils import (
 
 __all__ = [
     "Job", 
+    "Run",
+    "ScheduleState",
     "Base", 
     "get_database_url", 
     "create_engine", 
     "get_session",
     "initialize_database",
+    "close_database",
     "JobRepository", 
+    "RunRepository",
+    "ScheduleStateRepository",
     "JobManager", 
     "job_manager",
+    "RunRecord",
+    "RunRecorder",
+    "run_recorder",
     "migrate_json_to_database",
     "migrate_all_json_files", 
     "create_tables_if_not_exist",
@@ -1,9 +1,14 @@
 """
 Database connection and session management
 """
+import logging
 import os
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.engine import URL
+from ..config import settings
+from .profiling import query_profiler
+
+logger = logging.getLogger(__name__)
 
 def get_database_url() -> str:
     """Get database URL from environment variables"""
@@ -66,12 +71,24 @@ def initialize_database(force_reinit: bool = False):
                 pass  # Ignore disposal errors
         
         engine = create_engine()
+        if settings.db_profile:
+            query_profiler.install(engine)
         async_session_factory = async_sessionmaker(
             engine, 
             class_=AsyncSession, 
             expire_on_commit=False
         )
-        print(f"🔧 Database initialized with pool size: {engine.pool.size()}")
+        logger.info(f"🔧 Database initialized with pool size: {engine.pool.size()}")
+
+async def close_database():
+    """Dispose the engine and its pooled connections"""
+    global engine, async_session_factory
+    
+    if engine is not None:
+        await engine.dispose()
+        engine = None
+        async_session_factory = None
+        logger.info("🔌 Database connections closed")
 
 def get_connection_info():
     """Get current connection pool information"""
@@ -1,13 +1,60 @@
 """
 Database manager for job operations with caching and filtering
 """
+import logging
+import time
 from datetime import date, datetime, timedelta
-from typing import List, Set
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from .models import Job as DBJob
 from .repository import JobRepository
 from . import connection
 from ..models import Job as PydanticJob
+from ..formatting import MESSAGE_TEMPLATE_VERSION
+from ..tracing import traced
+
+logger = logging.getLogger(__name__)
+
+class SentJobBuffer:
+    """
+    Buffers sent job IDs and marks them as sent in small batches
+    A flush happens every `batch_size` jobs or `interval` seconds, so a crash
+    or timeout mid-run only loses the marks of the last unflushed batch.
+    """
+    
+    def __init__(self, manager: "JobManager", batch_size: int = 5, interval: float = 10.0):
+        self.manager = manager
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self.pending: List[int] = []
+        self.marked_count = 0
+        self._last_flush = time.monotonic()
+    
+    async def add(self, job_id: int) -> None:
+        """Record a sent job, flushing if the batch is full or due"""
+        self.pending.append(job_id)
+        if (
+            len(self.pending) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.interval
+        ):
+            await self.flush()
+    
+    async def flush(self) -> int:
+        """Mark all pending jobs as sent"""
+        self._last_flush = time.monotonic()
+        if not self.pending:
+            return 0
+        
+        job_ids, self.pending = self.pending, []
+        try:
+            marked = await self.manager.mark_jobs_as_sent(job_ids)
+        except BaseException:
+            # Keep the IDs so a later flush can retry them
+            self.pending = job_ids + self.pending
+            raise
+        self.marked_count += marked
+        return marked
+
 
 class JobManager:
     """High-level job management with caching and filtering"""
@@ -26,17 +73,21 @@ class JobManager:
         recent_jobs = await repository.get_recent_jobs(hours=7*24)
         self._job_cache = {job.job_url for job in recent_jobs}
         self._cache_loaded = True
-        print(f"🔧 Loaded {len(self._job_cache)} recent job URLs into cache")
+        logger.info(f"🔧 Loaded {len(self._job_cache)} recent job URLs into cache")
     
+    @traced()
     async def process_scraped_jobs(
         self, 
         jobs: List[PydanticJob], 
         category: str,
-        max_age_days: int = 30
+        max_age_days: int = 30,
+        stats: Optional[Dict[str, float]] = None
     ) -> tuple[List[DBJob], int]:
         """
         Process scraped jobs: filter by date, check for duplicates, save new ones
         Returns: (new_jobs_saved, total_filtered_out)
+        When given, `stats` receives the 'duplicates' and 'too_old' counts and
+        the 'filter_seconds', 'dedup_seconds' and 'insert_seconds' timings.
         """
         if not jobs:
             return [], 0
@@ -52,6 +103,7 @@ class JobManager:
             # Filter jobs by date (only last 30 days)
             cutoff_date = date.today() - timedelta(days=max_age_days)
             recent_jobs = []
+            started = time.perf_counter()
             
             for job in jobs:
                 try:
@@ -61,12 +113,17 @@ class JobManager:
                 except ValueError:
                     # Skip jobs with invalid dates
                     continue
+            filter_seconds = time.perf_counter() - started
             
-            print(f"📅 Filtered to {len(recent_jobs)} jobs from last {max_age_days} days (from {len(jobs)} total)")
+            logger.debug(
+                "📅 Filtered to %d jobs from last %d days (from %d total)",
+                len(recent_jobs), max_age_days, len(jobs)
+            )
             
             # Check for duplicates and save new jobs
             new_jobs = []
             duplicate_count = 0
+            dedup_seconds = insert_seconds = 0.0
             
             for job in recent_jobs:
                 # Check cache first (faster)
@@ -75,11 +132,15 @@ class JobManager:
                     continue
                 
                 # Check database (slower but thorough)
-                if await repository.job_exists(job.job_url):
+                started = time.perf_counter()
+                exists = await repository.job_exists(job.job_url)
+                dedup_seconds += time.perf_counter() - started
+                if exists:
                     duplicate_count += 1
                     self._job_cache.add(job.job_url)  # Add to cache for next time
                     continue
                 
+                started = time.perf_counter()
                 try:
                     # Save new job
                     db_job = await repository.create_job(job, category)
@@ -87,26 +148,84 @@ class JobManager:
                     self._job_cache.add(job.job_url)  # Add to cache
                     
                 except Exception as exc:
-                    print(f"⚠️ Error saving job {job.title}: {exc}")
+                    logger.warning("⚠️ Error saving job %s: %s", job.title, exc)
                     continue
+                finally:
+                    insert_seconds += time.perf_counter() - started
             
             filtered_count = len(jobs) - len(recent_jobs) + duplicate_count
-            print(f"💾 Saved {len(new_jobs)} new jobs, skipped {duplicate_count} duplicates")
+            if stats is not None:
+                stats["duplicates"] = duplicate_count
+                stats["too_old"] = len(jobs) - len(recent_jobs)
+                stats["filter_seconds"] = filter_seconds
+                stats["dedup_seconds"] = dedup_seconds
+                stats["insert_seconds"] = insert_seconds
+            logger.info(f"💾 Saved {len(new_jobs)} new jobs, skipped {duplicate_count} duplicates")
             
             return new_jobs, filtered_count
     
-    async def get_unsent_jobs(self, category: str, max_age_days: int = 30) -> List[DBJob]:
-        """Get jobs that haven't been sent to Telegram yet"""
+    async def get_unsent_jobs(
+        self,
+        category: str,
+        max_age_days: int = 30,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, datetime, int]] = None
+    ) -> List[DBJob]:
+        """
+        Get jobs that haven't been sent to Telegram yet (newest first)
+        Only the pre-rendered messages are loaded; jobs rendered with an older
+        template (or before messages were stored) are rendered once here.
+        """
         connection.initialize_database()
         if connection.async_session_factory is None:
             raise RuntimeError("Database not properly initialized")
         async with connection.async_session_factory() as session:
             repository = JobRepository(session)
-            return await repository.get_jobs_by_category(
+            jobs = await repository.get_unsent_messages(
                 category=category,
                 days_limit=max_age_days,
-                only_unsent=True
+                limit=limit,
+                after=after
             )
+            
+            stale_ids = [
+                job.id for job in jobs
+                if job.message_version != MESSAGE_TEMPLATE_VERSION or not job.message_markdown
+            ]
+            if stale_ids:
+                rendered = await repository.render_messages(stale_ids)
+                logger.debug("🔧 Rendered %d stored %s messages", rendered, category)
+            
+            return jobs
+    
+    async def iter_unsent_jobs(
+        self,
+        category: str,
+        max_age_days: int = 30,
+        page_size: int = 25
+    ) -> AsyncIterator[DBJob]:
+        """Iterate over unsent jobs newest first, one keyset page at a time"""
+        after = None
+        while True:
+            page = await self.get_unsent_jobs(
+                category, max_age_days=max_age_days, limit=page_size, after=after
+            )
+            for job in page:
+                yield job
+            
+            if len(page) < page_size:
+                return
+            last = page[-1]
+            after = (last.date_posted, last.created_at, last.id)
+    
+    async def count_unsent_jobs(self, category: str, max_age_days: int = 30) -> int:
+        """Count jobs that haven't been sent to Telegram yet"""
+        connection.initialize_database()
+        if connection.async_session_factory is None:
+            raise RuntimeError("Database not properly initialized")
+        async with connection.async_session_factory() as session:
+            repository = JobRepository(session)
+            return await repository.count_unsent(category, days_limit=max_age_days)
     
     async def mark_jobs_as_sent(self, job_ids: List[int]) -> int:
         """Mark jobs as sent to Telegram"""
@@ -138,11 +257,31 @@ class JobManager:
             repository = JobRepository(session)
             return await repository.cleanup_old_jobs(days_to_keep)
     
+    async def delete_categories(self, categories: List[str]) -> int:
+        """Remove every job of the given categories (benchmark data)"""
+        connection.initialize_database()
+        if connection.async_session_factory is None:
+            raise RuntimeError("Database not properly initialized")
+        async with connection.async_session_factory() as session:
+            deleted = await JobRepository(session).delete_categories(categories)
+        # Their URLs must not count as duplicates any more
+        self.clear_cache()
+        return deleted
+    
+    def sent_buffer(self, batch_size: int = 5, interval: float = 10.0) -> SentJobBuffer:
+        """Create a buffer that incrementally marks sent jobs"""
+        return SentJobBuffer(self, batch_size=batch_size, interval=interval)
+    
+    @property
+    def cache_size(self) -> int:
+        """Number of job URLs in the duplicate detection cache"""
+        return len(self._job_cache)
+    
     def clear_cache(self):
         """Clear the internal job cache"""
         self._job_cache.clear()
         self._cache_loaded = False
-        print("🔧 Job cache cleared")
+        logger.debug("🔧 Job cache cleared")
 
 # Global job manager instance
 job_manager = JobManager()
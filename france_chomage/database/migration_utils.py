@@ -3,6 +3,7 @@ Migration utilities for database setup
 """
 import json
 import asyncio
+import logging
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
@@ -10,12 +11,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from .repository import JobRepository
 from ..models import Job as PydanticJob
 
+logger = logging.getLogger(__name__)
+
 async def migrate_json_to_database(session: AsyncSession, json_file_path: str, category: str) -> int:
     """Migrate jobs from JSON file to database"""
     file_path = Path(json_file_path)
     
     if not file_path.exists():
-        print(f"⚠️ JSON file not found: {json_file_path}")
+        logger.warning(f"⚠️ JSON file not found: {json_file_path}")
         return 0
     
     try:
@@ -23,14 +26,14 @@ async def migrate_json_to_database(session: AsyncSession, json_file_path: str, c
             jobs_data = json.load(f)
         
         if not jobs_data:
-            print(f"📄 Empty JSON file: {json_file_path}")
+            logger.info(f"📄 Empty JSON file: {json_file_path}")
             return 0
         
         repository = JobRepository(session)
         migrated_count = 0
         skipped_count = 0
         
-        print(f"🔄 Migrating {len(jobs_data)} jobs from {json_file_path} to database...")
+        logger.info(f"🔄 Migrating {len(jobs_data)} jobs from {json_file_path} to database...")
         
         for job_data in jobs_data:
             try:
@@ -47,14 +50,16 @@ async def migrate_json_to_database(session: AsyncSession, json_file_path: str, c
                 migrated_count += 1
                 
             except Exception as exc:
-                print(f"⚠️ Error migrating job {job_data.get('title', 'Unknown')}: {exc}")
+                logger.warning(f"⚠️ Error migrating job {job_data.get('title', 'Unknown')}: {exc}")
                 continue
         
-        print(f"✅ Migration complete: {migrated_count} jobs migrated, {skipped_count} skipped")
+        logger.info(
+            f"✅ Migration complete: {migrated_count} jobs migrated, {skipped_count} skipped"
+        )
         return migrated_count
         
     except Exception as exc:
-        print(f"❌ Error reading JSON file {json_file_path}: {exc}")
+        logger.error(f"❌ Error reading JSON file {json_file_path}: {exc}")
         return 0
 
 async def migrate_all_json_files(session: AsyncSession) -> Dict[str, int]:
@@ -72,7 +77,7 @@ async def migrate_all_json_files(session: AsyncSession) -> Dict[str, int]:
         results[category] = count
     
     total_migrated = sum(results.values())
-    print(f"🎉 Total migration complete: {total_migrated} jobs migrated across all categories")
+    logger.info(f"🎉 Total migration complete: {total_migrated} jobs migrated across all categories")
     
     return results
 
@@ -97,7 +102,7 @@ def create_tables_sync():
                 async with connection.engine.begin() as conn:
                     await conn.run_sync(Base.metadata.create_all)
                 
-                print("✅ Database tables created successfully")
+                logger.info("✅ Database tables created successfully")
             
             loop.run_until_complete(_create())
         finally:
@@ -120,7 +125,7 @@ async def create_tables_if_not_exist():
     async with connection.engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
-    print("✅ Database tables created successfully")
+    logger.info("✅ Database tables created successfully")
 
 async def backup_jobs_to_json(session: AsyncSession, category: str, output_file: str = None) -> str:
     """Backup database jobs to JSON file"""
@@ -155,7 +160,7 @@ async def backup_jobs_to_json(session: AsyncSession, category: str, output_file:
     with output_path.open('w', encoding='utf-8') as f:
         json.dump(jobs_data, f, ensure_ascii=False, indent=2)
     
-    print(f"💾 Backed up {len(jobs_data)} jobs to {output_file}")
+    logger.info(f"💾 Backed up {len(jobs_data)} jobs to {output_file}")
     return output_file
 
 async def get_migration_status(session: AsyncSession) -> Dict[str, Any]:
@@ -3,7 +3,7 @@ SQLAlchemy database models
 """
 from datetime import datetime, date
 from typing import Optional
-from sqlalchemy import String, Boolean, DateTime, Date, Text, Index
+from sqlalchemy import String, Boolean, DateTime, Date, Text, Index, Integer, Float
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -43,6 +43,11 @@ class Job(Base):
     sent_to_telegram: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
+    # Pre-rendered Telegram messages (computed once at insert time)
+    message_markdown: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    message_plain: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    message_version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
     # Indexes for performance
     __table_args__ = (
         Index('idx_job_url', 'job_url'),
@@ -51,6 +56,9 @@ class Job(Base):
         Index('idx_sent_to_telegram', 'sent_to_telegram'),
         Index('idx_created_at', 'created_at'),
         Index('idx_company_location', 'company', 'location'),
+        Index(
+            'idx_unsent_keyset', 'category', 'sent_to_telegram', 'date_posted', 'created_at', 'id'
+        ),
     )
     
     def __repr__(self) -> str:
@@ -72,3 +80,56 @@ class Job(Base):
     def formatted_date(self) -> str:
         """Date formatée en dd/mm/yyyy"""
         return self.date_posted.strftime("%d/%m/%Y")
+
+
+class Run(Base):
+    """Database model for scrape and send run history"""
+    __tablename__ = "runs"
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    category: Mapped[str] = mapped_column(String(50), nullable=False)
+    operation: Mapped[str] = mapped_column(String(20), nullable=False)  # 'scrape' or 'send'
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    
+    # Stage durations in seconds
+    duration_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    network_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    parse_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    db_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    send_seconds: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    
+    # Row counts
+    rows_fetched: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    new_rows: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    duplicates: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    sent_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    
+    # Exception class name when the run failed
+    error_class: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    
+    __table_args__ = (
+        Index('idx_runs_category_operation', 'category', 'operation', 'started_at'),
+        Index('idx_runs_started_at', 'started_at'),
+    )
+    
+    def __repr__(self) -> str:
+        return f"<Run(id={self.id}, category='{self.category}', operation='{self.operation}')>"
+
+
+class ScheduleState(Base):
+    """Last successful run of each category operation (missed-run catch-up)"""
+    __tablename__ = "schedule_state"
+    
+    category: Mapped[str] = mapped_column(String(50), primary_key=True)
+    operation: Mapped[str] = mapped_column(String(20), primary_key=True)
+    last_success_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+    
+    def __repr__(self) -> str:
+        return (
+            f"<ScheduleState(category='{self.category}', operation='{self.operation}', "
+            f"last_success_at={self.last_success_at})>"
+        )
@@ -0,0 +1,155 @@
+"""
+SQL query timing through SQLAlchemy engine events
+
+`QueryProfiler.install(engine)` hooks before/after_cursor_execute on the
+engine: each statement is reduced to a fingerprint (parameters, literals
+and IN lists removed), counted and timed. Statements slower than
+DB_SLOW_QUERY_MS are logged with their parameters redacted. `report()`
+lists the top fingerprints by total time (`db profile` command).
+"""
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Deque, Dict, List
+
+from sqlalchemy import event
+
+from ..config import settings
+from ..metrics import DB_QUERY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_PARAM = re.compile(r"\$\d+(::(TIMESTAMP WITH(OUT)? TIME ZONE|\w+)(\[\])?)?|%\(\w+\)s|\?")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(\.\d+)?\b")
+_IN_LIST = re.compile(r"\((\s*\?\s*,)+\s*\?\s*\)")
+_SPACES = re.compile(r"\s+")
+_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+\"?(\w+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """Statement shape shared by all its executions"""
+    text = _STRING.sub("?", statement)
+    text = _PARAM.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _SPACES.sub(" ", text).strip()
+    return _IN_LIST.sub("(...)", text)
+
+
+@lru_cache(maxsize=1024)
+def statement_label(statement: str) -> str:
+    """Low-cardinality label for metrics: verb and first table"""
+    verb = statement.lstrip().split(" ", 1)[0].upper()
+    match = _TABLE.search(statement)
+    return f"{verb} {match.group(1)}" if match else verb
+
+
+@dataclass
+class QueryStat:
+    """Counts and latencies of one statement fingerprint"""
+    statement: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    # Recent durations for percentiles, bounded per fingerprint
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=500))
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total_seconds += duration
+        self.max_seconds = max(self.max_seconds, duration)
+        self.samples.append(duration)
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class QueryProfiler:
+    """Per-fingerprint statement statistics fed by engine events"""
+
+    def __init__(self, slow_threshold: float = 0.5):
+        self.slow_threshold = slow_threshold
+        self.stats: Dict[str, QueryStat] = {}
+        self.slow_count = 0
+
+    def install(self, engine) -> None:
+        """Register the timing hooks on an (async) engine"""
+        sync_engine = getattr(engine, "sync_engine", engine)
+        event.listen(sync_engine, "before_cursor_execute", self._before)
+        event.listen(sync_engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start_time")
+        if not starts:
+            return
+        self.record(statement, time.perf_counter() - starts.pop(), parameters)
+
+    def record(self, statement: str, duration: float, parameters=None) -> None:
+        key = fingerprint(statement)
+        stat = self.stats.get(key)
+        if stat is None:
+            stat = self.stats[key] = QueryStat(key)
+        stat.add(duration)
+        DB_QUERY_SECONDS.observe(duration, statement=statement_label(statement))
+
+        if self.slow_threshold > 0 and duration >= self.slow_threshold:
+            self.slow_count += 1
+            logger.warning(
+                "🐌 Slow query (%.0f ms, %s redacted): %s",
+                duration * 1000, _describe_parameters(parameters), key,
+                extra={"duration_ms": round(duration * 1000, 1), "statement": key}
+            )
+
+    def top(self, limit: int = 10) -> List[QueryStat]:
+        """Fingerprints with the most total time"""
+        ranked = sorted(self.stats.values(), key=lambda stat: stat.total_seconds, reverse=True)
+        return ranked[:limit]
+
+    def report(self, limit: int = 10, width: int = 100) -> str:
+        """Top queries as a text table"""
+        stats = self.top(limit)
+        if not stats:
+            return "No queries recorded"
+        total = sum(stat.total_seconds for stat in self.stats.values()) or 1.0
+        lines = [f"{'total':>9} {'%':>5} {'calls':>7} {'mean':>8} {'p95':>8} {'max':>8}  statement"]
+        for stat in stats:
+            statement = stat.statement
+            if len(statement) > width:
+                statement = statement[:width - 3] + "..."
+            lines.append(
+                f"{stat.total_seconds * 1000:>7.0f}ms {stat.total_seconds / total:>5.0%} "
+                f"{stat.count:>7} {stat.mean_seconds * 1000:>6.1f}ms "
+                f"{stat.percentile(0.95) * 1000:>6.1f}ms {stat.max_seconds * 1000:>6.1f}ms  "
+                f"{statement}"
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        self.stats.clear()
+        self.slow_count = 0
+
+
+def _describe_parameters(parameters) -> str:
+    if not parameters:
+        return "no params"
+    if isinstance(parameters, (list, tuple)) and isinstance(parameters[0], (list, tuple, dict)):
+        return f"{len(parameters)} param sets"
+    return f"{len(parameters)} params"
+
+
+# Global profiler, installed on the engine by connection.initialize_database()
+query_profiler = QueryProfiler(slow_threshold=settings.db_slow_query_ms / 1000)
@@ -2,11 +2,15 @@
 Job repository for database operations
 """
 from datetime import date, datetime, timedelta
-from typing import List
-from sqlalchemy import select, and_, or_, desc
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select, and_, or_, desc, func, tuple_, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from .models import Job as DBJob
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only
+from .models import Job as DBJob, Run, ScheduleState
 from ..models import Job as PydanticJob
+from ..formatting import MESSAGE_TEMPLATE_VERSION, render_job_messages
+from ..tracing import traced
 
 class JobRepository:
     """Repository for job database operations"""
@@ -14,6 +18,7 @@ class JobRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
     
+    @traced()
     async def create_job(self, job_data: PydanticJob, category: str) -> DBJob:
         """Create a new job in the database"""
         try:
@@ -34,6 +39,10 @@ class JobRepository:
                 category=category,
             )
             
+            # Pre-render Telegram messages once, the sender only posts them
+            db_job.message_markdown, db_job.message_plain = render_job_messages(db_job)
+            db_job.message_version = MESSAGE_TEMPLATE_VERSION
+            
             self.session.add(db_job)
             await self.session.commit()
             await self.session.refresh(db_job)
@@ -42,6 +51,7 @@ class JobRepository:
             await self.session.rollback()
             raise e
     
+    @traced()
     async def job_exists(self, job_url: str) -> bool:
         """Check if a job already exists by URL"""
         result = await self.session.execute(
@@ -49,6 +59,7 @@ class JobRepository:
         )
         return result.scalar_one_or_none() is not None
     
+    @traced()
     async def get_jobs_by_category(
         self, 
         category: str, 
@@ -73,6 +84,88 @@ class JobRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @traced()
+    async def get_unsent_messages(
+        self,
+        category: str,
+        days_limit: int = 30,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[date, datetime, int]] = None
+    ) -> List[DBJob]:
+        """
+        Get unsent jobs loading only the columns needed to post them
+        Newest first; pass the (date_posted, created_at, id) of the last row
+        of a page as `after` to fetch the next page (keyset pagination).
+        """
+        query = select(DBJob).options(
+            load_only(
+                DBJob.id,
+                DBJob.title,
+                DBJob.date_posted,
+                DBJob.created_at,
+                DBJob.message_markdown,
+                DBJob.message_plain,
+                DBJob.message_version,
+            )
+        ).where(
+            and_(DBJob.category == category, DBJob.sent_to_telegram == False)
+        )
+        
+        if days_limit > 0:
+            cutoff_date = date.today() - timedelta(days=days_limit)
+            query = query.where(DBJob.date_posted >= cutoff_date)
+        
+        if after is not None:
+            query = query.where(
+                tuple_(DBJob.date_posted, DBJob.created_at, DBJob.id) < tuple_(*after)
+            )
+        
+        query = query.order_by(desc(DBJob.date_posted), desc(DBJob.created_at), desc(DBJob.id))
+        
+        if limit is not None:
+            query = query.limit(limit)
+        
+        result = await self.session.execute(query)
+        return result.scalars().all()
+    
+    @traced()
+    async def count_unsent(self, category: str, days_limit: int = 30) -> int:
+        """Count unsent jobs for a category"""
+        query = select(func.count(DBJob.id)).where(
+            and_(DBJob.category == category, DBJob.sent_to_telegram == False)
+        )
+        
+        if days_limit > 0:
+            cutoff_date = date.today() - timedelta(days=days_limit)
+            query = query.where(DBJob.date_posted >= cutoff_date)
+        
+        result = await self.session.execute(query)
+        return result.scalar_one()
+    
+    @traced()
+    async def render_messages(self, job_ids: List[int]) -> int:
+        """(Re)render stored Telegram messages for jobs with a stale template"""
+        if not job_ids:
+            return 0
+        
+        try:
+            query = select(DBJob).where(DBJob.id.in_(job_ids)).execution_options(
+                populate_existing=True
+            )
+            result = await self.session.execute(query)
+            jobs = result.scalars().all()
+            
+            for job in jobs:
+                job.message_markdown, job.message_plain = render_job_messages(job)
+                job.message_version = MESSAGE_TEMPLATE_VERSION
+            
+            await self.session.commit()
+            return len(jobs)
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+    
+    @traced()
     async def get_recent_jobs(self, hours: int = 24) -> List[DBJob]:
         """Get jobs created in the last N hours"""
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
@@ -82,6 +175,7 @@ class JobRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @traced()
     async def mark_as_sent(self, job_ids: List[int]) -> int:
         """Mark jobs as sent to Telegram"""
         if not job_ids:
@@ -102,6 +196,7 @@ class JobRepository:
             await self.session.rollback()
             raise e
     
+    @traced()
     async def search_similar_jobs(
         self, 
         title: str, 
@@ -124,6 +219,7 @@ class JobRepository:
         result = await self.session.execute(query)
         return result.scalars().all()
     
+    @traced()
     async def get_job_stats(self, days: int = 30) -> dict:
         """Get job statistics for the last N days"""
         cutoff_date = date.today() - timedelta(days=days)
@@ -161,6 +257,7 @@ class JobRepository:
             "period_days": days
         }
     
+    @traced()
     async def cleanup_old_jobs(self, days_to_keep: int = 90) -> int:
         """Remove jobs older than specified days"""
         cutoff_date = date.today() - timedelta(days=days_to_keep)
@@ -171,3 +268,148 @@ class JobRepository:
         result = await self.session.execute(stmt)
         await self.session.commit()
         return result.rowcount
+    
+    @traced()
+    async def delete_categories(self, categories: List[str]) -> int:
+        """Remove every job of the given categories (benchmark data)"""
+        if not categories:
+            return 0
+        
+        from sqlalchemy import delete
+        stmt = delete(DBJob).where(DBJob.category.in_(categories))
+        
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.rowcount
+
+
+class RunRepository:
+    """Repository for run history operations"""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    @traced()
+    async def add_runs(self, runs: List[Dict[str, Any]]) -> int:
+        """Insert several finished runs in one statement"""
+        if not runs:
+            return 0
+        try:
+            await self.session.execute(insert(Run), runs)
+            await self.session.commit()
+            return len(runs)
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+    
+    @traced()
+    async def get_recent_runs(
+        self,
+        category: Optional[str] = None,
+        operation: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Run]:
+        """Get the latest runs, newest first"""
+        query = select(Run)
+        if category:
+            query = query.where(Run.category == category)
+        if operation:
+            query = query.where(Run.operation == operation)
+        query = query.order_by(desc(Run.started_at)).limit(limit)
+        
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+    
+    @traced()
+    async def get_average_costs(
+        self,
+        operation: str = "scrape",
+        days: int = 14
+    ) -> Dict[str, Dict[str, float]]:
+        """Average duration and yield of successful runs per category"""
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        query = select(
+            Run.category,
+            func.count(Run.id).label('runs'),
+            func.avg(Run.duration_seconds).label('duration_seconds'),
+            func.avg(Run.new_rows).label('new_rows'),
+        ).where(
+            and_(
+                Run.operation == operation,
+                Run.started_at >= cutoff,
+                Run.error_class.is_(None)
+            )
+        ).group_by(Run.category)
+        
+        result = await self.session.execute(query)
+        return {
+            row.category: {
+                "runs": row.runs,
+                "duration_seconds": float(row.duration_seconds or 0.0),
+                "new_rows": float(row.new_rows or 0.0),
+            }
+            for row in result
+        }
+    
+    @traced()
+    async def delete_categories(self, categories: List[str]) -> int:
+        """Remove the run history of the given categories (benchmark data)"""
+        if not categories:
+            return 0
+        
+        from sqlalchemy import delete
+        result = await self.session.execute(delete(Run).where(Run.category.in_(categories)))
+        await self.session.commit()
+        return result.rowcount
+
+
+class ScheduleStateRepository:
+    """Repository for the last successful run per category operation"""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    @traced()
+    async def mark_success(self, category: str, operation: str, at: datetime) -> None:
+        """Upsert the last successful run time"""
+        stmt = pg_insert(ScheduleState).values(
+            category=category,
+            operation=operation,
+            last_success_at=at,
+            updated_at=datetime.utcnow()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ScheduleState.category, ScheduleState.operation],
+            set_={
+                "last_success_at": stmt.excluded.last_success_at,
+                "updated_at": stmt.excluded.updated_at
+            }
+        )
+        try:
+            await self.session.execute(stmt)
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            raise e
+    
+    @traced()
+    async def get_last_successes(self) -> Dict[Tuple[str, str], datetime]:
+        """Last successful run time keyed by (category, operation)"""
+        result = await self.session.execute(select(ScheduleState))
+        return {
+            (state.category, state.operation): state.last_success_at
+            for state in result.scalars().all()
+        }
+    
+    @traced()
+    async def delete_categories(self, categories: List[str]) -> int:
+        """Forget the last successful runs of the given categories"""
+        if not categories:
+            return 0
+        
+        from sqlalchemy import delete
+        result = await self.session.execute(
+            delete(ScheduleState).where(ScheduleState.category.in_(categories))
+        )
+        await self.session.commit()
+        return result.rowcount
@@ -0,0 +1,196 @@
+"""
+Run history recording for scrape and send runs
+"""
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from .repository import RunRepository, ScheduleStateRepository
+from . import connection
+from ..config import settings
+from ..metrics import RUNS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RunRecord:
+    """One scrape or send run, written to the `runs` table when finished"""
+    category: str
+    operation: str
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    duration_seconds: Optional[float] = None
+    network_seconds: Optional[float] = None
+    parse_seconds: Optional[float] = None
+    db_seconds: Optional[float] = None
+    send_seconds: Optional[float] = None
+    rows_fetched: Optional[int] = None
+    new_rows: Optional[int] = None
+    duplicates: Optional[int] = None
+    sent_count: Optional[int] = None
+    error_class: Optional[str] = None
+
+    def __post_init__(self):
+        self._started = time.monotonic()
+
+    def update(self, stats: Dict[str, Any]) -> None:
+        """Copy known stage timings and counts from a stats dict"""
+        for key, value in stats.items():
+            if key in self.__dataclass_fields__:
+                setattr(self, key, value)
+
+    def fail(self, exc: BaseException) -> None:
+        """Record the exception class of a failed run"""
+        self.error_class = type(exc).__name__
+
+    def finish(self) -> None:
+        """Stamp the end time and total duration"""
+        self.finished_at = datetime.utcnow()
+        self.duration_seconds = round(time.monotonic() - self._started, 3)
+
+    def as_row(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class RunRecorder:
+    """
+    Collects finished runs and inserts them in batches
+    `record()` never waits on the database: a write is started in the
+    background once `batch_size` runs are pending or `interval` seconds
+    after the first pending run. Runs that fail to be written are kept
+    (up to `max_pending`) for the next attempt.
+    """
+
+    def __init__(self, batch_size: int = 10, interval: float = 30.0, max_pending: int = 1000):
+        self.batch_size = max(1, batch_size)
+        self.interval = interval
+        self.max_pending = max_pending
+        self.pending: List[RunRecord] = []
+        self.written_count = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    def start(self, category: str, operation: str) -> RunRecord:
+        """Begin a new run record"""
+        return RunRecord(category=category, operation=operation)
+
+    @contextmanager
+    def track(self, category: str, operation: str) -> Iterator[RunRecord]:
+        """Time a run and record it when the block exits, even on cancellation"""
+        run = self.start(category, operation)
+        try:
+            yield run
+        except BaseException as exc:
+            run.fail(exc)
+            raise
+        finally:
+            run.finish()
+            self.record(run)
+
+    def record(self, run: RunRecord) -> None:
+        """Queue a finished run, scheduling a background write when due"""
+        RUNS.inc(
+            category=run.category,
+            operation=run.operation,
+            status="error" if run.error_class else "ok"
+        )
+        self.pending.append(run)
+        if len(self.pending) > self.max_pending:
+            del self.pending[:-self.max_pending]
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (sync caller): written by the next flush()
+
+        if len(self.pending) >= self.batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.interval, self._start_flush)
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> int:
+        """Write all pending runs now"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self.pending:
+            return 0
+
+        runs, self.pending = self.pending, []
+        try:
+            written = await self._write([run.as_row() for run in runs])
+        except Exception as exc:
+            logger.warning(f"⚠️ Could not write {len(runs)} run records: {exc}")
+            self.pending = (runs + self.pending)[-self.max_pending:]
+            self._retry_later()
+            return 0
+        self.written_count += written
+        return written
+
+    def _retry_later(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._timer is None:
+            self._timer = loop.call_later(self.interval, self._start_flush)
+
+    async def close(self) -> None:
+        """Wait for background writes and flush what is left"""
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.flush()
+
+    async def _write(self, rows: List[Dict[str, Any]]) -> int:
+        connection.initialize_database()
+        if connection.async_session_factory is None:
+            raise RuntimeError("Database not properly initialized")
+        async with connection.async_session_factory() as session:
+            return await RunRepository(session).add_runs(rows)
+
+
+async def mark_run_success(category: str, operation: str, at: datetime) -> None:
+    """Persist the start time of a successful run (UTC)"""
+    connection.initialize_database()
+    if connection.async_session_factory is None:
+        raise RuntimeError("Database not properly initialized")
+    async with connection.async_session_factory() as session:
+        await ScheduleStateRepository(session).mark_success(category, operation, at)
+
+
+async def delete_run_history(categories: List[str]) -> int:
+    """Remove the runs and last successes of the given categories (benchmark data)"""
+    connection.initialize_database()
+    if connection.async_session_factory is None:
+        raise RuntimeError("Database not properly initialized")
+    async with connection.async_session_factory() as session:
+        deleted = await RunRepository(session).delete_categories(categories)
+        return deleted + await ScheduleStateRepository(session).delete_categories(categories)
+
+
+async def load_last_successes() -> Dict[Tuple[str, str], datetime]:
+    """Last successful run start (UTC) per (category, operation)"""
+    connection.initialize_database()
+    if connection.async_session_factory is None:
+        raise RuntimeError("Database not properly initialized")
+    async with connection.async_session_factory() as session:
+        return await ScheduleStateRepository(session).get_last_successes()
+
+
+# Global run recorder instance
+run_recorder = RunRecorder(
+    batch_size=settings.run_record_batch_size,
+    interval=settings.run_record_interval
+)
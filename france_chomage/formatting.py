@@ -0,0 +1,75 @@
+"""
+Formatage des messages Telegram pour les offres d'emploi
+"""
+from typing import Tuple
+
+# Version du gabarit de message. À incrémenter à chaque changement de
+# format_job_message pour que les rendus stockés en base soient régénérés.
+MESSAGE_TEMPLATE_VERSION = 1
+
+# Caractères à échapper pour MarkdownV2
+MARKDOWN_ESCAPE_CHARS = [
+    '*', '_', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!'
+]
+
+
+def escape_markdown(text: str) -> str:
+    """Échappe les caractères spéciaux MarkdownV2"""
+    if not text:
+        return ""
+
+    for char in MARKDOWN_ESCAPE_CHARS:
+        text = text.replace(char, f'\\{char}')
+
+    return text
+
+
+def format_job_message(job) -> str:
+    """Formate un message Telegram MarkdownV2 pour une offre (Job ou DBJob)"""
+
+    # Échappement des textes
+    title = escape_markdown(job.display_title)
+    company = escape_markdown(job.company)
+    location = escape_markdown(job.location)
+
+    # Format date properly - dd/mm/yyyy (DBJob), sinon chaîne brute (ancien modèle Job)
+    formatted_date = getattr(job, 'formatted_date', None)
+    date_posted = escape_markdown(formatted_date or job.date_posted)
+
+    # Construction du message
+    message = f"🎯 *{title}*\n\n"
+    message += f"🏢 *{company}*\n"
+    message += f"📍 {location}\n"
+    message += f"📅 Publié le : {date_posted}\n"
+
+    # Télétravail
+    if job.is_remote:
+        message += "🏠 Télétravail possible\n"
+
+    # Salaire
+    if job.salary_source:
+        salary = escape_markdown(job.salary_source)
+        message += f"💰 {salary}\n"
+
+    # Lien (pas d'échappement, Telegram gère)
+    message += f"\n🔗 [Postuler ici]({job.job_url})\n"
+
+    # Description courte
+    if job.description:
+        desc = escape_markdown(job.short_description)
+        message += f"\n📝 {desc}"
+        if len(job.description) > 200:
+            message += "\\.\\.\\."
+
+    return message
+
+
+def to_plain_text(message: str) -> str:
+    """Retire le formatage MarkdownV2 (fallback texte brut)"""
+    return message.replace('*', '').replace('\\', '').replace('_', '')
+
+
+def render_job_messages(job) -> Tuple[str, str]:
+    """Retourne les rendus (MarkdownV2, texte brut) d'une offre"""
+    message = format_job_message(job)
+    return message, to_plain_text(message)
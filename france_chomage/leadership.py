@@ -0,0 +1,256 @@
+"""
+Multi-replica scheduling coordinated through Postgres advisory locks
+
+Modes (SCHEDULER_LEADER_MODE):
+- off: single replica, every category is owned (default)
+- global: one replica holds the leader lock and runs every category
+- category: each category has its own lock; with SCHEDULER_LEADER_HASHING
+  replicas only claim the categories assigned to them by rendezvous hashing
+  over the live replicas
+
+Advisory locks belong to a dedicated database connection, so they are
+released by Postgres as soon as the holder dies or loses its connection;
+the other replicas take over at their next poll. That connection comes
+from the shared pool, where closing it keeps the session (and its locks)
+open: stepping down therefore unlocks everything explicitly, or discards
+the connection when that fails.
+"""
+import asyncio
+import hashlib
+import logging
+import zlib
+from typing import Callable, Iterable, List, Optional, Set
+
+from sqlalchemy import text
+
+from france_chomage.config import settings
+from france_chomage.database import connection
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAMESPACE = zlib.crc32(b"france_chomage.scheduler") & 0x3FFFFFFF
+LEADER_NAMESPACE = LOCK_NAMESPACE        # (ns, 0): global leader lock
+REPLICA_NAMESPACE = LOCK_NAMESPACE + 1   # (ns, slot): replica membership
+CATEGORY_NAMESPACE = LOCK_NAMESPACE + 2  # (ns, crc32(name)): category owner
+
+LEADER_MODES = ("off", "global", "category")
+
+
+def category_lock_key(category: str) -> int:
+    """Stable 31-bit lock key for a category"""
+    return zlib.crc32(category.encode("utf-8")) & 0x7FFFFFFF
+
+
+def rendezvous_owner(category: str, members: Iterable[int]) -> Optional[int]:
+    """Replica slot that owns a category (highest random weight hashing)"""
+    def weight(member: int) -> int:
+        digest = hashlib.md5(f"{category}:{member}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    members = list(members)
+    if not members:
+        return None
+    return max(members, key=weight)
+
+
+class SchedulerLeadership:
+    """Tracks which categories this replica may run"""
+
+    def __init__(
+        self,
+        mode: str = "off",
+        replica_slots: int = 4,
+        hashing: bool = True,
+        poll_interval: float = 15.0
+    ):
+        if mode not in LEADER_MODES:
+            raise ValueError(f"Unknown leader mode '{mode}', expected one of {LEADER_MODES}")
+        self.mode = mode
+        self.replica_slots = max(1, replica_slots)
+        self.hashing = hashing
+        self.poll_interval = poll_interval
+
+        self.is_leader = False
+        self.slot: Optional[int] = None
+        self.owned: Set[str] = set()
+        self._conn = None
+
+    def owns(self, category: str) -> bool:
+        """Whether this replica should run the category now"""
+        if self.mode == "off":
+            return True
+        if self.mode == "global":
+            return self.is_leader
+        return category in self.owned
+
+    async def refresh(
+        self,
+        categories: Iterable[str],
+        busy: Callable[[str], bool] = lambda category: False
+    ) -> Set[str]:
+        """
+        Take or confirm locks, returning the categories newly owned
+        Categories with a run in flight (`busy`) are never handed over.
+        """
+        if self.mode == "off":
+            return set()
+
+        try:
+            await self._ensure_connection()
+            if self.mode == "global":
+                return await self._refresh_global(categories)
+            return await self._refresh_categories(list(categories), busy)
+        except Exception as e:
+            logger.warning(f"⚠️ Leadership check failed, stepping down: {e}")
+            await self._reset()
+            return set()
+
+    async def _refresh_global(self, categories: Iterable[str]) -> Set[str]:
+        if self.is_leader:
+            await self._heartbeat()
+            return set()
+
+        if await self._try_lock(LEADER_NAMESPACE, 0):
+            self.is_leader = True
+            logger.info("👑 This replica is now the scheduler leader")
+            return set(categories)
+        return set()
+
+    async def _refresh_categories(
+        self,
+        categories: List[str],
+        busy: Callable[[str], bool]
+    ) -> Set[str]:
+        await self._heartbeat()
+
+        wanted = set(categories)
+        if self.hashing:
+            if self.slot is None:
+                for slot in range(self.replica_slots):
+                    if await self._try_lock(REPLICA_NAMESPACE, slot):
+                        self.slot = slot
+                        logger.info(f"🧩 Joined as replica slot {slot}")
+                        break
+            if self.slot is None:
+                # All slots taken: stand by until a replica leaves
+                wanted = set()
+            else:
+                members = set(await self._members()) | {self.slot}
+                wanted = {
+                    category for category in categories
+                    if rendezvous_owner(category, members) == self.slot
+                }
+
+        # Hand over categories now assigned elsewhere (or removed)
+        for category in sorted(self.owned - wanted):
+            if busy(category):
+                continue
+            await self._unlock(CATEGORY_NAMESPACE, category_lock_key(category))
+            self.owned.discard(category)
+
+        gained = set()
+        for category in sorted(wanted - self.owned):
+            if await self._try_lock(CATEGORY_NAMESPACE, category_lock_key(category)):
+                self.owned.add(category)
+                gained.add(category)
+
+        if gained:
+            logger.info(
+                f"🧩 Now running {len(self.owned)} categories (+{', '.join(sorted(gained))})"
+            )
+        return gained
+
+    async def run(
+        self,
+        categories: Callable[[], Iterable[str]],
+        busy: Callable[[str], bool] = lambda category: False,
+        on_gain: Optional[Callable[[Set[str]], None]] = None
+    ) -> None:
+        """Poll the locks forever, calling on_gain for newly owned categories"""
+        if self.mode == "off":
+            return
+
+        while True:
+            gained = await self.refresh(categories(), busy)
+            if gained and on_gain is not None:
+                on_gain(gained)
+            await asyncio.sleep(self.poll_interval)
+
+    async def close(self) -> None:
+        """Release every lock and give the dedicated connection back"""
+        await self._reset()
+
+    # Database access, one dedicated connection holding session-level locks
+
+    async def _ensure_connection(self) -> None:
+        if self._conn is not None:
+            return
+        connection.initialize_database()
+        self._conn = await connection.engine.connect()
+
+    async def _scalar(self, sql: str, **params):
+        result = await self._conn.execute(text(sql), params)
+        value = result.scalar()
+        # Session-level locks survive the commit, no transaction is left open
+        await self._conn.commit()
+        return value
+
+    async def _heartbeat(self) -> None:
+        await self._scalar("SELECT 1")
+
+    async def _try_lock(self, namespace: int, key: int) -> bool:
+        return bool(await self._scalar(
+            "SELECT pg_try_advisory_lock(:namespace, :key)", namespace=namespace, key=key
+        ))
+
+    async def _unlock(self, namespace: int, key: int) -> None:
+        await self._scalar(
+            "SELECT pg_advisory_unlock(:namespace, :key)", namespace=namespace, key=key
+        )
+
+    async def _members(self) -> List[int]:
+        result = await self._conn.execute(
+            text(
+                "SELECT objid FROM pg_locks "
+                "WHERE locktype = 'advisory' AND classid = :namespace AND objsubid = 2 AND granted"
+            ),
+            {"namespace": REPLICA_NAMESPACE}
+        )
+        members = [int(row[0]) for row in result]
+        await self._conn.commit()
+        return members
+
+    async def _reset(self) -> None:
+        if self.is_leader or self.owned:
+            logger.info("👋 Scheduler locks released")
+        self.is_leader = False
+        self.slot = None
+        self.owned = set()
+
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            await self._release(conn)
+
+    async def _release(self, conn) -> None:
+        """Drop the session's locks before the connection returns to the pool"""
+        try:
+            await conn.execute(text("SELECT pg_advisory_unlock_all()"))
+            await conn.commit()
+            await conn.close()
+        except Exception as e:
+            # Session state unknown: discard the connection so Postgres ends
+            # the session, and its locks with it, instead of pooling it
+            logger.debug("Lock connection discarded: %s", e)
+            try:
+                await conn.invalidate()
+            except Exception:
+                pass  # Already broken: Postgres dropped its locks
+
+
+# Global leadership instance
+leadership = SchedulerLeadership(
+    mode=settings.scheduler_leader_mode,
+    replica_slots=settings.scheduler_replica_slots,
+    hashing=settings.scheduler_leader_hashing,
+    poll_interval=settings.leader_poll_interval
+)
@@ -0,0 +1,97 @@
+"""
+Logging configuration for the scheduler and the CLI
+
+Records are handed to a QueueHandler and written to stdout by a
+QueueListener thread, so code on the event loop never waits on the
+terminal or the container log pipe. LOG_LEVEL sets the verbosity
+(per-job and per-attempt details are DEBUG) and LOG_FORMAT=json emits
+one JSON object per line for log collectors.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+from france_chomage.config import settings
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(message)s"
+
+# Attributes present on every LogRecord, anything else came from `extra=`
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None)))
+_RESERVED |= {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with `extra=` fields kept"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def make_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    stream=None
+) -> None:
+    """
+    Route the root logger through a queue to a background stdout writer
+    Calling it again replaces the previous configuration.
+    """
+    global _listener
+    stop_logging()
+
+    level = (level or settings.log_level).upper()
+    log_format = (log_format or settings.log_format).lower()
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(make_formatter(log_format))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for existing in [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+        root.removeHandler(existing)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
+
+    # Third-party chatter stays at WARNING unless explicitly debugging
+    for name in ("httpx", "httpcore", "telegram", "sqlalchemy.engine"):
+        logging.getLogger(name).setLevel(logging.DEBUG if level == "DEBUG" else logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the background writer"""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,209 @@
+"""
+Memory watch for the long-running scheduler
+
+With MEMORY_WATCH_INTERVAL set, tracemalloc is started and a snapshot is
+taken every interval. Each check logs the RSS trend and the allocation
+sites that grew the most since the first snapshot, and updates per
+subsystem gauges (france_chomage.database, pandas, sqlalchemy...). The
+first and latest snapshots are dumped to MEMORY_SNAPSHOT_DIR so
+`utils memory` can diff them from another process.
+"""
+import asyncio
+import logging
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from france_chomage.metrics import MEMORY_TRACED_BYTES
+
+logger = logging.getLogger(__name__)
+
+BASELINE_FILE = "baseline.snapshot"
+LATEST_FILE = "latest.snapshot"
+
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is not available)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def subsystem(filename: str) -> str:
+    """Package an allocation belongs to, `france_chomage.<module>` for ours"""
+    parts = Path(filename).parts
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            package = parts[parts.index(marker) + 1].split(".")[0]
+            if package != "france_chomage":
+                return package
+    if "france_chomage" in parts:
+        index = len(parts) - 1 - parts[::-1].index("france_chomage")
+        inner = parts[index + 1:-1] or (Path(filename).stem,)
+        return f"france_chomage.{inner[0]}"
+    return "stdlib" if "python3" in filename else Path(filename).name
+
+
+@dataclass
+class Growth:
+    """Size change of one allocation site or subsystem"""
+    where: str
+    size_diff: int
+    size: int
+    count_diff: int
+
+
+def top_growth(
+    snapshot: tracemalloc.Snapshot,
+    baseline: tracemalloc.Snapshot,
+    limit: int = 10
+) -> List[Growth]:
+    """Allocation sites that grew the most between two snapshots"""
+    growth = []
+    for stat in snapshot.compare_to(baseline, "lineno"):
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        where = f"{frame.filename}:{frame.lineno}"
+        growth.append(Growth(where, stat.size_diff, stat.size, stat.count_diff))
+        if len(growth) >= limit:
+            break
+    return growth
+
+
+def subsystem_sizes(snapshot: tracemalloc.Snapshot) -> Dict[str, int]:
+    """Traced bytes per subsystem"""
+    sizes: Dict[str, int] = {}
+    for stat in snapshot.statistics("filename"):
+        name = subsystem(stat.traceback[0].filename)
+        sizes[name] = sizes.get(name, 0) + stat.size
+    return sizes
+
+
+def format_size(size: float) -> str:
+    sign = "-" if size < 0 else ""
+    size = abs(size)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{sign}{size:.0f} {unit}" if unit == "B" else f"{sign}{size:.1f} {unit}"
+        size /= 1024
+    return f"{sign}{size:.2f} GiB"
+
+
+def format_growth(item: Growth) -> str:
+    return (
+        f"+{format_size(item.size_diff)} (now {format_size(item.size)}, "
+        f"{item.count_diff:+d} blocks) {item.where}"
+    )
+
+
+class MemoryWatch:
+    """Periodic tracemalloc snapshots diffed against the first one"""
+
+    def __init__(
+        self,
+        interval: float = 900.0,
+        top: int = 10,
+        frames: int = 1,
+        snapshot_dir: Optional[str] = None
+    ):
+        self.interval = interval
+        self.top = top
+        self.frames = frames
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.baseline_rss: Optional[int] = None
+        self.previous_sizes: Dict[str, int] = {}
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def take_snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+    def check(self) -> List[Growth]:
+        """Take a snapshot, report growth since the baseline and dump it"""
+        snapshot = self.take_snapshot()
+        rss = rss_bytes()
+        sizes = subsystem_sizes(snapshot)
+        for name, size in sizes.items():
+            MEMORY_TRACED_BYTES.set(size, subsystem=name)
+        traced = format_size(sum(sizes.values()))
+
+        if self.baseline is None:
+            self.baseline, self.baseline_rss = snapshot, rss
+            self.previous_sizes = sizes
+            self._dump(snapshot, BASELINE_FILE)
+            logger.info("🧠 Memory baseline: RSS %s, traced %s", format_size(rss), traced)
+            return []
+
+        growth = top_growth(snapshot, self.baseline, self.top)
+        growing = sorted(
+            ((name, size - self.previous_sizes.get(name, 0)) for name, size in sizes.items()),
+            key=lambda item: item[1],
+            reverse=True
+        )[:3]
+        self.previous_sizes = sizes
+        self._dump(snapshot, LATEST_FILE)
+
+        logger.info(
+            "🧠 RSS %s (%s since start), traced %s; growing since last check: %s%s",
+            format_size(rss), format_size(rss - self.baseline_rss), traced,
+            ", ".join(f"{name} {format_size(diff)}" for name, diff in growing if diff > 0)
+            or "none",
+            "".join(f"\n  {format_growth(item)}" for item in growth)
+        )
+        return growth
+
+    async def run(self) -> None:
+        """
+        Check forever
+        The check runs in a worker thread, but take_snapshot() and the
+        comparison hold the GIL: the event loop still pauses for the length
+        of each check (logged at DEBUG), which is why the interval is meant
+        to be minutes rather than seconds.
+        """
+        self.start()
+        while True:
+            started = time.perf_counter()
+            await asyncio.to_thread(self.check)
+            logger.debug(
+                "🧠 Memory check paused the loop for up to %.2fs", time.perf_counter() - started
+            )
+            await asyncio.sleep(self.interval)
+
+    def _dump(self, snapshot: tracemalloc.Snapshot, name: str) -> None:
+        if self.snapshot_dir is None:
+            return
+        try:
+            self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.snapshot_dir / f"{name}.tmp"
+            snapshot.dump(str(tmp))
+            tmp.replace(self.snapshot_dir / name)
+        except OSError as e:
+            logger.warning("⚠️ Could not write memory snapshot %s: %s", name, e)
+
+
+def load_snapshots(snapshot_dir: str):
+    """(baseline, latest) snapshots dumped by the scheduler's memory watch"""
+    directory = Path(snapshot_dir)
+    baseline = tracemalloc.Snapshot.load(str(directory / BASELINE_FILE))
+    latest_path = directory / LATEST_FILE
+    latest = tracemalloc.Snapshot.load(str(latest_path)) if latest_path.exists() else baseline
+    return baseline, latest
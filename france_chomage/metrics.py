@@ -0,0 +1,368 @@
+"""
+Prometheus-compatible metrics for the scheduler process
+
+A small dependency-free registry (counters, gauges, histograms with labels)
+rendered in the Prometheus text format by a local HTTP server on
+METRICS_PORT. Updates are cheap and thread-safe; gauges backed by a
+callback (pool usage, cache size) are read at scrape time.
+"""
+import asyncio
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, optionally read from a callback"""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, callback: Callable[[], float]) -> None:
+        """Read the (unlabelled) value from `callback` at scrape time"""
+        self.callback = callback
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        if self.callback is not None:
+            try:
+                return [f"{self.name} {_format_value(self.callback())}"]
+            except Exception:
+                return []
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> [bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def count(self, **labels: str) -> float:
+        state = self._values.get(self._key(labels))
+        return state[-1] if state else 0.0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, list(state)) for key, state in self._values.items())
+        lines = []
+        for key, state in values:
+            for bound, bucket_count in zip(self.buckets, state):
+                le = f'le="{_format_value(bound)}"'
+                bucket_labels = _format_labels(self.labelnames, key, le)
+                lines.append(f"{self.name}_bucket{bucket_labels} {_format_value(bucket_count)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(state[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry and the metrics of the scheduler process
+registry = MetricsRegistry()
+
+SCRAPE_FETCH_SECONDS = registry.histogram(
+    "france_chomage_scrape_fetch_seconds", "jobspy call duration", ("category", "site")
+)
+SCRAPE_RUN_SECONDS = registry.histogram(
+    "france_chomage_scrape_run_seconds", "Whole scrape run duration", ("category",)
+)
+SCRAPE_ROWS = registry.counter(
+    "france_chomage_scrape_rows_total", "Scraped rows by outcome (fetched, new, duplicate)",
+    ("category", "kind")
+)
+SCRAPE_SITE_ROWS = registry.counter(
+    "france_chomage_scrape_site_rows_total", "Fetched rows per job site", ("category", "site")
+)
+SCRAPE_BLOCKED = registry.counter(
+    "france_chomage_scrape_403_total", "HTTP 403 (anti-bot) errors from job sites",
+    ("category", "site")
+)
+RUNS = registry.counter(
+    "france_chomage_runs_total", "Finished runs by status", ("category", "operation", "status")
+)
+TELEGRAM_SEND_SECONDS = registry.histogram(
+    "france_chomage_telegram_send_seconds", "Telegram send_message latency",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+TELEGRAM_RETRY_AFTER = registry.counter(
+    "france_chomage_telegram_retry_after_total", "Telegram 429 RetryAfter responses"
+)
+TELEGRAM_SENT = registry.counter(
+    "france_chomage_telegram_messages_total",
+    "Telegram messages by outcome (markdown, plain, failed)",
+    ("outcome",)
+)
+DB_POOL_CHECKED_OUT = registry.gauge(
+    "france_chomage_db_pool_checked_out", "Database connections checked out of the pool"
+)
+DB_POOL_OVERFLOW = registry.gauge(
+    "france_chomage_db_pool_overflow", "Database connections open beyond the pool size"
+)
+EVENT_LOOP_LAG = registry.gauge(
+    "france_chomage_event_loop_lag_seconds", "Latest measured event loop lag"
+)
+EVENT_LOOP_LAG_SECONDS = registry.histogram(
+    "france_chomage_event_loop_lag_histogram_seconds", "Measured event loop lag",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+DB_QUERY_SECONDS = registry.histogram(
+    "france_chomage_db_query_seconds", "SQL statement duration by verb and table", ("statement",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+EVENT_LOOP_BLOCKED = registry.counter(
+    "france_chomage_event_loop_blocked_total",
+    "Event loop stalls caught by the watchdog, by blocking code",
+    ("location",)
+)
+EVENT_LOOP_STALL_SECONDS = registry.histogram(
+    "france_chomage_event_loop_stall_seconds",
+    "Duration of event loop stalls caught by the watchdog",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+PROCESS_RSS_BYTES = registry.gauge(
+    "france_chomage_process_resident_memory_bytes", "Resident set size of the process"
+)
+MEMORY_TRACED_BYTES = registry.gauge(
+    "france_chomage_memory_traced_bytes",
+    "Memory traced by tracemalloc per subsystem (memory watch)",
+    ("subsystem",)
+)
+JOB_CACHE_SIZE = registry.gauge(
+    "france_chomage_job_url_cache_size", "Job URLs in the deduplication cache"
+)
+
+
+class MetricsServer:
+    """Local HTTP server exposing /metrics in a background thread"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 9108,
+        metrics: Optional[MetricsRegistry] = None
+    ):
+        self.registry = metrics or registry
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True, name="metrics-server"
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _make_handler(self):
+        metrics = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(HTTPStatus.NOT_FOUND)
+                    return
+                data = metrics.render().encode("utf-8")
+                self.send_response(HTTPStatus.OK)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+async def monitor_loop_lag(interval: float = 1.0) -> None:
+    """Measure how late the event loop wakes up from a sleep, forever"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+
+
+def start_metrics_server(host: str, port: int) -> Optional[MetricsServer]:
+    """Start the /metrics server, or return None if it cannot bind"""
+    try:
+        server = MetricsServer(host, port).start()
+    except OSError as e:
+        logger.warning(f"⚠️ Metrics server not started on {host}:{port}: {e}")
+        return None
+    logger.info(f"📈 Metrics available at {server.url}")
+    return server
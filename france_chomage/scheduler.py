@@ -2,14 +2,28 @@
 Configuration-driven scheduler for the France Chômage bot
 """
 import asyncio
-import schedule
+import logging
+import signal
 import time
-from typing import Dict, Any
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from france_chomage.config import settings
 from france_chomage.categories import category_manager, CategoryConfig
+from france_chomage.leadership import leadership
+from france_chomage.memory import MemoryWatch, rss_bytes
+from france_chomage.logging_config import setup_logging, stop_logging
+from france_chomage import metrics
+from france_chomage.database import connection, job_manager
 from france_chomage.scraping.category_scraper import create_category_scraper
 from france_chomage.telegram.bot import telegram_bot
-from france_chomage.database.connection import initialize_database
+from france_chomage.tracing import span
+from france_chomage.watchdog import LoopWatchdog
+from france_chomage.database.connection import close_database, initialize_database
+from france_chomage.database.profiling import query_profiler
+from france_chomage.database.runs import load_last_successes, mark_run_success, run_recorder
+
+logger = logging.getLogger(__name__)
 
 # Global job statistics
 job_stats: Dict[str, Dict[str, Any]] = {}
@@ -17,66 +31,104 @@ job_stats: Dict[str, Dict[str, Any]] = {}
 
 async def run_scrape_job(category_name: str) -> None:
     """Run scraping job for a category"""
-    try:
-        # Get category configuration
-        category_config = category_manager.get_category(category_name)
-        
-        print(f"🎯 Starting scraping for {category_name}...")
-        print(f"🔍 Search terms: {category_config.search_terms}")
-        
-        # Create and run scraper
-        print(f"📡 Scraping {category_name} in progress...")
-        scraper = create_category_scraper(category_config)
-        jobs = await scraper.scrape()
-        
-        print(f"📦 {len(jobs)} {category_name} jobs scraped and saved to database")
-        
-        # Save statistics for scraping
-        if category_name not in job_stats:
-            job_stats[category_name] = {}
-        job_stats[category_name]['jobs_scraped'] = len(jobs)
-        
-    except Exception as e:
-        print(f"❌ Error scraping {category_name}: {e}")
-        if category_name not in job_stats:
-            job_stats[category_name] = {}
-        job_stats[category_name]['scrape_error'] = str(e)
+    with run_recorder.track(category_name, 'scrape') as run:
+        try:
+            # Get category configuration
+            category_config = category_manager.get_category(category_name)
+            
+            logger.info(f"🎯 Starting scraping for {category_name}...")
+            logger.debug("🔍 Search terms: %s", category_config.search_terms)
+            
+            # Create and run scraper
+            logger.debug("📡 Scraping %s in progress...", category_name)
+            scraper = create_category_scraper(category_config)
+            started = time.monotonic()
+            try:
+                jobs = await scraper.scrape()
+            finally:
+                run.update(scraper.stats)
+            duration = time.monotonic() - started
+            
+            logger.info(f"📦 {len(jobs)} {category_name} jobs scraped and saved to database")
+            
+            # Save statistics for scraping
+            if category_name not in job_stats:
+                job_stats[category_name] = {}
+            job_stats[category_name]['jobs_scraped'] = len(jobs)
+            job_stats[category_name]['jobs_new'] = scraper.new_jobs_count
+            job_stats[category_name]['scrape_seconds'] = round(duration, 1)
+            job_stats[category_name]['scrape_timings'] = scraper.timings()
+            
+            metrics.SCRAPE_RUN_SECONDS.observe(duration, category=category_name)
+            row_kinds = (
+                ('fetched', 'rows_fetched'), ('new', 'new_rows'), ('duplicate', 'duplicates')
+            )
+            for kind, key in row_kinds:
+                rows = scraper.stats.get(key, 0)
+                metrics.SCRAPE_ROWS.inc(rows, category=category_name, kind=kind)
+            await _mark_success(category_name, 'scrape', run.started_at)
+            
+            # Event-driven send: post new jobs without waiting for send_hours
+            if settings.send_on_scrape and scraper.new_jobs_count > 0:
+                scheduler.notify_new_jobs(category_name)
+            
+        except Exception as e:
+            logger.error(f"❌ Error scraping {category_name}: {e}")
+            run.fail(e)
+            if category_name not in job_stats:
+                job_stats[category_name] = {}
+            job_stats[category_name]['scrape_error'] = str(e)
 
 
 async def run_send_job(category_name: str) -> None:
     """Run sending job for a category"""
+    with run_recorder.track(category_name, 'send') as run:
+        try:
+            # Get category configuration
+            category_config = category_manager.get_category(category_name)
+            
+            logger.info(f"🎯 Starting sending for {category_name}...")
+            logger.debug("📡 Topic ID: %s", category_config.telegram_topic_id)
+            
+            # Send to Telegram
+            logger.debug("📤 Sending to Telegram...")
+            try:
+                with span("send", category=category_name):
+                    sent_count = await telegram_bot.send_jobs_from_database(
+                        category=category_name,
+                        topic_id=category_config.telegram_topic_id
+                    )
+            finally:
+                run.update(telegram_bot.send_stats.get(category_name, {}))
+            
+            logger.info(f"✅ {sent_count} new {category_name} jobs sent")
+            
+            # Save statistics for sending
+            if category_name not in job_stats:
+                job_stats[category_name] = {}
+            job_stats[category_name]['jobs_sent'] = sent_count
+            await _mark_success(category_name, 'send', run.started_at)
+            
+        except Exception as e:
+            logger.error(f"❌ Error sending {category_name}: {e}")
+            run.fail(e)
+            if category_name not in job_stats:
+                job_stats[category_name] = {}
+            job_stats[category_name]['send_error'] = str(e)
+
+
+async def _mark_success(category_name: str, operation: str, started_at: datetime) -> None:
+    """Persist the last successful run time used by the missed-run catch-up"""
     try:
-        # Get category configuration
-        category_config = category_manager.get_category(category_name)
-        
-        print(f"🎯 Starting sending for {category_name}...")
-        print(f"📡 Topic ID: {category_config.telegram_topic_id}")
-        
-        # Send to Telegram
-        print(f"📤 Sending to Telegram...")
-        sent_count = await telegram_bot.send_jobs_from_database(
-            category=category_name,
-            topic_id=category_config.telegram_topic_id
-        )
-        
-        print(f"✅ {sent_count} new {category_name} jobs sent")
-        
-        # Save statistics for sending
-        if category_name not in job_stats:
-            job_stats[category_name] = {}
-        job_stats[category_name]['jobs_sent'] = sent_count
-        
+        await mark_run_success(category_name, operation, started_at)
     except Exception as e:
-        print(f"❌ Error sending {category_name}: {e}")
-        if category_name not in job_stats:
-            job_stats[category_name] = {}
-        job_stats[category_name]['send_error'] = str(e)
+        logger.warning(f"⚠️ Could not save last {operation} time for {category_name}: {e}")
 
 
 async def run_category_job(category_name: str) -> None:
     """Legacy combined job runner for backward compatibility"""
-    print(f"⚠️ Using legacy combined job runner for {category_name}")
-    print("💡 Consider using separate scrape and send jobs for better reliability")
+    logger.warning(f"⚠️ Using legacy combined job runner for {category_name}")
+    logger.info("💡 Consider using separate scrape and send jobs for better reliability")
     
     await run_scrape_job(category_name)
     await run_send_job(category_name)
@@ -91,69 +143,373 @@ async def run_category_job(category_name: str) -> None:
 #         job_stats.clear()
 
 
-# Global event loop for all async operations
-_event_loop = None
-_event_loop_thread = None
+@dataclass
+class ScheduledTask:
+    """A scrape or send run registered on the scheduler"""
+    category: str
+    operation: str  # 'scrape' or 'send'
+    tag: str
+    next_run: datetime
+    hour: Optional[int] = None  # Daily tasks only
+    minute: int = 0
+    once: bool = False  # One-off tasks (continuations) are dropped after running
+    
+    def advance(self, now: datetime) -> None:
+        """Move a daily task to its next occurrence after `now`"""
+        while self.next_run <= now:
+            self.next_run += timedelta(days=1)
+
+
+def next_daily_run(hour: int, minute: int = 0, now: Optional[datetime] = None) -> datetime:
+    """Next local time at hour:minute strictly after now"""
+    now = now or datetime.now()
+    run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if run_at <= now:
+        run_at += timedelta(days=1)
+    return run_at
+
+
+def previous_daily_run(hour: int, minute: int = 0, now: Optional[datetime] = None) -> datetime:
+    """Latest local time at hour:minute at or before now"""
+    return next_daily_run(hour, minute, now) - timedelta(days=1)
+
+
+def find_missed_runs(
+    categories: Dict[str, CategoryConfig],
+    last_successes: Dict[Tuple[str, str], datetime],
+    now: Optional[datetime] = None,
+    window_hours: float = 24
+) -> List[Tuple[datetime, str, str]]:
+    """
+    Latest missed slot per category operation, as (slot, category, operation)
+    A slot is missed when no successful run started since it. Slots older
+    than `window_hours` and operations that never succeeded are ignored.
+    Last successes are UTC; slots are local time like the schedule.
+    """
+    now = now or datetime.now()
+    missed = []
+    for name, config in categories.items():
+        for operation in ('scrape', 'send'):
+            last_success = last_successes.get((name, operation))
+            if last_success is None:
+                continue
+            
+            hours = getattr(config, f'{operation}_hours')
+            slots = [previous_daily_run(hour, now=now) for hour in hours]
+            slots = [slot for slot in slots if now - slot <= timedelta(hours=window_hours)]
+            if not slots:
+                continue
+            
+            slot = max(slots)
+            slot_utc = slot.astimezone(timezone.utc).replace(tzinfo=None)
+            if last_success < slot_utc:
+                missed.append((slot, name, operation))
+    
+    # Oldest slots first, a category's scrape before its send
+    missed.sort(key=lambda item: (item[0], item[1], item[2] != 'scrape'))
+    return missed
+
 
-def get_or_create_event_loop():
-    """Get or create the global event loop running in a separate thread"""
-    global _event_loop, _event_loop_thread
+class AsyncScheduler:
+    """
+    Asyncio-native scheduler running on a single event loop
+    Due runs are launched as independent tasks with their own timeout, so a
+    slow scrape never delays the dispatch of other due runs. `clock` gives
+    the local time runs are scheduled on (a compressed clock in simulations).
+    """
     
-    if _event_loop is None or _event_loop.is_closed():
-        import threading
-        import concurrent.futures
+    def __init__(self, clock: Callable[[], datetime] = datetime.now):
+        self.clock = clock
+        self.tasks: List[ScheduledTask] = []
+        self.running: Set[asyncio.Task] = set()
+        self.in_flight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.pending_reruns: Set[Tuple[str, str]] = set()
+        self._debounced_sends: Dict[str, asyncio.TimerHandle] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopped = False
+        self._force_stop = asyncio.Event()
+    
+    @property
+    def stopped(self) -> bool:
+        """Whether stop() was called (no new runs are dispatched)"""
+        return self._stopped
+    
+    def every_day_at(
+        self, hour: int, category: str, operation: str, tag: str, minute: int = 0
+    ) -> ScheduledTask:
+        """Register a daily run at hour:minute (local time)"""
+        task = ScheduledTask(
+            category=category,
+            operation=operation,
+            tag=tag,
+            next_run=next_daily_run(hour, minute, self.clock()),
+            hour=hour,
+            minute=minute
+        )
+        return self._add(task)
+    
+    def run_once(self, delay: float, category: str, operation: str, tag: str) -> ScheduledTask:
+        """Register a one-off run `delay` seconds from now"""
+        task = ScheduledTask(
+            category=category,
+            operation=operation,
+            tag=tag,
+            next_run=self.clock() + timedelta(seconds=delay),
+            once=True
+        )
+        return self._add(task)
+    
+    def _add(self, task: ScheduledTask) -> ScheduledTask:
+        self.tasks.append(task)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return task
+    
+    def clear(self, tag: Optional[str] = None) -> None:
+        """Remove all tasks, or only those with the given tag"""
+        if tag is None:
+            self.tasks.clear()
+        else:
+            self.tasks = [task for task in self.tasks if task.tag != tag]
+    
+    def get_tasks(self, tag: Optional[str] = None) -> List[ScheduledTask]:
+        """Registered tasks, optionally filtered by tag"""
+        return [task for task in self.tasks if tag is None or task.tag == tag]
+    
+    def seconds_until_next_run(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Seconds until the earliest registered run (None if nothing is scheduled)"""
+        if not self.tasks:
+            return None
+        now = now or self.clock()
+        next_run = min(task.next_run for task in self.tasks)
+        return max(0.0, (next_run - now).total_seconds())
+    
+    def dispatch(self, category: str, operation: str) -> asyncio.Task:
+        """
+        Launch a run as an independent task
+        Runs are locked per category and operation: a trigger arriving while
+        the same run is in flight is merged into a single pending rerun, and
+        the in-flight task is returned instead of starting a new one.
+        """
+        key = (category, operation)
+        current = self.in_flight.get(key)
+        if current is not None:
+            stats = job_stats.setdefault(category, {})
+            if key in self.pending_reruns:
+                stats[f'{operation}_skipped'] = stats.get(f'{operation}_skipped', 0) + 1
+                logger.info(
+                    f"⏭️ {operation} {category} already running with a rerun pending, "
+                    "trigger skipped"
+                )
+            else:
+                self.pending_reruns.add(key)
+                stats[f'{operation}_merged'] = stats.get(f'{operation}_merged', 0) + 1
+                logger.info(f"🔁 {operation} {category} still running, rerun queued")
+            return current
         
-        def run_event_loop():
-            global _event_loop
-            _event_loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(_event_loop)
-            
-            # Initialize database connection for this loop
-            from france_chomage.database import connection
-            connection.initialize_database()
+        task = asyncio.create_task(
+            self._run_locked(category, operation),
+            name=f"{category}_{operation}"
+        )
+        self.in_flight[key] = task
+        self.running.add(task)
+        task.add_done_callback(self.running.discard)
+        return task
+    
+    async def _run_locked(self, category: str, operation: str) -> None:
+        """Run once, then once more if triggers were merged meanwhile"""
+        key = (category, operation)
+        try:
+            while True:
+                await run_operation(category, operation)
+                if key not in self.pending_reruns or self._stopped:
+                    break
+                self.pending_reruns.discard(key)
+                logger.info(f"🔁 Running merged {operation} trigger for {category}")
+        finally:
+            self.in_flight.pop(key, None)
+            self.pending_reruns.discard(key)
+    
+    def notify_new_jobs(self, category: str) -> None:
+        """
+        "New jobs available" event for a category
+        A send is dispatched once no new event arrived for SEND_DEBOUNCE
+        seconds; the fixed send_hours keep running as a fallback sweep.
+        """
+        handle = self._debounced_sends.pop(category, None)
+        if handle is not None:
+            handle.cancel()
+        
+        loop = asyncio.get_running_loop()
+        self._debounced_sends[category] = loop.call_later(
+            settings.send_debounce, self._send_debounced, category
+        )
+        logger.info(f"📣 New {category} jobs, send in {settings.send_debounce:.0f}s")
+    
+    def _send_debounced(self, category: str) -> None:
+        self._debounced_sends.pop(category, None)
+        if not self._stopped:
+            self.dispatch(category, 'send')
+    
+    def run_pending(self, now: Optional[datetime] = None) -> int:
+        """Dispatch every due task, returns the number launched"""
+        now = now or self.clock()
+        due = [task for task in self.tasks if task.next_run <= now]
+        
+        for task in sorted(due, key=lambda t: t.next_run):
+            self.dispatch(task.category, task.operation)
+            if task.once:
+                self.tasks.remove(task)
+            else:
+                task.advance(now)
+        
+        return len(due)
+    
+    async def run(self) -> None:
+        """Dispatch due tasks until stopped"""
+        self._wakeup = asyncio.Event()
+        
+        while not self._stopped:
+            self.run_pending()
             
-            _event_loop.run_forever()
+            timeout = self.seconds_until_next_run()
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def drain(self, timeout: float) -> int:
+        """
+        Wait up to `timeout` seconds for in-flight runs, then cancel the rest
+        Cancelled sends still flush their sent marks on the way out.
+        Returns the number of runs cancelled.
+        """
+        self.pending_reruns.clear()
+        pending = {task for task in self.running if not task.done()}
+        if not pending:
+            return 0
+        
+        logger.info(f"⏳ Waiting up to {timeout:.0f}s for {len(pending)} runs in flight...")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while pending and not self._force_stop.is_set() and loop.time() < deadline:
+            force_wait = asyncio.create_task(self._force_stop.wait())
+            done, _ = await asyncio.wait(
+                pending | {force_wait},
+                timeout=deadline - loop.time(),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            force_wait.cancel()
+            pending -= done
         
-        _event_loop_thread = threading.Thread(target=run_event_loop, daemon=True)
-        _event_loop_thread.start()
+        if not pending:
+            logger.info("✅ All runs finished")
+            return 0
         
-        # Wait for the loop to be ready
-        while _event_loop is None:
-            time.sleep(0.1)
+        logger.info(f"🛑 Cancelling {len(pending)} runs still in flight")
+        for task in pending:
+            task.cancel()
+        await asyncio.wait(pending, timeout=10)
+        return len(pending)
     
-    return _event_loop
+    def force_stop(self) -> None:
+        """Stop and cut the drain short, cancelling runs in flight"""
+        self.stop()
+        self._force_stop.set()
+    
+    def stop(self) -> None:
+        """Stop dispatching new runs"""
+        self._stopped = True
+        for handle in self._debounced_sends.values():
+            handle.cancel()
+        self._debounced_sends.clear()
+        if self._wakeup is not None:
+            self._wakeup.set()
 
-def create_sync_wrapper(category_name: str, job_type: str = 'combined'):
-    """Create a synchronous wrapper for async category job"""
-    def sync_wrapper():
-        loop = get_or_create_event_loop()
-        try:
-            if job_type == 'scrape':
-                future = asyncio.run_coroutine_threadsafe(run_scrape_job(category_name), loop)
-                future.result(timeout=1800)  # 30 minute timeout
-            elif job_type == 'send':
-                future = asyncio.run_coroutine_threadsafe(run_send_job(category_name), loop)
-                future.result(timeout=300)   # 5 minute timeout
-            else:
-                # Legacy combined job
-                future = asyncio.run_coroutine_threadsafe(run_category_job(category_name), loop)
-                future.result(timeout=1800)  # 30 minute timeout
-        except Exception as e:
-            print(f"❌ Error in {job_type} job for {category_name}: {e}")
-            raise
+
+# Global scheduler instance
+scheduler = AsyncScheduler()
+
+
+def _operation_runner(operation: str) -> Callable[[str], Awaitable[None]]:
+    runners = {
+        'scrape': run_scrape_job,
+        'send': run_send_job,
+        'combined': run_category_job,
+    }
+    return runners[operation]
+
+
+def _operation_timeout(operation: str) -> float:
+    if operation == 'send':
+        return settings.send_timeout
+    return settings.scrape_timeout
+
+
+_send_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_send_semaphore() -> asyncio.Semaphore:
+    """Limit how many categories post to the Telegram group at once"""
+    global _send_semaphore
+    if _send_semaphore is None:
+        _send_semaphore = asyncio.Semaphore(max(1, settings.send_concurrency))
+    return _send_semaphore
+
+
+async def run_operation(category_name: str, operation: str) -> None:
+    """Run a scrape/send job for a category under its timeout"""
+    if not leadership.owns(category_name):
+        logger.info(f"⏭️ {operation} for {category_name} left to the replica owning it")
+        return
+    
+    if operation == 'send':
+        # Waiting for a send slot does not count against the send timeout
+        async with _get_send_semaphore():
+            await _run_with_timeout(category_name, operation)
+    else:
+        await _run_with_timeout(category_name, operation)
+
+
+async def _run_with_timeout(category_name: str, operation: str) -> None:
+    timeout = _operation_timeout(operation)
+    try:
+        async with asyncio.timeout(timeout):
+            await _operation_runner(operation)(category_name)
+    except TimeoutError:
+        logger.warning(f"⏰ {operation} job for {category_name} timed out after {timeout:.0f}s")
+        stats = job_stats.setdefault(category_name, {})
+        stats[f'{operation}_error'] = f"Timeout after {timeout:.0f}s"
+        return
+    except Exception as e:
+        logger.error(f"❌ Error in {operation} job for {category_name}: {e}")
+        return
+    
+    if operation == 'send':
+        schedule_send_continuation(category_name)
+
+
+def schedule_send_continuation(category_name: str) -> None:
+    """Schedule a one-off send for jobs left over by a capped send run"""
+    tag = f'{category_name}_send_continuation'
+    scheduler.clear(tag)
     
-    return sync_wrapper
+    remaining = telegram_bot.unsent_backlog.get(category_name, 0)
+    if not remaining:
+        return
+    
+    delay = settings.send_continuation_delay
+    scheduler.run_once(delay * 60, category_name, 'send', tag)
+    logger.info(f"📥 {remaining} {category_name} jobs left, continuation send in {delay} min")
 
 
-# def sync_update_summary():
-#     """Synchronous wrapper for update summary"""
-#     loop = get_or_create_event_loop()
-#     try:
-#         future = asyncio.run_coroutine_threadsafe(send_update_summary(), loop)
-#         future.result(timeout=300)  # 5 minute timeout
-#     except Exception as e:
-#         print(f"❌ Error in update summary: {e}")
-#         raise
+def _schedule_operation(name: str, operation: str, hours: List[int]) -> None:
+    """(Re)register the daily runs of one category operation under its tag"""
+    tag = f'{name}_{operation}'
+    scheduler.clear(tag)
+    for hour in hours:
+        scheduler.every_day_at(hour, name, operation, tag=tag)
 
 
 def schedule_categories() -> None:
@@ -162,152 +518,409 @@ def schedule_categories() -> None:
         enabled_categories = category_manager.get_enabled_categories()
         
         if not enabled_categories:
-            print("⚠️ No enabled categories found!")
+            logger.warning("⚠️ No enabled categories found!")
             return
         
-        print("📅 Scheduling categories with separate scrape and send jobs:")
+        logger.info("📅 Scheduling categories with separate scrape and send jobs:")
         
         # Schedule each category with separate scrape and send jobs
         for name, config in enabled_categories.items():
-            # Schedule scraping jobs
-            for scrape_hour in config.scrape_hours:
-                scrape_time = f"{scrape_hour:02d}:00"
-                scrape_wrapper = create_sync_wrapper(name, 'scrape')
-                schedule.every().day.at(scrape_time).do(scrape_wrapper).tag(f'{name}_scrape')
-            
-            # Schedule sending jobs
-            for send_hour in config.send_hours:
-                send_time = f"{send_hour:02d}:00"
-                send_wrapper = create_sync_wrapper(name, 'send')
-                schedule.every().day.at(send_time).do(send_wrapper).tag(f'{name}_send')
+            _schedule_operation(name, 'scrape', config.scrape_hours)
+            _schedule_operation(name, 'send', config.send_hours)
         
-        # Schedule update summary once per day at 23:59
-        # schedule.every().day.at("23:59").do(sync_update_summary).tag('summary')
-        
-        print(f"✅ {len(enabled_categories)} categories scheduled with separate jobs")
+        logger.info(f"✅ {len(enabled_categories)} categories scheduled with separate jobs")
         
     except Exception as e:
-        print(f"❌ Error scheduling categories: {e}")
+        logger.error(f"❌ Error scheduling categories: {e}")
         raise
 
 
-def run_startup_jobs() -> None:
-    """Run all enabled categories once at startup"""
+def reschedule_changed_categories(
+    old: Dict[str, CategoryConfig],
+    new: Dict[str, CategoryConfig]
+) -> List[str]:
+    """
+    Re-register only the scheduled runs whose category or hours changed
+    Unchanged tags keep their tasks (and next run times). Other fields such
+    as search terms or topic IDs are read at run time and need no action.
+    """
+    changes = []
+    
+    for name in sorted(old.keys() - new.keys()):
+        for tag in (
+            f'{name}_scrape', f'{name}_send', f'{name}_send_continuation',
+            f'{name}_scrape_catchup', f'{name}_send_catchup'
+        ):
+            scheduler.clear(tag)
+        changes.append(f"➖ {name} removed")
+    
+    for name, config in new.items():
+        previous = old.get(name)
+        if previous is None:
+            _schedule_operation(name, 'scrape', config.scrape_hours)
+            _schedule_operation(name, 'send', config.send_hours)
+            changes.append(
+                f"➕ {name} added (scrape {config.scrape_hours}, send {config.send_hours})"
+            )
+            continue
+        
+        for operation in ('scrape', 'send'):
+            old_hours = sorted(getattr(previous, f'{operation}_hours'))
+            new_hours = sorted(getattr(config, f'{operation}_hours'))
+            if old_hours != new_hours:
+                _schedule_operation(name, operation, new_hours)
+                changes.append(f"🔁 {name} {operation}: {old_hours} -> {new_hours}")
+    
+    return changes
+
+
+def reload_categories_if_changed() -> bool:
+    """Reload categories.yml when it changed and reschedule the differences"""
+    if not category_manager.config_changed():
+        return False
+    
+    old = category_manager.get_enabled_categories()
+    try:
+        category_manager.reload_categories()
+    except Exception as e:
+        logger.error(f"❌ Invalid {category_manager.config_path}, keeping current schedule: {e}")
+        return False
+    
+    changes = reschedule_changed_categories(old, category_manager.get_enabled_categories())
+    logger.info(f"🔄 {category_manager.config_path} reloaded: {len(changes)} schedule changes")
+    for change in changes:
+        logger.info("  %s", change)
+    return True
+
+
+async def watch_categories() -> None:
+    """Poll categories.yml and apply changes without restarting"""
+    interval = settings.categories_watch_interval
+    if interval <= 0:
+        return
+    
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            reload_categories_if_changed()
+        except Exception as e:
+            logger.error(f"❌ Error reloading categories: {e}")
+
+
+async def schedule_catch_up_runs(category_names: Optional[Iterable[str]] = None) -> Set[str]:
+    """Queue one-off runs for slots missed while the scheduler was down, return their categories"""
+    try:
+        last_successes = await load_last_successes()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not load last run times, no catch-up: {e}")
+        return set()
+    
+    categories = category_manager.get_enabled_categories()
+    if category_names is not None:
+        categories = {name: config for name, config in categories.items() if name in category_names}
+    missed = find_missed_runs(categories, last_successes, window_hours=settings.catchup_window)
+    if not missed:
+        return set()
+    
+    # Spread out so catch-up does not spike scraping or Telegram load
+    logger.info(f"⏪ {len(missed)} missed runs, catching up every {settings.catchup_spacing:.0f}s:")
+    for index, (slot, name, operation) in enumerate(missed):
+        tag = f'{name}_{operation}_catchup'
+        scheduler.clear(tag)
+        scheduler.run_once(index * settings.catchup_spacing, name, operation, tag)
+        logger.info("  %s %s (missed %s)", name, operation, f"{slot:%H:%M}")
+    return {name for _, name, _ in missed}
+
+
+async def run_startup_jobs(skip: Iterable[str] = ()) -> None:
+    """
+    Warm up all enabled categories once at startup (STARTUP_WARMUP=1)
+    Categories in `skip` (already queued for catch-up) are left out.
+    Scrapes run STARTUP_CONCURRENCY at a time and each category's send starts
+    as soon as its own scrape finished. Categories not done by the
+    STARTUP_DEADLINE are left to their regular schedule; runs already in
+    flight finish under their own timeout.
+    """
     if settings.skip_init_job:
-        print("⏭️ Startup jobs skipped (SKIP_INIT_JOB=1)")
+        logger.info("⏭️ Startup jobs skipped (SKIP_INIT_JOB=1)")
         return
     
     try:
-        enabled_categories = category_manager.get_enabled_categories()
-        print(f"\n🚀 Running startup jobs for {len(enabled_categories)} categories...")
-        print("📝 Using separate scrape and send operations...")
+        skip = set(skip)
+        enabled_categories = {
+            name: config for name, config in category_manager.get_enabled_categories().items()
+            if name not in skip
+        }
+        if skip:
+            logger.info(f"⏪ {len(skip)} categories left to catch-up: {', '.join(sorted(skip))}")
+        total = len(enabled_categories)
+        concurrency = max(1, settings.startup_concurrency)
+        logger.info(
+            f"🚀 Warming up {total} categories "
+            f"({concurrency} concurrent scrapes, deadline {settings.startup_deadline:.0f}s)..."
+        )
         
-        # First, run all scraping jobs
-        print("\n🔍 Phase 1: Scraping all categories...")
-        for name in enabled_categories.keys():
-            print(f"\n--- Scraping {name} ---")
-            scrape_wrapper = create_sync_wrapper(name, 'scrape')
-            scrape_wrapper()
+        started = time.monotonic()
+        scrape_slots = asyncio.Semaphore(concurrency)
+        progress = {'scraped': 0, 'sent': 0, 'failed': []}
         
-        # Then, run all sending jobs
-        print("\n📤 Phase 2: Sending all categories...")
-        for name in enabled_categories.keys():
-            print(f"\n--- Sending {name} ---")
-            send_wrapper = create_sync_wrapper(name, 'send')
-            send_wrapper()
+        def report() -> None:
+            logger.info(
+                f"📈 Warm-up: {progress['scraped']}/{total} scraped, "
+                f"{progress['sent']}/{total} sent ({time.monotonic() - started:.0f}s)"
+            )
         
-        print("\n✅ All startup jobs completed (scrape + send separated)")
+        async def warm_up(name: str) -> None:
+            for key in ('scrape_error', 'send_error'):
+                job_stats.get(name, {}).pop(key, None)
+            
+            async with scrape_slots:
+                # Shielded: the deadline stops the warm-up, not the run itself
+                await asyncio.shield(scheduler.dispatch(name, 'scrape'))
+            progress['scraped'] += 1
+            report()
+            
+            await asyncio.shield(scheduler.dispatch(name, 'send'))
+            progress['sent'] += 1
+            if any(key in job_stats.get(name, {}) for key in ('scrape_error', 'send_error')):
+                progress['failed'].append(name)
+            report()
+        
+        tasks = [asyncio.create_task(warm_up(name)) for name in enabled_categories]
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=settings.startup_deadline)
+        for task in pending:
+            task.cancel()
+        
+        logger.info(
+            f"✅ Startup warm-up finished in {time.monotonic() - started:.0f}s: "
+            f"{progress['scraped']}/{total} scraped, {progress['sent']}/{total} sent"
+        )
+        if progress['failed']:
+            logger.warning(f"⚠️ Errors for: {', '.join(sorted(progress['failed']))}")
+        if pending:
+            logger.warning(
+                f"⏰ {len(pending)} categories not finished before the deadline, "
+                "left to their schedule"
+            )
         
     except Exception as e:
-        print(f"❌ Error running startup jobs: {e}")
+        logger.error(f"❌ Error running startup jobs: {e}")
 
-def run_limited_startup_jobs() -> None:
+async def run_limited_startup_jobs() -> None:
     """Run limited startup jobs as smoke test"""
     try:
         from france_chomage.database.connection import get_connection_info
-        print(f"🔍 Connection pool status: {get_connection_info()}")
+        logger.debug("🔍 Connection pool status: %s", get_connection_info())
         
         enabled_categories = category_manager.get_enabled_categories()
         # Only test with 2 categories that are likely to have jobs
         test_categories = ['communication', 'design']
         
         for cat_name in test_categories:
+            if scheduler.stopped:
+                break
             if cat_name in enabled_categories:
-                print(f"\n🧪 Testing {cat_name} category...")
+                logger.info(f"🧪 Testing {cat_name} category...")
                 try:
                     # Test scraping
-                    scrape_wrapper = create_sync_wrapper(cat_name, 'scrape')
-                    scrape_wrapper()
+                    await scheduler.dispatch(cat_name, 'scrape')
                     
                     # Add delay to prevent connection conflicts
-                    import time
-                    time.sleep(2)
+                    await asyncio.sleep(2)
                     
                     # Test sending
-                    send_wrapper = create_sync_wrapper(cat_name, 'send')
-                    send_wrapper()
+                    await scheduler.dispatch(cat_name, 'send')
                     
-                    print(f"✅ {cat_name} test completed")
+                    logger.info(f"✅ {cat_name} test completed")
                     
                 except Exception as e:
-                    print(f"⚠️ {cat_name} test failed: {e}")
+                    logger.warning(f"⚠️ {cat_name} test failed: {e}")
                     continue
                     
                 # Add delay between categories
-                import time
-                time.sleep(3)
+                await asyncio.sleep(3)
         
-        print(f"🔍 Final connection pool status: {get_connection_info()}")
-        print("✅ Limited startup jobs completed")
+        logger.debug("🔍 Final connection pool status: %s", get_connection_info())
+        logger.info("✅ Limited startup jobs completed")
         
     except Exception as e:
-        print(f"❌ Error running limited startup jobs: {e}")
+        logger.error(f"❌ Error running limited startup jobs: {e}")
 
 
-def main():
-    """Main scheduler entry point"""
-    print("🔧 Initializing France Chômage Scheduler...")
+def _category_in_flight(category_name: str) -> bool:
+    return any(name == category_name for name, _ in scheduler.in_flight)
+
+
+def _on_leadership_gain(category_names: Set[str]) -> None:
+    """Catch up the slots a failed replica missed for categories taken over"""
+    task = asyncio.get_running_loop().create_task(schedule_catch_up_runs(category_names))
+    scheduler.running.add(task)
+    task.add_done_callback(scheduler.running.discard)
+
+
+_monitors: Set[asyncio.Task] = set()
+
+
+def start_metrics() -> Optional[metrics.MetricsServer]:
+    """Serve /metrics on METRICS_PORT and sample the event loop lag"""
+    if settings.metrics_port <= 0:
+        return None
+    
+    metrics.DB_POOL_CHECKED_OUT.set_function(lambda: connection.engine.pool.checkedout())
+    metrics.DB_POOL_OVERFLOW.set_function(lambda: max(0, connection.engine.pool.overflow()))
+    metrics.JOB_CACHE_SIZE.set_function(lambda: job_manager.cache_size)
+    metrics.PROCESS_RSS_BYTES.set_function(rss_bytes)
+    
+    # Not a run: kept out of scheduler.running so the shutdown drain ignores it
+    _monitors.add(asyncio.create_task(metrics.monitor_loop_lag(settings.loop_lag_interval)))
+    return metrics.start_metrics_server(settings.metrics_host, settings.metrics_port)
+
+
+def start_watchdog() -> Optional[LoopWatchdog]:
+    """Log the stack of callbacks blocking the loop longer than LOOP_WATCHDOG_THRESHOLD"""
+    if settings.loop_watchdog_threshold <= 0:
+        return None
+    
+    watchdog = LoopWatchdog(settings.loop_watchdog_threshold)
+    _monitors.add(asyncio.create_task(watchdog.run()))
+    logger.info("🐢 Loop watchdog on, stalls over %.2fs are logged", watchdog.threshold)
+    return watchdog
+
+
+def start_memory_watch() -> Optional[MemoryWatch]:
+    """Diff tracemalloc snapshots every MEMORY_WATCH_INTERVAL seconds"""
+    if settings.memory_watch_interval <= 0:
+        return None
+    
+    watch = MemoryWatch(
+        interval=settings.memory_watch_interval,
+        top=settings.memory_watch_top,
+        frames=settings.memory_watch_frames,
+        snapshot_dir=settings.memory_snapshot_dir
+    )
+    _monitors.add(asyncio.create_task(watch.run()))
+    return watch
+
+
+async def shutdown(metrics_server: Optional[metrics.MetricsServer] = None) -> None:
+    """Drain runs in flight, then flush buffers and close connections"""
+    scheduler.stop()
+    await scheduler.drain(settings.shutdown_grace)
+    
+    # Write the run history still buffered in memory
+    await run_recorder.close()
+    # Other replicas may take over once no run of ours is left
+    await leadership.close()
+    
+    if query_profiler.stats:
+        logger.info("📊 Top SQL statements:\n%s", query_profiler.report(limit=5))
+    for name, close in (("Telegram", telegram_bot.close), ("database", close_database)):
+        try:
+            await close()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing {name} connections: {e}")
+    for monitor in _monitors:
+        monitor.cancel()
+    _monitors.clear()
+    if metrics_server is not None:
+        metrics_server.stop()
+    logger.info("👋 Scheduler shut down cleanly")
+
+
+def _install_signal_handlers() -> None:
+    """Stop on SIGTERM/SIGINT; a second signal cuts the drain short"""
+    loop = asyncio.get_running_loop()
+    
+    def request_shutdown(sig: signal.Signals) -> None:
+        if scheduler.stopped:
+            logger.info(f"🛑 {sig.name} received again, cancelling runs in flight")
+            scheduler.force_stop()
+            return
+        logger.info(
+            f"🛑 {sig.name} received, finishing runs in flight "
+            f"(up to {settings.shutdown_grace:.0f}s)..."
+        )
+        scheduler.stop()
+    
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, request_shutdown, sig)
+        except (NotImplementedError, RuntimeError):
+            pass  # Not supported on this platform (Windows)
+
+
+async def run_scheduler() -> None:
+    """Initialize, run the smoke test and dispatch scheduled jobs"""
+    logger.info("🔧 Initializing France Chômage Scheduler...")
     
     # Initialize database
     initialize_database()
+    _install_signal_handlers()
+    metrics_server = start_metrics()
+    start_watchdog()
+    start_memory_watch()
     
     # Load category configuration
     try:
         category_manager.load_categories()
     except Exception as e:
-        print(f"❌ Failed to load categories: {e}")
-        print("💡 Make sure categories.yml exists and is valid")
+        logger.error(f"❌ Failed to load categories: {e}")
+        logger.info("💡 Make sure categories.yml exists and is valid")
         return
     
     # Schedule all categories
     try:
         schedule_categories()
     except Exception as e:
-        print(f"❌ Failed to schedule categories: {e}")
+        logger.error(f"❌ Failed to schedule categories: {e}")
         return
     
-    # Run limited startup jobs as smoke test
-    print("🧪 Running limited startup jobs as smoke test...")
-    run_limited_startup_jobs()
+    # Claim categories before any run (no-op with SCHEDULER_LEADER_MODE=off)
+    await leadership.refresh(category_manager.get_enabled_category_names())
     
-    print("\n⏰ Scheduler active. Press Ctrl+C to stop.")
+    # Runs missed during the downtime, started once the scheduler runs
+    caught_up = await schedule_catch_up_runs()
     
-    # Main scheduling loop
+    warm_up = None
+    if settings.startup_warmup:
+        # Full warm-up in the background, scheduled runs are not delayed
+        warm_up = asyncio.create_task(run_startup_jobs(skip=caught_up))
+    else:
+        # Run limited startup jobs as smoke test
+        logger.info("🧪 Running limited startup jobs as smoke test...")
+        await run_limited_startup_jobs()
+    
+    logger.info("⏰ Scheduler active. Press Ctrl+C to stop.")
+    watcher = asyncio.create_task(watch_categories())
+    leader_poll = asyncio.create_task(leadership.run(
+        category_manager.get_enabled_category_names,
+        busy=_category_in_flight,
+        on_gain=_on_leadership_gain
+    ))
+    try:
+        await scheduler.run()
+    finally:
+        watcher.cancel()
+        leader_poll.cancel()
+        if warm_up is not None:
+            warm_up.cancel()
+        await shutdown(metrics_server)
+
+
+def main():
+    """Main scheduler entry point"""
+    setup_logging()
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)
+        asyncio.run(run_scheduler())
     except KeyboardInterrupt:
-        print("\n🛑 Scheduler stopped")
+        logger.info("🛑 Scheduler stopped")
     except Exception as e:
-        print(f"\n❌ Scheduler error: {e}")
+        logger.exception(f"❌ Scheduler error: {e}")
     finally:
-        # Clean up event loop
-        global _event_loop
-        if _event_loop and not _event_loop.is_closed():
-            _event_loop.call_soon_threadsafe(_event_loop.stop)
-            if _event_loop_thread and _event_loop_thread.is_alive():
-                _event_loop_thread.join(timeout=5)
+        # Write out records still queued for the background writer
+        stop_logging()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,17 @@
 from .base import ScraperBase
 from .category_scraper import CategoryScraper, CategoryScraperFactory, create_category_scraper
+from .providers import JobProvider, JobspyProvider, get_provider, set_provider
+from .fixtures import RecordingProvider, ReplayProvider
 
 __all__ = [
     "ScraperBase", 
     "CategoryScraper",
     "CategoryScraperFactory", 
-    "create_category_scraper"
+    "create_category_scraper",
+    "JobProvider",
+    "JobspyProvider",
+    "get_provider",
+    "set_provider",
+    "RecordingProvider",
+    "ReplayProvider"
 ]
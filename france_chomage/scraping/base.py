@@ -3,16 +3,59 @@ Scraper de base avec logique commune
 """
 import asyncio
 import json
+import logging
 import random
+import time
 from abc import ABC
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
-from jobspy import scrape_jobs
 from france_chomage.config import settings
 from france_chomage.environments import get_sites_for_environment, is_docker
 from france_chomage.models import Job
 from france_chomage.database import job_manager
+from france_chomage.metrics import SCRAPE_BLOCKED, SCRAPE_FETCH_SECONDS, SCRAPE_SITE_ROWS
+from france_chomage.scraping.providers import JobProvider, get_provider
+from france_chomage.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Étapes chronométrées d'un scraping, dans l'ordre d'exécution
+STAGES = (
+    ("sleep", "sleep_seconds"),
+    ("network", "network_seconds"),
+    ("parse", "parse_seconds"),
+    ("filter", "filter_seconds"),
+    ("dedup", "dedup_seconds"),
+    ("insert", "insert_seconds"),
+    ("backup", "backup_seconds"),
+)
+SITE_NETWORK_PREFIX = "network_seconds."
+
+
+def stage_timings(stats: Dict[str, float]) -> Dict[str, float]:
+    """Durées par étape (et réseau par site) extraites des stats d'un scraping"""
+    timings = {name: round(stats.get(key, 0.0), 3) for name, key in STAGES}
+    for key, value in stats.items():
+        if key.startswith(SITE_NETWORK_PREFIX):
+            timings[f"network.{key[len(SITE_NETWORK_PREFIX):]}"] = round(value, 3)
+    return timings
+
+
+def format_stage_timings(timings: Dict[str, float]) -> str:
+    """Résumé sur une ligne: 'sleep 3.1s, network 20.4s (indeed 12.0s, linkedin 8.4s), ...'"""
+    sites = ", ".join(
+        f"{name.split('.', 1)[1]} {value:.1f}s"
+        for name, value in timings.items() if name.startswith("network.")
+    )
+    parts = []
+    for name, _ in STAGES:
+        part = f"{name} {timings.get(name, 0.0):.1f}s"
+        if name == "network" and sites:
+            part += f" ({sites})"
+        parts.append(part)
+    return ", ".join(parts)
+
 
 class ScraperBase(ABC):
     """Classe de base pour tous les scrapers"""
@@ -23,145 +66,234 @@ class ScraperBase(ABC):
     job_type: str  # Pour les hashtags
     
     def __init__(self):
-        pass
+        # Nombre de résultats demandés (None = RESULTS_WANTED)
+        self.results_wanted: Optional[int] = None
+        # Source des offres (None = fournisseur global, jobspy par défaut)
+        self.provider: Optional[JobProvider] = None
+        # Gestionnaire d'offres (None = job_manager global)
+        self.manager = None
+        # Sites interrogés (None = selon l'environnement)
+        self.sites: Optional[Sequence[str]] = None
+        # Nombre d'offres nouvellement enregistrées lors du dernier scraping
+        self.new_jobs_count = 0
+        # Durées par étape et compteurs du dernier scraping (historique des runs)
+        self.stats: Dict[str, float] = {}
     
     async def scrape(self) -> List[Job]:
         """Point d'entrée principal pour scraper"""
-        print(f"🔍 Début du scraping {self.job_type}")
-        
-        jobs = await self._scrape_with_retry()
-        
-        if jobs:
-            print(f"✅ Scraping terminé - {len(jobs)} offres trouvées")
+        with span("scrape", category=self.job_type):
+            logger.info(f"🔍 Début du scraping {self.job_type}")
+            self.new_jobs_count = 0
+            self.stats = {key: 0.0 for _, key in STAGES}
+            self.stats.update({
+                "db_seconds": 0.0,
+                "rows_fetched": 0,
+                "new_rows": 0,
+                "duplicates": 0,
+            })
+            started = time.perf_counter()
             
-            # Save to database with filtering and deduplication
-            await self._save_to_database(jobs)
+            jobs = await self._scrape_with_retry()
             
-            # Keep JSON backup for compatibility
-            self._save_jobs(jobs)
-        else:
-            print("⚠️ Aucune offre trouvée")
-            self._save_empty_file()
+            if jobs:
+                logger.info(f"✅ Scraping terminé - {len(jobs)} offres trouvées")
+                
+                # Save to database with filtering and deduplication
+                await self._save_to_database(jobs)
+                
+                # Keep JSON backup for compatibility
+                backup_started = time.perf_counter()
+                self._save_jobs(jobs)
+                self._add_stat("backup_seconds", time.perf_counter() - backup_started)
+            else:
+                logger.warning("⚠️ Aucune offre trouvée")
+                self._save_empty_file()
             
-        return jobs or []
+            logger.info(
+                "⏱️ Scraping %s en %.1fs: %s",
+                self.job_type, time.perf_counter() - started, format_stage_timings(self.timings())
+            )
+            return jobs or []
+    
+    def timings(self) -> Dict[str, float]:
+        """Durées par étape du dernier scraping, en secondes"""
+        return stage_timings(self.stats)
     
     async def _scrape_with_retry(self) -> Optional[List[Job]]:
         """Scrape avec logique de retry"""
-        sites = get_sites_for_environment()
+        sites = tuple(self.sites or get_sites_for_environment())
         env_type = 'Docker' if is_docker() else 'Local'
-        print(f"🌐 Sites: {', '.join(sites)} ({env_type})")
+        logger.info("🌐 Sites: %s (%s)", ', '.join(sites), env_type)
         
         if 'indeed' in sites:
-            print("⚠️ Indeed inclus - Risque de blocage 403 élevé")
+            logger.warning("⚠️ Indeed inclus - Risque de blocage 403 élevé")
         if env_type == 'Local' and len(sites) > 1:
-            print("🏠 Mode Local détecté - Indeed + LinkedIn (fallback automatique)")
+            logger.debug("🏠 Mode Local détecté - Indeed + LinkedIn (fallback automatique)")
         elif env_type == 'Docker':
-            print("🐳 Mode Docker détecté - Indeed + LinkedIn (fallback automatique)")
+            logger.debug("🐳 Mode Docker détecté - Indeed + LinkedIn (fallback automatique)")
         
         for attempt in range(1, settings.max_retries + 1):
             try:
-                print(f"🔄 Tentative {attempt}/{settings.max_retries}")
-                
-                # Délai aléatoire anti-détection (plus long pour Indeed)
-                if 'indeed' in sites and attempt > 1:
-                    # Délais plus longs après un échec avec Indeed
-                    delay = random.uniform(5.0, 15.0)
-                    print(f"⏳ Délai anti-Indeed: {delay:.1f}s")
-                else:
-                    delay = random.uniform(settings.scrape_delay_min, settings.scrape_delay_max)
-                    print(f"⏳ Attente standard: {delay:.1f}s")
-                await asyncio.sleep(delay)
-                
-                # Paramètres de scraping avec stratégies anti-détection
-                scrape_params = {
-                    'site_name': list(sites),
-                    'search_term': self.search_terms,
-                    'location': settings.location,
-                    'results_wanted': min(settings.results_wanted, 10) if 'indeed' in sites else settings.results_wanted,
-                    'country_indeed': settings.country,
-
-                }
-                
-                # Réduction du nombre de résultats pour Indeed
-                if 'indeed' in sites:
-                    scrape_params['results_wanted'] = min(scrape_params['results_wanted'], settings.indeed_max_results)
-                    print(f"🎯 Limitation Indeed: max {settings.indeed_max_results} résultats pour éviter la détection")
-                
-                print(f"📍 Recherche: '{self.search_terms}' à {settings.location} ({settings.results_wanted} résultats)")
-                print(f"🌐 Sites ciblés: {', '.join(scrape_params['site_name'])}")
-                print(f"🔧 Paramètres complets: {scrape_params}")
-                
-                # Scraping synchrone (jobspy n'est pas async)
-                print("🚀 Lancement de jobspy...")
-                df = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: scrape_jobs(**scrape_params)
-                )
-                print("📊 Réponse jobspy reçue")
-                
-                if df is not None and len(df) > 0:
-                    print(f"📄 DataFrame reçu: {len(df)} lignes, colonnes: {list(df.columns)}")
-                    jobs = self._dataframe_to_jobs(df)
-                    print(f"🎉 Succès! {len(jobs)} offres récupérées après parsing")
-                    return jobs
-                else:
-                    if df is None:
-                        print(f"⚠️ DataFrame vide (None) - tentative {attempt}")
+                with span("scrape.attempt", attempt=attempt, site=",".join(sites)):
+                    logger.debug("🔄 Tentative %d/%d", attempt, settings.max_retries)
+                    
+                    # Délai aléatoire anti-détection (plus long pour Indeed)
+                    if 'indeed' in sites and attempt > 1:
+                        # Délais plus longs après un échec avec Indeed
+                        delay = random.uniform(5.0, 15.0)
+                        logger.debug("⏳ Délai anti-Indeed: %.1fs", delay)
                     else:
-                        print(f"⚠️ DataFrame sans données ({len(df)} lignes) - tentative {attempt}")
+                        delay = random.uniform(settings.scrape_delay_min, settings.scrape_delay_max)
+                        logger.debug("⏳ Attente standard: %.1fs", delay)
+                    await self._sleep(delay)
+                    
+                    # Paramètres de scraping avec stratégies anti-détection
+                    results_wanted = self.results_wanted or settings.results_wanted
+                    scrape_params = {
+                        'site_name': list(sites),
+                        'search_term': self.search_terms,
+                        'location': settings.location,
+                        'results_wanted': (
+                            min(results_wanted, 10) if 'indeed' in sites else results_wanted
+                        ),
+                        'country_indeed': settings.country,
+
+                    }
                     
+                    # Réduction du nombre de résultats pour Indeed
+                    if 'indeed' in sites:
+                        scrape_params['results_wanted'] = min(
+                            scrape_params['results_wanted'], settings.indeed_max_results
+                        )
+                        logger.debug(
+                            "🎯 Limitation Indeed: max %d résultats pour éviter la détection",
+                            settings.indeed_max_results
+                        )
+                    
+                    logger.info(
+                        "📍 Recherche: '%s' à %s (%d résultats)",
+                        self.search_terms, settings.location, results_wanted
+                    )
+                    logger.debug("🌐 Sites ciblés: %s", ', '.join(scrape_params['site_name']))
+                    logger.debug("🔧 Paramètres complets: %s", scrape_params)
+                    
+                    # Scraping synchrone (jobspy n'est pas async)
+                    logger.debug("🚀 Lancement de jobspy...")
+                    df = await self._fetch(scrape_params)
+                    logger.debug("📊 Réponse jobspy reçue")
+                    
+                    if df is not None and len(df) > 0:
+                        logger.debug(
+                            "📄 DataFrame reçu: %d lignes, colonnes: %s", len(df), list(df.columns)
+                        )
+                        jobs = self._parse(df)
+                        logger.info("🎉 Succès! %d offres récupérées après parsing", len(jobs))
+                        return jobs
+                    else:
+                        if df is None:
+                            logger.warning("⚠️ DataFrame vide (None) - tentative %d", attempt)
+                        else:
+                            logger.warning(
+                                "⚠️ DataFrame sans données (%d lignes) - tentative %d",
+                                len(df), attempt
+                            )
+                        
             except Exception as exc:
                 error_msg = str(exc)
-                print(f"❌ Erreur tentative {attempt}: {error_msg}")
+                logger.error("❌ Erreur tentative %d: %s", attempt, error_msg)
                 
                 # Détection des erreurs spécifiques
                 if "403" in error_msg:
-                    print("🚫 Erreur 403 détectée - Blocage anti-bot probable")
+                    logger.warning("🚫 Erreur 403 détectée - Blocage anti-bot probable")
+                    # L'erreur ne dit pas quel site a bloqué : chaque site interrogé est compté
+                    for site in sites:
+                        SCRAPE_BLOCKED.inc(category=self.job_type, site=site)
                     
                     # Fallback automatique vers LinkedIn uniquement
                     if 'indeed' in sites and 'linkedin' in sites and len(sites) > 1:
-                        print("🔄 Fallback automatique: tentative avec LinkedIn uniquement...")
+                        logger.info("🔄 Fallback automatique: tentative avec LinkedIn uniquement...")
                         linkedin_only_params = scrape_params.copy()
                         linkedin_only_params['site_name'] = ['linkedin']
-                        linkedin_only_params['results_wanted'] = settings.results_wanted  # Pas de limite pour LinkedIn
+                        # Pas de limite pour LinkedIn
+                        linkedin_only_params['results_wanted'] = results_wanted
                         
                         try:
-                            print("🔗 Tentative LinkedIn seul...")
-                            df_linkedin = await asyncio.get_event_loop().run_in_executor(
-                                None, lambda: scrape_jobs(**linkedin_only_params)
-                            )
+                            logger.info("🔗 Tentative LinkedIn seul...")
+                            df_linkedin = await self._fetch(linkedin_only_params)
                             
                             if df_linkedin is not None and len(df_linkedin) > 0:
-                                print(f"✅ Succès LinkedIn! {len(df_linkedin)} offres trouvées")
-                                jobs = self._dataframe_to_jobs(df_linkedin)
+                                logger.info(
+                                    f"✅ Succès LinkedIn! {len(df_linkedin)} offres trouvées"
+                                )
+                                jobs = self._parse(df_linkedin)
                                 return jobs
                             else:
-                                print("⚠️ LinkedIn n'a pas retourné de résultats")
+                                logger.warning("⚠️ LinkedIn n'a pas retourné de résultats")
                         except Exception as linkedin_exc:
-                            print(f"❌ Échec LinkedIn aussi: {linkedin_exc}")
+                            logger.error(f"❌ Échec LinkedIn aussi: {linkedin_exc}")
                     
-                    print("💡 Suggestions pour éviter les 403:")
-                    print("   • Indeed bloque souvent les scrapers")
-                    print("   • Utilisez DOCKER=1 pour LinkedIn uniquement")
-                    print("   • Réduisez RESULTS_WANTED à 5-10")
-                    print("   • Augmentez les délais entre scraping")
+                    logger.info(
+                        "💡 Suggestions pour éviter les 403: Indeed bloque souvent les scrapers, "
+                        "utilisez DOCKER=1 pour LinkedIn uniquement, "
+                        "réduisez RESULTS_WANTED à 5-10, augmentez les délais entre scraping"
+                    )
                 elif "timeout" in error_msg.lower():
-                    print("⏰ Timeout détecté - Connexion lente ou serveur surchargé")
+                    logger.warning("⏰ Timeout détecté - Connexion lente ou serveur surchargé")
                 elif "connection" in error_msg.lower():
-                    print("🌐 Problème de connexion réseau")
+                    logger.warning("🌐 Problème de connexion réseau")
                 
-                print(f"🔍 Type d'erreur: {type(exc).__name__}")
-                print(f"📝 Message complet: {repr(exc)}")
+                logger.debug("🔍 Type d'erreur: %s", type(exc).__name__)
+                logger.debug("📝 Message complet: %r", exc)
                 
                 if attempt < settings.max_retries:
                     wait_time = settings.retry_delay_base * attempt
-                    print(f"🔄 Attente {wait_time}s avant nouvelle tentative...")
-                    await asyncio.sleep(wait_time)
+                    logger.info("🔄 Attente %ds avant nouvelle tentative...", wait_time)
+                    await self._sleep(wait_time)
                 else:
-                    print("💥 Toutes les tentatives épuisées")
+                    logger.error("💥 Toutes les tentatives épuisées")
         
-        print("💥 Toutes les tentatives ont échoué")
+        logger.error("💥 Toutes les tentatives ont échoué")
         return None
     
+    async def _sleep(self, delay: float) -> None:
+        """Attente anti-détection ou entre tentatives, durée comptée comme sommeil"""
+        started = time.perf_counter()
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._add_stat("sleep_seconds", time.perf_counter() - started)
+    
+    async def _fetch(self, scrape_params: dict):
+        """Appel du fournisseur d'offres, durée comptée comme réseau (total et par site)"""
+        provider = self.provider or get_provider()
+        sites = ",".join(scrape_params['site_name'])
+        started = time.perf_counter()
+        try:
+            with span("scrape.fetch", site=sites, provider=provider.name):
+                return await provider.fetch(self.job_type, scrape_params)
+        finally:
+            duration = time.perf_counter() - started
+            self._add_stat("network_seconds", duration)
+            for site in scrape_params['site_name']:
+                # Un appel multi-sites est compté pour chacun des sites interrogés
+                self._add_stat(f"{SITE_NETWORK_PREFIX}{site}", duration)
+                SCRAPE_FETCH_SECONDS.observe(duration, category=self.job_type, site=site)
+    
+    def _parse(self, df) -> List[Job]:
+        """Conversion du DataFrame, durée comptée comme parsing"""
+        started = time.perf_counter()
+        with span("scrape.parse", rows=len(df)):
+            jobs = self._dataframe_to_jobs(df)
+        self._add_stat("parse_seconds", time.perf_counter() - started)
+        self._add_stat("rows_fetched", len(df))
+        if 'site' in df.columns:
+            for site, count in df['site'].value_counts().items():
+                SCRAPE_SITE_ROWS.inc(int(count), category=self.job_type, site=str(site))
+        return jobs
+    
+    def _add_stat(self, key: str, value: float) -> None:
+        self.stats[key] = self.stats.get(key, 0) + value
+    
     def _dataframe_to_jobs(self, df) -> List[Job]:
         """Convertit le DataFrame pandas en liste de Jobs"""
         jobs = []
@@ -183,28 +315,35 @@ class ScraperBase(ABC):
                 job = Job(**job_data)
                 jobs.append(job)
             except Exception as exc:
-                print(f"⚠️ Erreur parsing job: {str(exc)}")
+                logger.warning("⚠️ Erreur parsing job: %s", exc)
                 continue
         
         return jobs
     
     async def _save_to_database(self, jobs: List[Job]) -> None:
         """Save jobs to database with filtering and deduplication"""
+        started = time.perf_counter()
         try:
-            new_jobs, filtered_count = await job_manager.process_scraped_jobs(
+            manager = self.manager if self.manager is not None else job_manager
+            new_jobs, filtered_count = await manager.process_scraped_jobs(
                 jobs=jobs,
                 category=self.job_type,
-                max_age_days=30  # Only jobs from last 30 days
+                max_age_days=30,  # Only jobs from last 30 days
+                stats=self.stats
             )
+            self.new_jobs_count = len(new_jobs)
+            self.stats["new_rows"] = len(new_jobs)
             
             if new_jobs:
-                print(f"💾 Database: {len(new_jobs)} nouveaux jobs sauvegardés")
+                logger.info(f"💾 Database: {len(new_jobs)} nouveaux jobs sauvegardés")
             if filtered_count > 0:
-                print(f"🔍 Database: {filtered_count} jobs filtrés (anciens/doublons)")
+                logger.debug("🔍 Database: %d jobs filtrés (anciens/doublons)", filtered_count)
                 
         except Exception as exc:
-            print(f"❌ Erreur sauvegarde database: {exc}")
-            print("📄 Continuons avec la sauvegarde JSON...")
+            logger.error(f"❌ Erreur sauvegarde database: {exc}")
+            logger.info("📄 Continuons avec la sauvegarde JSON...")
+        finally:
+            self._add_stat("db_seconds", time.perf_counter() - started)
     
     def _save_jobs(self, jobs: List[Job]) -> None:
         """Sauvegarde les jobs en JSON"""
@@ -215,7 +354,7 @@ class ScraperBase(ABC):
         with output_path.open('w', encoding='utf-8') as f:
             json.dump(jobs_data, f, ensure_ascii=False, indent=2)
         
-        print(f"💾 {len(jobs)} jobs sauvegardés dans {output_path}")
+        logger.debug("💾 %d jobs sauvegardés dans %s", len(jobs), output_path)
     
     def _save_empty_file(self) -> None:
         """Sauvegarde un fichier vide en cas d'échec (backup compatibility)"""
@@ -224,4 +363,4 @@ class ScraperBase(ABC):
         with output_path.open('w', encoding='utf-8') as f:
             json.dump([], f)
         
-        print(f"📄 Fichier backup vide créé: {output_path}")
+        logger.debug("📄 Fichier backup vide créé: %s", output_path)
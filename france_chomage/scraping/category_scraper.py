@@ -1,11 +1,14 @@
 """
 Configuration-driven category scraper
 """
+import logging
 from typing import List, Optional
 from france_chomage.categories import CategoryConfig
 from .base import ScraperBase
 from france_chomage.models import Job
 
+logger = logging.getLogger(__name__)
+
 
 class CategoryScraper(ScraperBase):
     """Generic scraper that works with any category configuration"""
@@ -22,28 +25,18 @@ class CategoryScraper(ScraperBase):
         # Apply category-specific overrides
         if category_config.max_results:
             self._override_max_results = category_config.max_results
+            # Per-scraper value: concurrent scrapes must not share a global override
+            self.results_wanted = category_config.max_results
     
     async def scrape(self) -> List[Job]:
         """Scrape jobs for this category"""
-        print(f"🎯 Scraping category: {self.category_config.name}")
-        print(f"🔍 Search terms: {self.search_terms}")
+        logger.info(f"🎯 Scraping category: {self.category_config.name}")
+        logger.debug("🔍 Search terms: %s", self.search_terms)
         
-        # Temporarily override results_wanted if configured
-        original_results_wanted = None
-        if hasattr(self, '_override_max_results'):
-            from france_chomage.config import settings
-            original_results_wanted = settings.results_wanted
-            settings.results_wanted = self._override_max_results
-            print(f"📊 Using custom max results: {self._override_max_results}")
+        if self.results_wanted:
+            logger.debug("📊 Using custom max results: %d", self.results_wanted)
         
-        try:
-            jobs = await super().scrape()
-            return jobs
-        finally:
-            # Restore original setting
-            if original_results_wanted is not None:
-                from france_chomage.config import settings
-                settings.results_wanted = original_results_wanted
+        return await super().scrape()
 
 
 class CategoryScraperFactory:
@@ -61,8 +54,11 @@ class CategoryScraperFactory:
                 )
                 return scraper_class(category_config)
             except Exception as e:
-                print(f"⚠️ Failed to load custom scraper {category_config.custom_scraper_class}: {e}")
-                print("🔄 Falling back to generic CategoryScraper")
+                logger.warning(
+                    f"⚠️ Failed to load custom scraper "
+                    f"{category_config.custom_scraper_class}: {e}"
+                )
+                logger.info("🔄 Falling back to generic CategoryScraper")
         
         # Default to generic CategoryScraper
         return CategoryScraper(category_config)
@@ -0,0 +1,175 @@
+"""
+Enregistrement et rejeu des réponses jobspy
+
+Avec SCRAPE_RECORD_DIR, chaque DataFrame renvoyé par jobspy est enregistré
+en fixture versionnée, une par catégorie et par site :
+`<dossier>/<catégorie>/<site>.json.gz`. ReplayProvider les renvoie ensuite
+à ScraperBase à la place du réseau, pour des benchmarks reproductibles
+(parsing, déduplication, persistance) sans connexion.
+"""
+import asyncio
+import gzip
+import json
+import logging
+from datetime import date, datetime
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from france_chomage.scraping.providers import JobProvider
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_VERSION = 1
+FIXTURE_SUFFIX = ".json.gz"
+# Colonnes de type date chez jobspy, restaurées au chargement
+DATE_COLUMNS = ("date_posted",)
+
+
+def fixture_path(directory: Path, category: str, site: str) -> Path:
+    return Path(directory) / category / f"{site}{FIXTURE_SUFFIX}"
+
+
+def _jobspy_version() -> Optional[str]:
+    try:
+        return metadata.version("python-jobspy")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if hasattr(value, "item"):  # Scalaires numpy
+        return value.item()
+    return str(value)
+
+
+def save_fixture(
+    directory: Path,
+    category: str,
+    site: str,
+    df: pd.DataFrame,
+    params: Optional[Dict[str, Any]] = None
+) -> Path:
+    """Écrit les lignes d'un site en fixture (écriture atomique)"""
+    records = df.astype(object).where(pd.notna(df), None).to_dict("records")
+    fixture = {
+        "version": FIXTURE_VERSION,
+        "category": category,
+        "site": site,
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "jobspy_version": _jobspy_version(),
+        "search_term": (params or {}).get("search_term"),
+        "location": (params or {}).get("location"),
+        "columns": list(df.columns),
+        "rows": records,
+    }
+    path = fixture_path(directory, category, site)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(fixture, f, ensure_ascii=False, default=_json_default)
+    tmp.replace(path)
+    return path
+
+
+def load_fixture(path: Path) -> pd.DataFrame:
+    """DataFrame enregistré, avec les dates restaurées comme chez jobspy"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        fixture = json.load(f)
+    if fixture.get("version", 0) > FIXTURE_VERSION:
+        raise ValueError(
+            f"Fixture {path} version {fixture['version']} is newer than {FIXTURE_VERSION}"
+        )
+    df = pd.DataFrame(fixture["rows"], columns=fixture["columns"])
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = [date.fromisoformat(value[:10]) if value else None for value in df[column]]
+    return df
+
+
+def list_fixtures(directory: Path) -> Dict[str, List[str]]:
+    """Sites enregistrés par catégorie"""
+    fixtures: Dict[str, List[str]] = {}
+    for path in sorted(Path(directory).glob(f"*/*{FIXTURE_SUFFIX}")):
+        fixtures.setdefault(path.parent.name, []).append(path.name[:-len(FIXTURE_SUFFIX)])
+    return fixtures
+
+
+def save_by_site(
+    directory: Path,
+    category: str,
+    df: pd.DataFrame,
+    params: Dict[str, Any]
+) -> List[Path]:
+    """Découpe une réponse jobspy par site et enregistre chaque partie"""
+    if "site" in df.columns:
+        groups = [(str(site), rows) for site, rows in df.groupby("site", sort=True)]
+    else:
+        groups = [(",".join(params.get("site_name", ["unknown"])), df)]
+    return [save_fixture(directory, category, site, rows, params) for site, rows in groups]
+
+
+class RecordingProvider(JobProvider):
+    """Fournisseur qui enregistre les réponses d'un autre (jobspy) en fixtures"""
+
+    name = "recording"
+
+    def __init__(self, inner: JobProvider, directory: str):
+        self.inner = inner
+        self.directory = Path(directory)
+
+    async def fetch(self, category: str, params: Dict[str, Any]):
+        df = await self.inner.fetch(category, params)
+        if df is not None and len(df) > 0:
+            try:
+                paths = await asyncio.to_thread(save_by_site, self.directory, category, df, params)
+                logger.debug(
+                    "📼 %d lignes %s enregistrées: %s", len(df), category, ", ".join(map(str, paths))
+                )
+            except Exception as exc:
+                logger.warning("⚠️ Enregistrement de la fixture %s impossible: %s", category, exc)
+        return df
+
+
+class ReplayProvider(JobProvider):
+    """
+    Renvoie les fixtures enregistrées au lieu d'appeler le réseau
+    Les sites demandés sont concaténés comme dans une réponse jobspy ;
+    `category` force les fixtures d'une catégorie pour tous les scrapers.
+    """
+
+    name = "replay"
+
+    def __init__(self, directory: str, category: Optional[str] = None, latency: float = 0.0):
+        self.directory = Path(directory)
+        self.category = category
+        self.latency = latency
+        self._cache: Dict[Path, pd.DataFrame] = {}
+
+    def load(self, category: str, sites: List[str]) -> pd.DataFrame:
+        frames = []
+        for site in sites:
+            path = fixture_path(self.directory, category, site)
+            if path not in self._cache:
+                if not path.exists():
+                    continue
+                self._cache[path] = load_fixture(path)
+            frames.append(self._cache[path])
+        if not frames:
+            raise LookupError(
+                f"No recorded fixture for {category} ({', '.join(sites)}) in {self.directory}"
+            )
+        # Colonnes vides d'un site écartées avant concat, rétablies en NaN ensuite
+        columns = list(dict.fromkeys(column for frame in frames for column in frame.columns))
+        return pd.concat(
+            [frame.dropna(axis=1, how="all") for frame in frames], ignore_index=True
+        ).reindex(columns=columns)
+
+    async def fetch(self, category: str, params: Dict[str, Any]):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.load(self.category or category, list(params.get("site_name", [])))
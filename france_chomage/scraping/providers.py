@@ -0,0 +1,62 @@
+"""
+Sources d'offres interrogées par les scrapers
+
+`ScraperBase` ne dépend que de `JobProvider.fetch(category, params)`, qui
+renvoie un DataFrame au format jobspy. Par défaut jobspy est appelé dans un
+thread (et ses réponses enregistrées si SCRAPE_RECORD_DIR est défini) ; un
+autre fournisseur (simulation, rejeu de fixtures) peut être installé avec
+`set_provider()` sans toucher au reste du pipeline.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from jobspy import scrape_jobs
+
+from france_chomage.config import settings
+
+
+class JobProvider(ABC):
+    """Source d'offres au format DataFrame jobspy"""
+
+    name = "provider"
+
+    @abstractmethod
+    async def fetch(self, category: str, params: Dict[str, Any]):
+        """
+        Offres pour une catégorie, `params` étant les arguments de scrape_jobs
+        (site_name, search_term, location, results_wanted...). Une erreur
+        contenant "403" est traitée comme un blocage anti-bot.
+        """
+
+
+class JobspyProvider(JobProvider):
+    """jobspy (synchrone) exécuté dans le pool de threads par défaut"""
+
+    name = "jobspy"
+
+    async def fetch(self, category: str, params: Dict[str, Any]):
+        return await asyncio.get_event_loop().run_in_executor(
+            None, lambda: scrape_jobs(**params)
+        )
+
+
+_provider: Optional[JobProvider] = None
+
+
+def get_provider() -> JobProvider:
+    """Fournisseur utilisé par les scrapers (jobspy par défaut)"""
+    global _provider
+    if _provider is None:
+        _provider = JobspyProvider()
+        if settings.scrape_record_dir:
+            from france_chomage.scraping.fixtures import RecordingProvider
+            _provider = RecordingProvider(_provider, settings.scrape_record_dir)
+    return _provider
+
+
+def set_provider(provider: Optional[JobProvider]) -> Optional[JobProvider]:
+    """Installe un fournisseur (None revient à jobspy), renvoie le précédent"""
+    global _provider
+    previous, _provider = _provider, provider
+    return previous
@@ -2,157 +2,250 @@
 Bot Telegram générique et réutilisable
 """
 import asyncio
-from typing import List
+import logging
+import time
+from typing import Dict, Optional, Tuple
 
 from telegram import Bot
+from telegram.error import RetryAfter
 from telegram.request import HTTPXRequest
 from france_chomage.config import settings
 from france_chomage.database import job_manager
-from france_chomage.database.models import Job as DBJob
+from france_chomage.formatting import (
+    MESSAGE_TEMPLATE_VERSION,
+    escape_markdown,
+    format_job_message,
+    to_plain_text,
+)
+from france_chomage.metrics import TELEGRAM_RETRY_AFTER, TELEGRAM_SEND_SECONDS, TELEGRAM_SENT
+from france_chomage.tracing import span
+
+logger = logging.getLogger(__name__)
 
 class TelegramJobBot:
     """Bot Telegram générique pour poster des offres d'emploi"""
     
-    def __init__(self):
-        # Configuration HTTPXRequest avec un pool de connexions plus grand
-        request = HTTPXRequest(
-            connection_pool_size=10,  # Augmente le pool de connexions
-            pool_timeout=10.0,        # Augmente le timeout du pool
-            read_timeout=10.0,        # Augmente le timeout de lecture
-            write_timeout=10.0        # Augmente le timeout d'écriture
-        )
-        self.bot = Bot(token=settings.telegram_bot_token, request=request)
+    def __init__(
+        self,
+        manager=None,
+        api=None,
+        base_url: Optional[str] = None,
+        token: Optional[str] = None
+    ):
+        """
+        `manager` remplace le job_manager global, `api` le client Bot (faux
+        client des benchmarks) ; `base_url` et `token` priment sur les settings.
+        """
+        self.manager = manager
+        if api is None:
+            # Configuration HTTPXRequest avec un pool de connexions plus grand
+            request = HTTPXRequest(
+                connection_pool_size=10,  # Augmente le pool de connexions
+                pool_timeout=10.0,        # Augmente le timeout du pool
+                read_timeout=10.0,        # Augmente le timeout de lecture
+                write_timeout=10.0        # Augmente le timeout d'écriture
+            )
+            api = Bot(
+                token=token or settings.telegram_bot_token,
+                request=request,
+                base_url=base_url or settings.telegram_base_url
+            )
+        self.bot = api
         self.group_id = settings.telegram_group_id
+        # Unsent jobs left per category after the last send run
+        self.unsent_backlog: Dict[str, int] = {}
+        # Stage timings of the last send run per category (run history)
+        self.send_stats: Dict[str, Dict[str, float]] = {}
+    
+    @property
+    def jobs(self):
+        """Gestionnaire d'offres utilisé (job_manager global par défaut)"""
+        return self.manager if self.manager is not None else job_manager
+    
+    async def close(self) -> None:
+        """Ferme le pool de connexions HTTPX du bot"""
+        request = getattr(self.bot, "request", None)
+        if request is not None:
+            await request.shutdown()
     
     def escape_markdown(self, text: str) -> str:
         """Échappe les caractères spéciaux MarkdownV2"""
-        if not text:
-            return ""
-        
-        # Caractères à échapper pour MarkdownV2
-        escape_chars = ['*', '_', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-        
-        for char in escape_chars:
-            text = text.replace(char, f'\\{char}')
-        
-        return text
+        return escape_markdown(text)
     
     def format_job_message(self, job, job_type: str) -> str:
         """Formate un message Telegram pour une offre (Job ou DBJob)"""
+        return format_job_message(job)
+    
+    def get_job_messages(self, job, job_type: str) -> Tuple[str, str]:
+        """Retourne les messages (MarkdownV2, texte brut) d'une offre
         
-        # Échappement des textes
-        title = self.escape_markdown(job.display_title)
-        company = self.escape_markdown(job.company)
-        location = self.escape_markdown(job.location)
-        
-        # Format date properly - dd/mm/yyyy
-        if isinstance(job, DBJob):
-            date_posted = self.escape_markdown(job.formatted_date)  # Uses dd/mm/yyyy format
-        else:
-            # Fallback for old Job model
-            date_posted = self.escape_markdown(job.date_posted)
-        
-        # Construction du message
-        message = f"🎯 *{title}*\n\n"
-        message += f"🏢 *{company}*\n"
-        message += f"📍 {location}\n"
-        message += f"📅 Publié le : {date_posted}\n"
-        
-        # Télétravail
-        if job.is_remote:
-            message += "🏠 Télétravail possible\n"
-        
-        # Salaire
-        if job.salary_source:
-            salary = self.escape_markdown(job.salary_source)
-            message += f"💰 {salary}\n"
+        Utilise les rendus stockés en base s'ils correspondent à la version
+        courante du gabarit, sinon formate l'offre.
+        """
+        markdown = getattr(job, 'message_markdown', None)
+        plain = getattr(job, 'message_plain', None)
+        if markdown and plain and getattr(job, 'message_version', None) == MESSAGE_TEMPLATE_VERSION:
+            return markdown, plain
         
-        # Lien (pas d'échappement, Telegram gère)
-        message += f"\n🔗 [Postuler ici]({job.job_url})\n"
+        message = self.format_job_message(job, job_type)
+        return message, to_plain_text(message)
+    
+    async def send_jobs_from_database(
+        self,
+        category: str,
+        topic_id: int,
+        max_jobs: Optional[int] = None,
+        interval: Optional[float] = None,
+        budget: Optional[float] = None
+    ) -> int:
+        """Send unsent jobs from database to Telegram
         
-        # Description courte
-        if job.description:
-            desc = self.escape_markdown(job.short_description)
-            message += f"\n📝 {desc}"
-            if len(job.description) > 200:
-                message += "\\.\\.\\."
+        At most SEND_MAX_PER_RUN jobs are sent per run, newest first, within
+        SEND_RUN_BUDGET seconds, SEND_INTERVAL apart (`max_jobs`, `budget` and
+        `interval` override them). Jobs left over are counted in
+        `self.unsent_backlog[category]` so the scheduler can continue later.
         
-        return message
-    
-    async def send_jobs_from_database(self, category: str, topic_id: int) -> int:
-        """Send unsent jobs from database to Telegram"""
+        Sent jobs are marked in small batches while the loop runs, with a
+        final flush even if the run is cancelled or times out, so a retry
+        only re-sends jobs that were really not delivered.
+        """
+        max_jobs = settings.send_max_per_run if max_jobs is None else max_jobs
+        interval = settings.send_interval if interval is None else interval
+        budget = settings.send_run_budget if budget is None else budget
+        sent_buffer = self.jobs.sent_buffer(
+            batch_size=settings.send_mark_batch_size,
+            interval=settings.send_mark_interval
+        )
+        started = time.perf_counter()
+        stats = {"send_seconds": 0.0, "db_seconds": 0.0, "sent_count": 0}
+        self.send_stats[category] = stats
+        wait_seconds = 0.0
         try:
-            # Get unsent jobs from database (last 30 days only)
-            unsent_jobs = await job_manager.get_unsent_jobs(category, max_age_days=30)
+            # Count unsent jobs from database (last 30 days only)
+            unsent_count = await self.jobs.count_unsent_jobs(category, max_age_days=30)
+            self.unsent_backlog[category] = unsent_count
             
-            if not unsent_jobs:
-                print(f"📭 Aucune nouvelle offre {category} à envoyer")
+            if not unsent_count:
+                stats["db_seconds"] = time.perf_counter() - started
+                logger.info(f"📭 Aucune nouvelle offre {category} à envoyer")
                 return 0
             
-            print(f"📤 Envoi de {len(unsent_jobs)} nouvelles offres {category}")
+            to_send = min(unsent_count, max_jobs)
+            logger.info(f"📤 Envoi de {to_send}/{unsent_count} nouvelles offres {category}")
             
+            deadline = time.monotonic() + budget
+            attempted = 0
             sent_count = 0
-            sent_job_ids = []
-            
-            for i, job in enumerate(unsent_jobs, 1):
-                print(f"📨 Envoi {i}/{len(unsent_jobs)}: {job.title[:50]}...")
-                success = await self.send_job(job, topic_id, category)
-                if success:
-                    sent_count += 1
-                    sent_job_ids.append(job.id)
-                
-                # Rate limiting
-                await asyncio.sleep(2)
             
-            # Mark jobs as sent in database
-            if sent_job_ids:
-                marked_count = await job_manager.mark_jobs_as_sent(sent_job_ids)
-                print(f"✅ {marked_count} jobs marqués comme envoyés en base")
+            try:
+                async for job in self.jobs.iter_unsent_jobs(
+                    category, max_age_days=30, page_size=settings.send_page_size
+                ):
+                    if attempted >= to_send:
+                        break
+                    if time.monotonic() >= deadline:
+                        logger.warning("⏱️ Budget d'envoi épuisé (%.0fs)", budget)
+                        break
+                    
+                    attempted += 1
+                    logger.debug("📨 Envoi %d/%d: %.50s...", attempted, to_send, job.title)
+                    send_started = time.perf_counter()
+                    success = await self.send_job(job, topic_id, category)
+                    stats["send_seconds"] += time.perf_counter() - send_started
+                    if success:
+                        sent_count += 1
+                        await sent_buffer.add(job.id)
+                    
+                    # Rate limiting
+                    wait_started = time.perf_counter()
+                    await asyncio.sleep(interval)
+                    wait_seconds += time.perf_counter() - wait_started
+            finally:
+                # Final flush, also when cancelled mid-run
+                await sent_buffer.flush()
+                # Time not spent posting or rate limiting went to paging and marking
+                stats["db_seconds"] = max(
+                    0.0, time.perf_counter() - started - stats["send_seconds"] - wait_seconds
+                )
+                stats["sent_count"] = sent_count
+                if sent_buffer.marked_count:
+                    logger.debug(
+                        "✅ %d jobs marqués comme envoyés en base", sent_buffer.marked_count
+                    )
+                self.unsent_backlog[category] = max(0, unsent_count - sent_buffer.marked_count)
             
-            print(f"🎯 Envoi terminé: {sent_count}/{len(unsent_jobs)} offres envoyées")
+            remaining = self.unsent_backlog[category]
+            logger.info(
+                "🎯 Envoi terminé: %d/%d offres %s envoyées", sent_count, attempted, category
+            )
+            if remaining:
+                logger.info(f"📥 {remaining} offres {category} restantes pour le prochain envoi")
             return sent_count
             
         except Exception as exc:
-            print(f"❌ Erreur envoi jobs depuis database: {exc}")
+            logger.error(f"❌ Erreur envoi jobs depuis database: {exc}")
             return 0
     
+    async def _send_message(self, **kwargs) -> None:
+        """Envoie un message en respectant les 429 RetryAfter de Telegram"""
+        for attempt in range(settings.telegram_max_retry_after + 1):
+            started = time.perf_counter()
+            try:
+                await self.bot.send_message(**kwargs)
+                return
+            except RetryAfter as exc:
+                TELEGRAM_RETRY_AFTER.inc()
+                if attempt >= settings.telegram_max_retry_after:
+                    raise
+                retry_after = exc.retry_after
+            finally:
+                TELEGRAM_SEND_SECONDS.observe(time.perf_counter() - started)
+            
+            logger.warning("⏳ Limite Telegram atteinte, attente %ss", retry_after)
+            await asyncio.sleep(retry_after)
+    
     async def send_job(self, job, topic_id: int, job_type: str) -> bool:
         """Envoie une offre sur Telegram"""
-        try:
-            message = self.format_job_message(job, job_type)
-            
-            await self.bot.send_message(
-                chat_id=self.group_id,
-                message_thread_id=topic_id,
-                text=message,
-                parse_mode='MarkdownV2',
-                disable_web_page_preview=False
-            )
-            
-            print(f"✅ Offre envoyée: {job.title}")
-            return True
-            
-        except Exception as exc:
-            print(f"⚠️ Échec Markdown, essai sans formatage: {job.title}")
+        job_id = getattr(job, "id", None)
+        with span("telegram.send_job", category=job_type, job_id=job_id) as send_span:
+            message, clean_message = self.get_job_messages(job, job_type)
             
             try:
-                # Fallback sans formatage
-                clean_message = self.format_job_message(job, job_type)
-                clean_message = clean_message.replace('*', '').replace('\\', '').replace('_', '')
-                
-                await self.bot.send_message(
+                await self._send_message(
                     chat_id=self.group_id,
                     message_thread_id=topic_id,
-                    text=clean_message,
+                    text=message,
+                    parse_mode='MarkdownV2',
                     disable_web_page_preview=False
                 )
                 
-                print(f"✅ Offre envoyée (texte brut): {job.title}")
+                logger.debug("✅ Offre envoyée: %s", job.title)
+                TELEGRAM_SENT.inc(outcome="markdown")
+                send_span.set_attribute("outcome", "markdown")
                 return True
                 
-            except Exception as exc2:
-                print(f"❌ Échec total envoi: {job.title} - {str(exc2)}")
-                return False
+            except Exception as exc:
+                logger.warning("⚠️ Échec Markdown, essai sans formatage: %s (%s)", job.title, exc)
+                
+                try:
+                    # Fallback sans formatage
+                    await self._send_message(
+                        chat_id=self.group_id,
+                        message_thread_id=topic_id,
+                        text=clean_message,
+                        disable_web_page_preview=False
+                    )
+                    
+                    logger.debug("✅ Offre envoyée (texte brut): %s", job.title)
+                    TELEGRAM_SENT.inc(outcome="plain")
+                    send_span.set_attribute("outcome", "plain")
+                    return True
+                    
+                except Exception as exc2:
+                    logger.error("❌ Échec total envoi: %s - %s", job.title, exc2)
+                    TELEGRAM_SENT.inc(outcome="failed")
+                    send_span.set_attribute("outcome", "failed")
+                    return False
     
     # Old send_jobs method removed - now using send_jobs_from_database
     
@@ -234,24 +327,24 @@ class TelegramJobBot:
                 disable_web_page_preview=True
             )
             
-            print(f"📊 Résumé envoyé vers topic général ({settings.telegram_group_id})")
+            logger.info(f"📊 Résumé envoyé vers topic général ({settings.telegram_group_id})")
             return True
             
         except Exception as exc:
-            print(f"❌ Erreur envoi résumé: {exc}")
+            logger.error(f"❌ Erreur envoi résumé: {exc}")
             # Fallback sans formatage
             try:
-                clean_message = message.replace('*', '').replace('\\', '').replace('_', '')
+                clean_message = to_plain_text(message)
                 await self.bot.send_message(
                     chat_id=self.group_id,
                     message_thread_id=settings.telegram_group_id,
                     text=clean_message,
                     disable_web_page_preview=True
                 )
-                print("📊 Résumé envoyé (texte brut)")
+                logger.info("📊 Résumé envoyé (texte brut)")
                 return True
             except Exception as exc2:
-                print(f"❌ Échec total envoi résumé: {exc2}")
+                logger.error(f"❌ Échec total envoi résumé: {exc2}")
                 return False
 
 # Instance globale
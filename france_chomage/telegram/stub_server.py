@@ -0,0 +1,182 @@
+"""
+Serveur local imitant l'API Bot Telegram (getMe, sendMessage)
+
+Permet de tester l'envoi en volume sans réseau : latence configurable,
+réponses 429 RetryAfter et erreurs de parsing MarkdownV2 injectées.
+Pointer TELEGRAM_BASE_URL vers `StubTelegramServer.base_url`.
+"""
+import json
+import random
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+class StubTelegramServer:
+    """Serveur HTTP local parlant le sous-ensemble de l'API Bot utilisé"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        retry_after_rate: float = 0.0,
+        retry_after: int = 1,
+        parse_error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        keep_messages: int = 1000
+    ):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.retry_after_rate = retry_after_rate
+        self.retry_after = max(1, retry_after)  # 0 n'est pas interprété comme RetryAfter
+        self.parse_error_rate = parse_error_rate
+        self.keep_messages = keep_messages
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._message_id = 0
+        self.messages: List[Dict[str, Any]] = []
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "messages_sent": 0,
+            "retry_after": 0,
+            "parse_errors": 0,
+        }
+
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """URL de base à passer à Bot(base_url=...) / TELEGRAM_BASE_URL"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/bot"
+
+    def start(self) -> "StubTelegramServer":
+        """Démarre le serveur dans un thread de fond"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Démarre le serveur dans le thread courant (bloquant)"""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Arrête le serveur"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "StubTelegramServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _draw(self, rate: float) -> bool:
+        with self._lock:
+            return rate > 0 and self._random.random() < rate
+
+    def handle(self, method: str, params: Dict[str, Any]):
+        """Traite un appel d'API, retourne (status HTTP, réponse JSON)"""
+        with self._lock:
+            self.stats["requests"] += 1
+
+        delay = self.latency
+        if self.latency_jitter:
+            with self._lock:
+                delay += self._random.uniform(0, self.latency_jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if method == "getMe":
+            return HTTPStatus.OK, {"ok": True, "result": {
+                "id": 1,
+                "is_bot": True,
+                "first_name": "France Chômage Stub",
+                "username": "france_chomage_stub_bot",
+            }}
+
+        if method != "sendMessage":
+            return HTTPStatus.NOT_FOUND, {
+                "ok": False, "error_code": 404, "description": "Not Found: method not found"
+            }
+
+        if self._draw(self.retry_after_rate):
+            with self._lock:
+                self.stats["retry_after"] += 1
+            return HTTPStatus.TOO_MANY_REQUESTS, {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.retry_after}",
+                "parameters": {"retry_after": self.retry_after},
+            }
+
+        if params.get("parse_mode") == "MarkdownV2" and self._draw(self.parse_error_rate):
+            with self._lock:
+                self.stats["parse_errors"] += 1
+            return HTTPStatus.BAD_REQUEST, {
+                "ok": False,
+                "error_code": 400,
+                "description": "Bad Request: can't parse entities: "
+                               "Character '.' is reserved and must be escaped",
+            }
+
+        with self._lock:
+            self._message_id += 1
+            self.stats["messages_sent"] += 1
+            message = {
+                "message_id": self._message_id,
+                "date": int(time.time()),
+                "chat": {"id": int(params.get("chat_id") or 0), "type": "supergroup"},
+                "text": params.get("text", ""),
+            }
+            if params.get("message_thread_id"):
+                message["message_thread_id"] = int(params["message_thread_id"])
+            self.messages.append(message)
+            if len(self.messages) > self.keep_messages:
+                del self.messages[:-self.keep_messages]
+
+        return HTTPStatus.OK, {"ok": True, "result": message}
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _dispatch(self) -> None:
+                url = urlparse(self.path)
+                path = url.path
+                method = path.rstrip("/").rsplit("/", 1)[-1]
+
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode("utf-8") if length else ""
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    params = json.loads(body or "{}")
+                else:
+                    params = {k: v[-1] for k, v in parse_qs(body).items()}
+                    params.update({k: v[-1] for k, v in parse_qs(url.query).items()})
+
+                status, payload = stub.handle(method, params)
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = _dispatch
+            do_POST = _dispatch
+
+            def log_message(self, format, *args):
+                # Silencieux : le volume de requêtes noierait les logs
+                pass
+
+        return Handler
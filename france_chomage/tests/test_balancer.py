@@ -0,0 +1,92 @@
+"""
+Tests pour l'équilibrage des horaires de scraping
+"""
+from france_chomage.balancer import (
+    DEFAULT_SCRAPE_SECONDS,
+    CategoryCost,
+    balance_schedule,
+    costs_from_averages,
+    current_plan,
+    diff_plan,
+    hourly_load,
+    peak_load,
+)
+from france_chomage.categories import CategoryConfig
+
+SITES = ("indeed", "linkedin")
+
+
+def make_categories(hours):
+    """Catégories avec scrape à l'heure donnée et envoi une heure après"""
+    return {
+        name: CategoryConfig(
+            name=name,
+            search_terms=name,
+            telegram_topic_id=100 + i,
+            schedule_hour=hour,
+            scrape_hours=[hour],
+            send_hours=[(hour + 1) % 24]
+        )
+        for i, (name, hour) in enumerate(hours.items())
+    }
+
+
+class TestBalancer:
+    """Tests pour balance_schedule"""
+    
+    def test_balance_spreads_expensive_categories(self):
+        """Test que les catégories coûteuses ne partagent plus la même heure"""
+        categories = make_categories({"design": 10, "communication": 10, "vente": 10})
+        costs = {
+            "design": CategoryCost("design", scrape_seconds=300),
+            "communication": CategoryCost("communication", scrape_seconds=200),
+            "vente": CategoryCost("vente", scrape_seconds=20),
+        }
+        
+        plan = balance_schedule(categories, costs, SITES)
+        
+        scrape_hours = [hours[0][0] for hours in plan.values()]
+        assert len(set(scrape_hours)) == 3
+        assert all(send == [(scrape[0] + 1) % 24] for scrape, send in plan.values())
+        
+        old_peak = peak_load(hourly_load(current_plan(categories), costs, SITES))
+        new_peak = peak_load(hourly_load(plan, costs, SITES))
+        assert new_peak == 150.0 < old_peak
+    
+    def test_balance_keeps_extra_send_hours(self):
+        """Test que les envois en plus des scrapings sont conservés"""
+        categories = {
+            "design": CategoryConfig(
+                name="design", search_terms="design", telegram_topic_id=40, schedule_hour=9,
+                scrape_hours=[9], send_hours=[10, 14, 18]
+            )
+        }
+        costs = {"design": CategoryCost("design", scrape_seconds=60, new_jobs=5)}
+        
+        plan = balance_schedule(categories, costs, SITES)
+        
+        scrape_hours, send_hours = plan["design"]
+        assert len(send_hours) == 3
+        assert len(set(send_hours)) == 3
+        assert (scrape_hours[0] + 1) % 24 in send_hours
+    
+    def test_balance_keeps_balanced_schedule(self):
+        """Test qu'un planning déjà équilibré ne change pas"""
+        categories = make_categories({"design": 5, "communication": 9})
+        costs = {name: CategoryCost(name, scrape_seconds=60) for name in categories}
+        
+        plan = balance_schedule(categories, costs, SITES)
+        
+        assert diff_plan(current_plan(categories), plan) == []
+    
+    def test_costs_from_run_averages(self):
+        """Test conversion des moyennes de l'historique des runs"""
+        costs = costs_from_averages({
+            "design": {"runs": 4, "duration_seconds": 130.0, "new_rows": 7.0},
+            "vente": {"runs": 1, "duration_seconds": 0.0, "new_rows": 0.0},
+        })
+        
+        assert costs["design"].scrape_seconds == 130.0
+        assert costs["design"].new_jobs == 7.0
+        assert costs["design"].runs == 4
+        assert costs["vente"].scrape_seconds == DEFAULT_SCRAPE_SECONDS
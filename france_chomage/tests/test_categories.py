@@ -0,0 +1,69 @@
+"""
+Tests pour le rechargement de categories.yml
+"""
+import os
+import pytest
+
+from france_chomage.categories import CategoryManager
+
+CONFIG = """categories:
+  design:
+    search_terms: "designer"
+    telegram_topic_id: 10
+    scrape_hours: [{scrape_hour}]
+    send_hours: [11]
+  communication:
+    search_terms: "communication"
+    telegram_topic_id: 20
+    scrape_hours: [8]
+    send_hours: [9]
+"""
+
+
+class TestCategoryReload:
+    """Tests pour CategoryManager.config_changed / reload_categories"""
+    
+    def test_config_changed_detects_edits_only(self, tmp_path):
+        """Test détection par mtime puis hash du contenu"""
+        path = tmp_path / "categories.yml"
+        path.write_text(CONFIG.format(scrape_hour=10))
+        manager = CategoryManager(str(path))
+        manager.load_categories()
+        
+        assert not manager.config_changed()
+        
+        # Touch without editing: same content hash
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert not manager.config_changed()
+        
+        path.write_text(CONFIG.format(scrape_hour=14))
+        assert manager.config_changed()
+        
+        manager.reload_categories()
+        assert manager.get_category("design").scrape_hours == [14]
+        assert not manager.config_changed()
+    
+    def test_invalid_reload_keeps_last_good_config(self, tmp_path):
+        """Test qu'un fichier invalide ne remplace pas la configuration"""
+        path = tmp_path / "categories.yml"
+        path.write_text(CONFIG.format(scrape_hour=10))
+        manager = CategoryManager(str(path))
+        manager.load_categories()
+        
+        # Duplicate topic IDs fail validation
+        duplicated = CONFIG.format(scrape_hour=10).replace(
+            "telegram_topic_id: 20", "telegram_topic_id: 10"
+        )
+        path.write_text(duplicated)
+        with pytest.raises(ValueError):
+            manager.reload_categories()
+        
+        assert manager.get_category("communication").telegram_topic_id == 20
+        # The broken version is reported once, not at every check
+        assert not manager.config_changed()
+        
+        path.write_text(CONFIG.format(scrape_hour=12))
+        assert manager.config_changed()
+        manager.reload_categories()
+        assert manager.get_category("design").scrape_hours == [12]
@@ -0,0 +1,75 @@
+"""
+Tests de l'option --profile de la CLI
+"""
+import logging
+from types import SimpleNamespace
+
+import pytest
+from typer.testing import CliRunner
+
+from france_chomage.categories import category_manager
+from france_chomage.logging_config import stop_logging
+
+
+@pytest.fixture
+def cli(monkeypatch):
+    """Importe la CLI (qui charge les catégories globales) et restaure leur état"""
+    for attribute in ("_categories", "_loaded", "_file_stat", "_file_hash"):
+        monkeypatch.setattr(category_manager, attribute, getattr(category_manager, attribute))
+    import france_chomage.cli
+    import france_chomage.cli.profiler
+    return france_chomage.cli
+
+
+def _frame(function, time, children=()):
+    return SimpleNamespace(
+        function=function, file_path_short="bot.py", line_no=1, time=time, children=list(children)
+    )
+
+
+def test_cprofile_writes_prof_file(cli, tmp_path):
+    """Test que cProfile écrit un fichier .prof et un résumé"""
+    profiler = cli.profiler.CommandProfiler(tmp_path / "run", "cprofile")
+    profiler.start()
+    sum(i * i for i in range(10000))
+    summary = profiler.stop()
+
+    assert (tmp_path / "run.prof").exists()
+    assert "cProfile" in summary
+    assert "Ordered by: cumulative time" in summary
+
+
+def test_collapsed_stacks_from_call_tree(cli):
+    """Test la conversion de l'arbre d'appels en piles repliées"""
+    root = _frame("main", 1.0, [
+        _frame("scrape", 0.7, [_frame("strptime", 0.5)]),
+        _frame("send", 0.2),
+    ])
+
+    stacks = cli.profiler.collapsed_stacks(root)
+
+    assert stacks["main (bot.py:1);scrape (bot.py:1);strptime (bot.py:1)"] == 500
+    assert stacks["main (bot.py:1);scrape (bot.py:1)"] == 200
+    assert stacks["main (bot.py:1)"] == 100
+    assert cli.profiler.top_self_times(stacks, limit=1) == [("strptime (bot.py:1)", 500)]
+
+
+def test_profile_option_wraps_any_command(cli, tmp_path):
+    """Test que --profile enveloppe une sous-commande"""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    try:
+        result = CliRunner().invoke(
+            cli.app,
+            [
+                "--profile", "--profiler", "cprofile", "--profile-output", str(tmp_path / "info"),
+                "utils", "info"
+            ]
+        )
+    finally:
+        stop_logging()
+        root.handlers[:] = handlers
+        root.setLevel(level)
+
+    assert result.exit_code == 0
+    assert (tmp_path / "info.prof").exists()
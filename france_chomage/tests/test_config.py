@@ -24,7 +24,10 @@ class TestSettingsNew:
             
             # Clear optional vars to test defaults
             for key in list(os.environ.keys()):
-                if key in ['RESULTS_WANTED', 'LOCATION', 'COUNTRY', 'SKIP_INIT_JOB'] or 'TOPIC_ID' in key:
+                if key in [
+                    'RESULTS_WANTED', 'LOCATION', 'COUNTRY', 'SKIP_INIT_JOB',
+                    'STARTUP_WARMUP', 'DB_PROFILE'
+                ] or 'TOPIC_ID' in key:
                     del os.environ[key]
             
             settings = Settings()
@@ -35,6 +38,8 @@ class TestSettingsNew:
             assert settings.location == "Paris"  # default
             assert settings.country == "FRANCE"  # default
             assert settings.skip_init_job == 0  # default
+            assert settings.startup_warmup == 0  # default: smoke test only
+            assert settings.db_profile is False  # opt-in
             assert settings.max_retries == 3
             
         finally:
@@ -0,0 +1,79 @@
+"""
+Tests de l'enregistrement et du rejeu des réponses jobspy
+"""
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from france_chomage.scraping.fixtures import (
+    RecordingProvider,
+    ReplayProvider,
+    fixture_path,
+    list_fixtures,
+    load_fixture,
+    save_fixture,
+)
+from france_chomage.scraping.providers import JobProvider
+
+
+@pytest.fixture
+def jobspy_dataframe():
+    """DataFrame au format jobspy : dates, NaN, numpy et plusieurs sites"""
+    return pd.DataFrame({
+        'site': ['indeed', 'linkedin', 'indeed'],
+        'job_url': ['https://a.test/1', 'https://b.test/2', 'https://a.test/3'],
+        'title': ['Dev Python', 'Designer UI', 'Chargé de com'],
+        'company': ['TechCorp', 'DesignStudio', 'Agence'],
+        'location': ['Paris', 'Lyon', 'Paris'],
+        'date_posted': [date(2024, 1, 15), date(2024, 1, 16), None],
+        'min_amount': [35000.0, float('nan'), 42000.0],
+        'is_remote': [True, False, False],
+    })
+
+
+class StaticProvider(JobProvider):
+    """Fournisseur renvoyant toujours le même DataFrame"""
+
+    def __init__(self, df):
+        self.df = df
+
+    async def fetch(self, category, params):
+        return self.df
+
+
+def test_fixture_roundtrip(tmp_path, jobspy_dataframe):
+    """Test enregistrement puis chargement d'une fixture"""
+    path = save_fixture(tmp_path, "design", "indeed", jobspy_dataframe, {"search_term": "design"})
+
+    df = load_fixture(path)
+
+    assert path == fixture_path(tmp_path, "design", "indeed")
+    assert list(df.columns) == list(jobspy_dataframe.columns)
+    assert df['date_posted'][0] == date(2024, 1, 15)
+    assert df['date_posted'][2] is None
+    assert pd.isna(df['min_amount'][1])
+    assert df['is_remote'].tolist() == [True, False, False]
+
+
+@pytest.mark.asyncio
+async def test_recording_then_replay_by_site(tmp_path, jobspy_dataframe):
+    """Test une fixture par site puis rejeu des sites demandés"""
+    recorder = RecordingProvider(StaticProvider(jobspy_dataframe), str(tmp_path))
+    await recorder.fetch("design", {"site_name": ["indeed", "linkedin"]})
+
+    assert list_fixtures(tmp_path) == {"design": ["indeed", "linkedin"]}
+
+    replay = ReplayProvider(str(tmp_path))
+    indeed = await replay.fetch("design", {"site_name": ["indeed"]})
+    both = await replay.fetch("design", {"site_name": ["indeed", "linkedin"]})
+
+    assert indeed['job_url'].tolist() == ['https://a.test/1', 'https://a.test/3']
+    assert len(both) == 3
+
+
+@pytest.mark.asyncio
+async def test_replay_without_fixture(tmp_path):
+    """Test erreur explicite quand rien n'a été enregistré"""
+    with pytest.raises(LookupError, match="design"):
+        await ReplayProvider(str(tmp_path)).fetch("design", {"site_name": ["linkedin"]})
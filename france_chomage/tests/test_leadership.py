@@ -0,0 +1,196 @@
+"""
+Tests pour la coordination multi-réplicas par verrous consultatifs
+"""
+import pytest
+
+from france_chomage.leadership import (
+    REPLICA_NAMESPACE,
+    SchedulerLeadership,
+    rendezvous_owner,
+)
+
+CATEGORIES = [f"category_{i}" for i in range(12)]
+
+
+class FakeLockServer:
+    """Verrous consultatifs partagés, comme dans pg_locks"""
+    
+    def __init__(self):
+        self.locks = {}  # (namespace, key) -> session holding the lock
+
+
+class FakeConnection:
+    """Connexion du pool : close() la rend au pool sans fermer la session"""
+    
+    def __init__(self, server):
+        self.server = server
+        self.broken = False
+        self.invalidated = False
+    
+    def drop_locks(self):
+        for lock, holder in list(self.server.locks.items()):
+            if holder is self:
+                del self.server.locks[lock]
+    
+    async def execute(self, statement, params=None):
+        if self.broken:
+            raise ConnectionError("connection lost")
+        if "pg_advisory_unlock_all" in str(statement):
+            self.drop_locks()
+    
+    async def commit(self):
+        pass
+    
+    async def close(self):
+        pass  # Back to the pool: the session and its locks live on
+    
+    async def invalidate(self):
+        # Session ended by Postgres, every lock goes with it
+        self.invalidated = True
+        self.drop_locks()
+
+
+class FakeLeadership(SchedulerLeadership):
+    """SchedulerLeadership sur un FakeLockServer au lieu de Postgres"""
+    
+    def __init__(self, server, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.server = server
+        self.alive = True
+        self.failing = False
+        self.connections = []
+    
+    async def _ensure_connection(self):
+        if not self.alive:
+            if self._conn is not None:
+                self._conn.broken = True
+            raise ConnectionError("connection lost")
+        if self._conn is None:
+            self._conn = FakeConnection(self.server)
+            self.connections.append(self._conn)
+    
+    async def _heartbeat(self):
+        if self.failing:
+            raise TimeoutError("statement timeout")
+    
+    async def _try_lock(self, namespace, key):
+        holder = self.server.locks.setdefault((namespace, key), self._conn)
+        return holder is self._conn
+    
+    async def _unlock(self, namespace, key):
+        if self.server.locks.get((namespace, key)) is self._conn:
+            del self.server.locks[(namespace, key)]
+    
+    async def _members(self):
+        return [key for (namespace, key) in self.server.locks if namespace == REPLICA_NAMESPACE]
+
+
+class TestLeadership:
+    """Tests pour SchedulerLeadership"""
+    
+    def test_rendezvous_owner_is_stable(self):
+        """Test qu'un départ ne déplace que les catégories du réplica parti"""
+        before = {c: rendezvous_owner(c, [0, 1, 2]) for c in CATEGORIES}
+        after = {c: rendezvous_owner(c, [0, 2]) for c in CATEGORIES}
+        
+        assert set(before.values()) == {0, 1, 2}
+        for category in CATEGORIES:
+            if before[category] != 1:
+                assert after[category] == before[category]
+        assert rendezvous_owner("design", []) is None
+    
+    @pytest.mark.asyncio
+    async def test_off_mode_owns_everything(self):
+        """Test mode mono-réplica par défaut"""
+        leadership = SchedulerLeadership(mode="off")
+        
+        assert await leadership.refresh(CATEGORIES) == set()
+        assert leadership.owns("design")
+    
+    @pytest.mark.asyncio
+    async def test_global_leader_failover(self):
+        """Test bascule du leader quand il perd sa connexion"""
+        server = FakeLockServer()
+        first = FakeLeadership(server, mode="global")
+        second = FakeLeadership(server, mode="global")
+        
+        assert await first.refresh(CATEGORIES) == set(CATEGORIES)
+        assert await second.refresh(CATEGORIES) == set()
+        assert first.owns("design") and not second.owns("design")
+        
+        first.alive = False
+        await first.refresh(CATEGORIES)
+        assert not first.owns("design")
+        
+        assert await second.refresh(CATEGORIES) == set(CATEGORIES)
+        assert second.owns("design")
+    
+    @pytest.mark.asyncio
+    async def test_categories_split_and_taken_over(self):
+        """Test partage des catégories entre réplicas et reprise après panne"""
+        server = FakeLockServer()
+        replicas = [FakeLeadership(server, mode="category", replica_slots=3) for _ in range(3)]
+        
+        # Join first, then converge on the rendezvous assignment
+        for _ in range(2):
+            for replica in replicas:
+                await replica.refresh(CATEGORIES)
+        
+        owned = [replica.owned for replica in replicas]
+        assert set().union(*owned) == set(CATEGORIES)
+        assert sum(len(o) for o in owned) == len(CATEGORIES)
+        assert all(owned)
+        
+        lost = set(replicas[1].owned)
+        replicas[1].alive = False
+        await replicas[1].refresh(CATEGORIES)
+        
+        gained = set()
+        for replica in (replicas[0], replicas[2]):
+            gained |= await replica.refresh(CATEGORIES)
+        
+        assert gained == lost
+        assert replicas[0].owned | replicas[2].owned == set(CATEGORIES)
+    
+    @pytest.mark.asyncio
+    async def test_busy_category_not_handed_over(self):
+        """Test qu'une catégorie en cours d'exécution n'est pas cédée"""
+        server = FakeLockServer()
+        first = FakeLeadership(server, mode="category", replica_slots=2)
+        await first.refresh(CATEGORIES)
+        assert first.owned == set(CATEGORIES)
+        
+        second = FakeLeadership(server, mode="category", replica_slots=2)
+        await second.refresh(CATEGORIES)
+        moving = {c for c in CATEGORIES if rendezvous_owner(c, [0, 1]) == second.slot}
+        busy = sorted(moving)[0]
+        
+        await first.refresh(CATEGORIES, busy=lambda c: c == busy)
+        assert first.owned == (set(CATEGORIES) - moving) | {busy}
+        
+        await second.refresh(CATEGORIES)
+        assert second.owned == moving - {busy}
+    
+    @pytest.mark.asyncio
+    async def test_failed_refresh_releases_pooled_locks(self):
+        """Test qu'un échec transitoire libère les verrous avant de rendre la connexion au pool"""
+        server = FakeLockServer()
+        first = FakeLeadership(server, mode="category", replica_slots=2)
+        second = FakeLeadership(server, mode="category", replica_slots=2)
+        await first.refresh(CATEGORIES)
+        assert first.owned == set(CATEGORIES)
+        
+        # Live session, failed check: locks unlocked, connection pooled
+        first.failing = True
+        assert await first.refresh(CATEGORIES) == set()
+        assert not first.owned
+        assert server.locks == {}
+        assert not first.connections[0].invalidated
+        
+        assert await second.refresh(CATEGORIES) == set(CATEGORIES)
+        
+        # Broken session: unlock fails, the connection is discarded
+        second.alive = False
+        await second.refresh(CATEGORIES)
+        assert second.connections[0].invalidated
+        assert server.locks == {}
@@ -0,0 +1,69 @@
+"""
+Tests de la configuration des logs
+"""
+import io
+import json
+import logging
+import logging.handlers
+
+import pytest
+
+from france_chomage import logging_config
+from france_chomage.logging_config import JsonFormatter, setup_logging, stop_logging
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    stop_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_json_formatter_keeps_extra_fields():
+    """Test qu'un enregistrement devient un objet JSON avec les champs extra"""
+    record = logging.LogRecord(
+        "france_chomage.scheduler", logging.INFO, __file__, 1, "📦 %d jobs", (3,), None
+    )
+    record.category = "design"
+
+    data = json.loads(JsonFormatter().format(record))
+
+    assert data["level"] == "INFO"
+    assert data["logger"] == "france_chomage.scheduler"
+    assert data["message"] == "📦 3 jobs"
+    assert data["category"] == "design"
+
+
+def test_setup_logging_writes_through_queue(restore_root_logger):
+    """Test que les logs passent par la file et le thread d'écriture"""
+    stream = io.StringIO()
+    setup_logging(level="INFO", log_format="json", stream=stream)
+
+    root = logging.getLogger()
+    assert any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers)
+
+    logger = logging.getLogger("france_chomage.test")
+    logger.debug("hidden")
+    logger.warning("⚠️ visible %s", "ok")
+    stop_logging()  # Vide la file
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == ["⚠️ visible ok"]
+    assert lines[0]["level"] == "WARNING"
+
+
+def test_setup_logging_is_idempotent(restore_root_logger):
+    """Test qu'un second appel remplace la configuration précédente"""
+    setup_logging(level="INFO", stream=io.StringIO())
+    first = logging_config._listener
+    setup_logging(level="DEBUG", stream=io.StringIO())
+
+    queue_handlers = [
+        h for h in logging.getLogger().handlers if isinstance(h, logging.handlers.QueueHandler)
+    ]
+    assert len(queue_handlers) == 1
+    assert logging_config._listener is not first
+    assert logging.getLogger().level == logging.DEBUG
@@ -0,0 +1,54 @@
+"""
+Tests de la surveillance mémoire
+"""
+import tracemalloc
+
+import pytest
+
+from france_chomage.memory import MemoryWatch, format_size, load_snapshots, rss_bytes, subsystem
+
+
+@pytest.fixture
+def tracing():
+    started = not tracemalloc.is_tracing()
+    yield
+    if started:
+        tracemalloc.stop()
+
+
+def test_subsystem_from_filename():
+    """Test l'attribution des allocations à un sous-système"""
+    assert subsystem("/app/france_chomage/database/manager.py") == "france_chomage.database"
+    assert subsystem("/app/france_chomage/scheduler.py") == "france_chomage.scheduler"
+    assert subsystem("/venv/lib/python3.11/site-packages/pandas/core/frame.py") == "pandas"
+    assert subsystem("/usr/lib/python3.11/json/decoder.py") == "stdlib"
+
+
+def test_format_size():
+    """Test l'affichage des tailles"""
+    assert format_size(512) == "512 B"
+    assert format_size(-2048) == "-2.0 KiB"
+    assert format_size(5 * 1024 * 1024) == "5.0 MiB"
+
+
+def test_memory_watch_reports_growth(tracing, tmp_path):
+    """Test qu'une allocation persistante apparaît dans la croissance"""
+    watch = MemoryWatch(top=5, snapshot_dir=str(tmp_path))
+    watch.start()
+    assert watch.check() == []
+
+    leak = [bytearray(1000) for _ in range(2000)]
+    growth = watch.check()
+
+    assert growth[0].where.startswith(__file__)
+    assert growth[0].size_diff >= 2000 * 1000
+    baseline, latest = load_snapshots(str(tmp_path))
+    assert sum(stat.size for stat in latest.statistics("filename")) > sum(
+        stat.size for stat in baseline.statistics("filename")
+    )
+    assert len(leak) == 2000
+
+
+def test_rss_bytes_is_positive():
+    """Test la lecture de la mémoire résidente"""
+    assert rss_bytes() > 0
@@ -0,0 +1,68 @@
+"""
+Tests pour les métriques Prometheus
+"""
+import urllib.request
+
+import pytest
+
+from france_chomage.metrics import MetricsRegistry, MetricsServer
+
+
+class TestMetrics:
+    """Tests pour le registre et l'endpoint /metrics"""
+    
+    def test_render_text_format(self):
+        """Test rendu au format texte Prometheus"""
+        registry = MetricsRegistry()
+        rows = registry.counter("rows_total", "Rows", ("category", "kind"))
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        pool = registry.gauge("pool_checked_out", "Pool")
+        
+        rows.inc(3, category="design", kind="new")
+        rows.inc(category="design", kind="new")
+        latency.observe(0.05)
+        latency.observe(0.5)
+        pool.set_function(lambda: 7)
+        
+        text = registry.render()
+        
+        assert "# TYPE rows_total counter" in text
+        assert 'rows_total{category="design",kind="new"} 4' in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+        assert "latency_seconds_count 2" in text
+        assert "pool_checked_out 7" in text
+    
+    def test_labels_are_checked(self):
+        """Test erreur sur des labels inattendus"""
+        registry = MetricsRegistry()
+        rows = registry.counter("rows_total", "Rows", ("category",))
+        
+        with pytest.raises(ValueError):
+            rows.inc(site="indeed")
+    
+    def test_failing_callback_skips_sample(self):
+        """Test qu'un callback en erreur (moteur fermé) n'empêche pas le rendu"""
+        registry = MetricsRegistry()
+        registry.gauge("pool_overflow", "Overflow").set_function(lambda: 1 / 0)
+        
+        text = registry.render()
+        assert "# TYPE pool_overflow gauge" in text
+        assert "\npool_overflow " not in text
+    
+    def test_metrics_endpoint(self):
+        """Test endpoint HTTP local"""
+        registry = MetricsRegistry()
+        registry.counter("sent_total", "Sent").inc(2)
+        
+        server = MetricsServer("127.0.0.1", 0, metrics=registry).start()
+        try:
+            with urllib.request.urlopen(server.url, timeout=5) as response:
+                body = response.read().decode("utf-8")
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.stop()
+        
+        assert "sent_total 2" in body
+        assert content_type.startswith("text/plain")
@@ -0,0 +1,66 @@
+"""
+Tests du profilage des requêtes SQL
+"""
+import logging
+
+from sqlalchemy import create_engine, text
+
+from france_chomage.database.profiling import QueryProfiler, fingerprint, statement_label
+
+
+def test_fingerprint_groups_executions():
+    """Test que les paramètres, littéraux et listes IN sont retirés"""
+    first = fingerprint(
+        "SELECT jobs.id FROM jobs WHERE jobs.job_url = $1::VARCHAR "
+        "AND jobs.id IN ($2::INTEGER, $3::INTEGER)"
+    )
+    second = fingerprint(
+        "SELECT jobs.id  FROM jobs\nWHERE jobs.job_url = $1::VARCHAR AND jobs.id IN ($2::INTEGER)"
+    )
+
+    assert first == "SELECT jobs.id FROM jobs WHERE jobs.job_url = ? AND jobs.id IN (...)"
+    update = fingerprint("UPDATE jobs SET title = 'it''s' WHERE id = 12")
+    assert update == "UPDATE jobs SET title = ? WHERE id = ?"
+    assert second.replace("IN (?)", "IN (...)") == first
+    assert statement_label("INSERT INTO runs (category) VALUES ($1)") == "INSERT runs"
+
+
+def test_slow_queries_are_logged_without_parameters(caplog):
+    """Test que les requêtes lentes sont journalisées sans leurs valeurs"""
+    profiler = QueryProfiler(slow_threshold=0.1)
+    with caplog.at_level(logging.WARNING, logger="france_chomage.database.profiling"):
+        statement = "SELECT * FROM jobs WHERE job_url = $1"
+        profiler.record(statement, 0.2, ("https://secret.example/job",))
+        profiler.record(statement, 0.01, ("https://other.example/job",))
+
+    assert profiler.slow_count == 1
+    (record,) = caplog.records
+    assert "secret" not in record.getMessage()
+    assert "1 params redacted" in record.getMessage()
+
+
+def test_report_orders_by_total_time():
+    """Test que le rapport liste d'abord les requêtes les plus coûteuses"""
+    profiler = QueryProfiler(slow_threshold=0)
+    for _ in range(50):
+        profiler.record("SELECT 1 FROM jobs WHERE job_url = $1", 0.002)
+    profiler.record("SELECT count(*) FROM jobs", 0.05)
+
+    top = profiler.top(2)
+    assert top[0].statement == "SELECT ? FROM jobs WHERE job_url = ?"
+    assert top[0].count == 50
+    assert "SELECT count(*) FROM jobs" in profiler.report()
+
+
+def test_engine_events_feed_the_profiler():
+    """Test que les événements du moteur alimentent les statistiques"""
+    engine = create_engine("sqlite://")
+    profiler = QueryProfiler(slow_threshold=0)
+    profiler.install(engine)
+
+    with engine.connect() as conn:
+        for value in range(3):
+            conn.execute(text("SELECT :value"), {"value": value})
+
+    (stat,) = [stat for stat in profiler.stats.values() if stat.statement == "SELECT ?"]
+    assert stat.count == 3
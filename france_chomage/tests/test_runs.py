@@ -0,0 +1,85 @@
+"""
+Tests pour l'historique des runs
+"""
+import asyncio
+
+import pytest
+
+from france_chomage.database.runs import RunRecord, RunRecorder
+
+
+class FakeRecorder(RunRecorder):
+    """RunRecorder gardant les lignes écrites en mémoire"""
+    
+    def __init__(self, *args, fail=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail = fail
+        self.batches = []
+    
+    async def _write(self, rows):
+        if self.fail:
+            raise ConnectionError("database down")
+        self.batches.append(rows)
+        return len(rows)
+
+
+class TestRunRecorder:
+    """Tests pour RunRecorder"""
+    
+    def test_record_update_ignores_unknown_keys(self):
+        """Test copie des durées et compteurs connus"""
+        run = RunRecord(category="design", operation="scrape")
+        run.update({"network_seconds": 1.5, "rows_fetched": 20, "too_old": 3})
+        run.finish()
+        
+        row = run.as_row()
+        assert row["network_seconds"] == 1.5
+        assert row["rows_fetched"] == 20
+        assert "too_old" not in row
+        assert row["finished_at"] is not None
+        assert row["duration_seconds"] >= 0
+    
+    @pytest.mark.asyncio
+    async def test_batches_are_written_in_background(self):
+        """Test écriture groupée une fois le lot plein"""
+        recorder = FakeRecorder(batch_size=3, interval=60)
+        
+        for i in range(3):
+            with recorder.track(f"cat{i}", "scrape"):
+                pass
+        
+        # Nothing is written synchronously on the hot path
+        assert recorder.batches == []
+        await asyncio.sleep(0)
+        await recorder.close()
+        
+        assert len(recorder.batches) == 1
+        assert [row["category"] for row in recorder.batches[0]] == ["cat0", "cat1", "cat2"]
+        assert recorder.written_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_interval_flushes_partial_batch(self):
+        """Test écriture d'un lot incomplet après l'intervalle"""
+        recorder = FakeRecorder(batch_size=10, interval=0.01)
+        
+        with recorder.track("design", "send") as run:
+            run.sent_count = 4
+        await asyncio.sleep(0.05)
+        
+        assert recorder.batches[0][0]["sent_count"] == 4
+        assert recorder.pending == []
+    
+    @pytest.mark.asyncio
+    async def test_error_class_recorded_and_kept_on_write_failure(self):
+        """Test classe d'erreur enregistrée et runs conservés si la base échoue"""
+        recorder = FakeRecorder(batch_size=10, interval=60, fail=True)
+        
+        with pytest.raises(asyncio.CancelledError):
+            with recorder.track("design", "scrape"):
+                raise asyncio.CancelledError()
+        
+        assert await recorder.flush() == 0
+        assert recorder.pending[0].error_class == "CancelledError"
+        
+        recorder.fail = False
+        assert await recorder.flush() == 1
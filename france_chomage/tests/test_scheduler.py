@@ -0,0 +1,314 @@
+"""
+Tests pour le scheduler asyncio
+"""
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from france_chomage import scheduler as scheduler_module
+from france_chomage.scheduler import AsyncScheduler, next_daily_run, run_operation
+
+
+class TestAsyncScheduler:
+    """Tests pour AsyncScheduler"""
+    
+    def test_next_daily_run(self):
+        """Test calcul de la prochaine exécution quotidienne"""
+        now = datetime(2024, 1, 15, 10, 30)
+        
+        assert next_daily_run(11, now=now) == datetime(2024, 1, 15, 11, 0)
+        assert next_daily_run(10, now=now) == datetime(2024, 1, 16, 10, 0)
+        assert next_daily_run(10, 30, now=now) == datetime(2024, 1, 16, 10, 30)
+    
+    @pytest.mark.asyncio
+    async def test_run_pending_dispatches_due_tasks(self):
+        """Test lancement des tâches dues et replanification"""
+        sched = AsyncScheduler()
+        daily = sched.every_day_at(5, "design", "scrape", tag="design_scrape")
+        once = sched.run_once(0, "design", "send", tag="design_send_continuation")
+        sched.every_day_at(6, "communication", "scrape", tag="communication_scrape")
+        
+        now = datetime.now()
+        daily.next_run = now - timedelta(seconds=1)
+        
+        with patch.object(sched, 'dispatch') as mock_dispatch:
+            launched = sched.run_pending(now=now + timedelta(seconds=1))
+        
+        assert launched == 2
+        assert [c.args for c in mock_dispatch.call_args_list] == [
+            ("design", "scrape"), ("design", "send")
+        ]
+        assert once not in sched.tasks
+        assert daily.next_run > now
+    
+    @pytest.mark.asyncio
+    async def test_dispatch_does_not_block(self):
+        """Test qu'une exécution lente ne bloque pas les autres"""
+        sched = AsyncScheduler()
+        release = asyncio.Event()
+        started = []
+        
+        async def fake_run(category, operation):
+            started.append(category)
+            if category == "slow":
+                await release.wait()
+        
+        with patch.object(scheduler_module, 'run_operation', fake_run):
+            slow = sched.dispatch("slow", "scrape")
+            fast = sched.dispatch("fast", "scrape")
+            await fast
+            
+            assert started == ["slow", "fast"]
+            assert not slow.done()
+            release.set()
+            await slow
+    
+    @pytest.mark.asyncio
+    async def test_run_operation_timeout(self):
+        """Test timeout par tâche"""
+        async def never_ends(category):
+            await asyncio.sleep(3600)
+        
+        with patch.object(scheduler_module, '_operation_runner', return_value=never_ends), \
+             patch.object(scheduler_module.settings, 'scrape_timeout', 0.01):
+            await run_operation("design", "scrape")
+        
+        assert "Timeout" in scheduler_module.job_stats["design"]["scrape_error"]
+    
+    @pytest.mark.asyncio
+    async def test_overlapping_triggers_are_coalesced(self):
+        """Test fusion des déclenchements pendant une exécution en cours"""
+        sched = AsyncScheduler()
+        release = asyncio.Event()
+        runs = []
+        
+        async def fake_run(category, operation):
+            runs.append((category, operation))
+            await release.wait()
+        
+        scheduler_module.job_stats.pop("design", None)
+        with patch.object(scheduler_module, 'run_operation', fake_run):
+            first = sched.dispatch("design", "scrape")
+            await asyncio.sleep(0)
+            
+            assert sched.dispatch("design", "scrape") is first
+            assert sched.dispatch("design", "scrape") is first
+            
+            release.set()
+            await first
+        
+        # Une seule relance malgré deux déclenchements concurrents
+        assert runs == [("design", "scrape"), ("design", "scrape")]
+        assert scheduler_module.job_stats["design"]["scrape_merged"] == 1
+        assert scheduler_module.job_stats["design"]["scrape_skipped"] == 1
+        assert not sched.in_flight
+    
+    @pytest.mark.asyncio
+    async def test_new_jobs_event_debounced_send(self):
+        """Test envoi déclenché après scraping, avec fenêtre de calme"""
+        sched = AsyncScheduler()
+        
+        with patch.object(scheduler_module.settings, 'send_debounce', 0.05), \
+             patch.object(sched, 'dispatch') as mock_dispatch:
+            sched.notify_new_jobs("design")
+            await asyncio.sleep(0.02)
+            sched.notify_new_jobs("design")
+            await asyncio.sleep(0.02)
+            
+            mock_dispatch.assert_not_called()
+            await asyncio.sleep(0.06)
+        
+        mock_dispatch.assert_called_once_with("design", "send")
+    
+    def test_reschedule_only_changed_categories(self):
+        """Test replanification incrémentale après rechargement de categories.yml"""
+        from france_chomage.categories import CategoryConfig
+        
+        def config(name, topic, scrape, send):
+            return CategoryConfig(
+                name, name, topic, scrape[0], scrape_hours=scrape, send_hours=send
+            )
+        
+        old = {
+            "design": config("design", 1, [10], [11]),
+            "vente": config("vente", 2, [8], [9]),
+            "sport": config("sport", 3, [6], [7]),
+        }
+        new = {
+            "design": config("design", 1, [14], [11]),
+            "vente": config("vente", 2, [8], [9]),
+            "culture": config("culture", 4, [5], [6]),
+        }
+        
+        sched = AsyncScheduler()
+        with patch.object(scheduler_module, 'scheduler', sched):
+            for name, cfg in old.items():
+                scheduler_module._schedule_operation(name, 'scrape', cfg.scrape_hours)
+                scheduler_module._schedule_operation(name, 'send', cfg.send_hours)
+            untouched = sched.get_tasks("design_send") + sched.get_tasks("vente_scrape")
+            
+            changes = scheduler_module.reschedule_changed_categories(old, new)
+        
+        assert len(changes) == 3
+        assert [t.hour for t in sched.get_tasks("design_scrape")] == [14]
+        assert not sched.get_tasks("sport_scrape") and not sched.get_tasks("sport_send")
+        assert [t.hour for t in sched.get_tasks("culture_send")] == [6]
+        # Unchanged tags keep the very same task objects
+        assert all(a is b for a, b in zip(
+            sched.get_tasks("design_send") + sched.get_tasks("vente_scrape"), untouched
+        ))
+    
+    @pytest.mark.asyncio
+    async def test_startup_warm_up_is_concurrent_and_bounded(self):
+        """Test démarrage concurrent : scrapes bornés, envoi dès la fin du scrape"""
+        from france_chomage.categories import CategoryConfig
+        
+        categories = {
+            name: CategoryConfig(name, name, i + 1, 10)
+            for i, name in enumerate(["a", "b", "c", "d", "slow"])
+        }
+        events = []
+        active = {"scrape": 0, "max": 0}
+        
+        async def fake_run(category, operation):
+            if operation == "scrape":
+                active["scrape"] += 1
+                active["max"] = max(active["max"], active["scrape"])
+                await asyncio.sleep(1 if category == "slow" else 0.01)
+                active["scrape"] -= 1
+            events.append((category, operation))
+        
+        sched = AsyncScheduler()
+        manager = scheduler_module.category_manager
+        with patch.object(scheduler_module, 'scheduler', sched), \
+             patch.object(scheduler_module, 'run_operation', fake_run), \
+             patch.object(manager, 'get_enabled_categories', return_value=categories), \
+             patch.object(scheduler_module.settings, 'skip_init_job', 0), \
+             patch.object(scheduler_module.settings, 'startup_concurrency', 2), \
+             patch.object(scheduler_module.settings, 'startup_deadline', 0.2):
+            await scheduler_module.run_startup_jobs()
+        
+            assert active["max"] == 2
+            # Each send follows its own scrape, without waiting for all scrapes
+            assert events.index(("a", "send")) < events.index(("d", "scrape"))
+            # The slow category missed the deadline: no send was started for it
+            assert ("slow", "send") not in events
+            assert ("slow", "scrape") not in events
+            await asyncio.gather(*sched.in_flight.values())
+        
+        assert ("slow", "scrape") in events
+    
+    @pytest.mark.asyncio
+    async def test_startup_warm_up_skips_caught_up_categories(self):
+        """Test que le démarrage laisse au rattrapage les catégories déjà planifiées"""
+        from france_chomage.categories import CategoryConfig
+        
+        categories = {
+            name: CategoryConfig(name, name, i + 1, 10)
+            for i, name in enumerate(["a", "b"])
+        }
+        events = []
+        
+        async def fake_run(category, operation):
+            events.append((category, operation))
+        
+        manager = scheduler_module.category_manager
+        with patch.object(scheduler_module, 'scheduler', AsyncScheduler()), \
+             patch.object(scheduler_module, 'run_operation', fake_run), \
+             patch.object(manager, 'get_enabled_categories', return_value=categories), \
+             patch.object(scheduler_module.settings, 'skip_init_job', 0):
+            await scheduler_module.run_startup_jobs(skip={"b"})
+        
+        assert events == [("a", "scrape"), ("a", "send")]
+    
+    def test_scheduler_clock(self):
+        """Test planification sur une horloge injectée (simulation accélérée)"""
+        now = [datetime(2024, 1, 15, 10, 30)]
+        sched = AsyncScheduler(clock=lambda: now[0])
+        daily = sched.every_day_at(11, "design", "scrape", tag="design_scrape")
+        once = sched.run_once(600, "design", "send", tag="design_send_continuation")
+        
+        assert daily.next_run == datetime(2024, 1, 15, 11, 0)
+        assert once.next_run == datetime(2024, 1, 15, 10, 40)
+        assert sched.seconds_until_next_run() == 600
+        
+        now[0] = datetime(2024, 1, 15, 11, 0)
+        assert sched.seconds_until_next_run() == 0
+    
+    def test_find_missed_runs_after_downtime(self):
+        """Test détection des créneaux manqués pendant un arrêt"""
+        from france_chomage.categories import CategoryConfig
+        from france_chomage.scheduler import find_missed_runs
+        
+        def utc(local):
+            return local.astimezone(timezone.utc).replace(tzinfo=None)
+        
+        now = datetime(2024, 1, 15, 9, 30)
+        categories = {
+            "design": CategoryConfig("design", "design", 1, 5, scrape_hours=[5], send_hours=[6]),
+            "vente": CategoryConfig("vente", "vente", 2, 8, scrape_hours=[8], send_hours=[10]),
+            "sport": CategoryConfig("sport", "sport", 3, 7, scrape_hours=[7], send_hours=[8]),
+            "culture": CategoryConfig("culture", "culture", 4, 4, scrape_hours=[4], send_hours=[5]),
+        }
+        last_successes = {
+            # Down since yesterday evening: both design runs were missed
+            ("design", "scrape"): utc(datetime(2024, 1, 14, 20, 0)),
+            ("design", "send"): utc(datetime(2024, 1, 14, 20, 0)),
+            # Scrape done today at 08:00; yesterday's 10:00 send happened
+            ("vente", "scrape"): utc(datetime(2024, 1, 15, 8, 0, 5)),
+            ("vente", "send"): utc(datetime(2024, 1, 14, 10, 0, 5)),
+            # Ran on time
+            ("sport", "scrape"): utc(datetime(2024, 1, 15, 7, 0, 1)),
+        }
+        
+        missed = find_missed_runs(categories, last_successes, now=now, window_hours=24)
+        
+        # culture never ran: no history, no catch-up
+        assert [(name, op) for _, name, op in missed] == [("design", "scrape"), ("design", "send")]
+        assert missed[0][0] == datetime(2024, 1, 15, 5, 0)
+        
+        assert find_missed_runs(categories, last_successes, now=now, window_hours=2) == []
+    
+    @pytest.mark.asyncio
+    async def test_drain_waits_then_cancels(self):
+        """Test arrêt propre : attente des exécutions puis annulation après le délai"""
+        sched = AsyncScheduler()
+        finished, cancelled = [], []
+        
+        async def fake_run(category, operation):
+            try:
+                await asyncio.sleep(0.01 if category == "fast" else 3600)
+                finished.append(category)
+            except asyncio.CancelledError:
+                cancelled.append(category)
+                raise
+        
+        with patch.object(scheduler_module, 'run_operation', fake_run):
+            sched.dispatch("fast", "send")
+            sched.dispatch("stuck", "scrape")
+            sched.stop()
+            
+            assert await sched.drain(timeout=0.1) == 1
+        
+        assert finished == ["fast"]
+        assert cancelled == ["stuck"]
+        assert not sched.in_flight
+    
+    @pytest.mark.asyncio
+    async def test_force_stop_cuts_drain_short(self):
+        """Test second signal : le drain n'attend plus le délai"""
+        sched = AsyncScheduler()
+        
+        async def fake_run(category, operation):
+            await asyncio.sleep(3600)
+        
+        with patch.object(scheduler_module, 'run_operation', fake_run):
+            sched.dispatch("stuck", "scrape")
+            sched.stop()
+            asyncio.get_running_loop().call_later(0.05, sched.force_stop)
+            
+            started = asyncio.get_running_loop().time()
+            assert await sched.drain(timeout=60) == 1
+        
+        assert asyncio.get_running_loop().time() - started < 5
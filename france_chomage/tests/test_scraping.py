@@ -5,7 +5,10 @@ import pytest
 from unittest.mock import Mock, AsyncMock, patch
 import pandas as pd
 
+from france_chomage.metrics import SCRAPE_BLOCKED
+from france_chomage.scraping.base import format_stage_timings
 from france_chomage.scraping.category_scraper import CategoryScraper, create_category_scraper
+from france_chomage.scraping.providers import JobProvider
 from france_chomage.categories import CategoryConfig
 from france_chomage.models import Job
 
@@ -115,6 +118,32 @@ class TestScraperBase:
         assert len(jobs) == 2
         assert all(isinstance(job, Job) for job in jobs)
     
+    @pytest.mark.asyncio
+    @patch('france_chomage.scraping.base.asyncio.sleep', new_callable=AsyncMock)
+    async def test_injected_provider_sites_and_manager(
+        self, mock_sleep, tmp_path, monkeypatch, sample_dataframe, communication_config
+    ):
+        """Test fournisseur, sites et gestionnaire d'offres injectés sur le scraper"""
+        monkeypatch.chdir(tmp_path)
+        requested = []
+        
+        class Provider(JobProvider):
+            async def fetch(self, category, params):
+                requested.append(params['site_name'])
+                return sample_dataframe
+        
+        manager = Mock()
+        manager.process_scraped_jobs = AsyncMock(side_effect=lambda **kwargs: (kwargs['jobs'], 0))
+        scraper = CategoryScraper(communication_config)
+        scraper.provider, scraper.sites, scraper.manager = Provider(), ("linkedin",), manager
+        
+        jobs = await scraper.scrape()
+        
+        assert requested == [["linkedin"]]
+        assert len(jobs) == 2
+        assert scraper.new_jobs_count == 2
+        manager.process_scraped_jobs.assert_awaited_once()
+    
     @pytest.mark.asyncio
     @patch('france_chomage.scraping.base.asyncio.get_event_loop')
     @patch('france_chomage.scraping.base.get_sites_for_environment')
@@ -135,6 +164,54 @@ class TestScraperBase:
         # Vérification que les retries ont été tentés
         assert mock_executor.call_count == 3  # max_retries par défaut
     
+    @pytest.mark.asyncio
+    @patch('france_chomage.scraping.base.asyncio.sleep', new_callable=AsyncMock)
+    @patch('france_chomage.scraping.base.asyncio.get_event_loop')
+    @patch('france_chomage.scraping.base.get_sites_for_environment')
+    async def test_stage_timings_with_fallback(
+        self, mock_sites, mock_loop, mock_sleep, sample_dataframe, communication_config
+    ):
+        """Test durées par étape, réseau par site lors du fallback LinkedIn"""
+        mock_sites.return_value = ("indeed", "linkedin")
+        mock_loop.return_value.run_in_executor = AsyncMock(
+            side_effect=[Exception("403 Forbidden"), sample_dataframe]
+        )
+        
+        scraper = CategoryScraper(communication_config)
+        scraper.stats = {}
+        blocked = {
+            site: SCRAPE_BLOCKED.get(category=scraper.job_type, site=site)
+            for site in mock_sites.return_value
+        }
+        jobs = await scraper._scrape_with_retry()
+        timings = scraper.timings()
+        
+        # Un label par site, pas "indeed,linkedin"
+        for site in mock_sites.return_value:
+            assert SCRAPE_BLOCKED.get(category=scraper.job_type, site=site) == blocked[site] + 1
+        assert SCRAPE_BLOCKED.get(category=scraper.job_type, site="indeed,linkedin") == 0
+        
+        assert len(jobs) == 2
+        assert mock_sleep.await_count == 1
+        assert set(timings) >= {
+            "sleep", "network", "parse", "filter", "dedup", "insert", "backup",
+            "network.indeed", "network.linkedin"
+        }
+        assert timings["network.linkedin"] >= timings["network.indeed"]
+        assert scraper.stats["rows_fetched"] == 2
+    
+    def test_format_stage_timings(self):
+        """Test le résumé des durées sur une ligne"""
+        line = format_stage_timings({
+            "sleep": 3.04, "network": 20.4, "network.indeed": 12.0, "network.linkedin": 8.4,
+            "insert": 1.25
+        })
+        
+        assert line == (
+            "sleep 3.0s, network 20.4s (indeed 12.0s, linkedin 8.4s), parse 0.0s, "
+            "filter 0.0s, dedup 0.0s, insert 1.2s, backup 0.0s"
+        )
+    
     @pytest.mark.asyncio
     async def test_save_jobs(self, tmp_path, communication_config):
         """Test sauvegarde des jobs"""
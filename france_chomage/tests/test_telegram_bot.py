@@ -31,6 +31,8 @@ def mock_settings():
     with patch('france_chomage.telegram.bot.settings') as mock:
         mock.telegram_bot_token = "test_token_123"
         mock.telegram_group_id = "-1001234567890"
+        mock.telegram_base_url = "https://api.telegram.org/bot"
+        mock.telegram_max_retry_after = 3
         yield mock
 
 class TestTelegramJobBot:
@@ -192,3 +194,109 @@ class TestTelegramJobBot:
         # Le titre affiché doit être tronqué
         assert job.display_title in message
         assert len(job.display_title) <= 83  # 80 + "..."
+    
+    @pytest.mark.asyncio
+    async def test_send_job_uses_prerendered_message(self, mock_settings, sample_job):
+        """Test utilisation du message pré-rendu stocké en base"""
+        from france_chomage.formatting import MESSAGE_TEMPLATE_VERSION
+        
+        bot = TelegramJobBot()
+        bot.bot = AsyncMock()
+        sample_job.message_markdown = "*pré\\-rendu*"
+        sample_job.message_plain = "pré-rendu"
+        sample_job.message_version = MESSAGE_TEMPLATE_VERSION
+        
+        with patch.object(bot, 'format_job_message') as mock_format:
+            result = await bot.send_job(sample_job, topic_id=123, job_type="communication")
+        
+        assert result == True
+        mock_format.assert_not_called()
+        assert bot.bot.send_message.call_args.kwargs['text'] == "*pré\\-rendu*"
+    
+    def test_get_job_messages_stale_version(self, mock_settings, sample_job):
+        """Test re-formatage si le gabarit stocké est obsolète"""
+        bot = TelegramJobBot()
+        sample_job.message_markdown = "ancien"
+        sample_job.message_plain = "ancien"
+        sample_job.message_version = 0
+        
+        markdown, plain = bot.get_job_messages(sample_job, "communication")
+        
+        assert markdown == bot.format_job_message(sample_job, "communication")
+        assert "\\" not in plain
+        assert "*" not in plain
+    
+    @pytest.mark.asyncio
+    @patch('asyncio.sleep', new_callable=AsyncMock)
+    async def test_send_jobs_from_database_marks_incrementally(self, mock_sleep, mock_settings):
+        """Test marquage des envois par petits lots pendant la boucle"""
+        from france_chomage.database.manager import JobManager
+        
+        mock_settings.send_mark_batch_size = 2
+        mock_settings.send_mark_interval = 3600
+        mock_settings.send_max_per_run = 10
+        mock_settings.send_page_size = 10
+        mock_settings.send_run_budget = 3600
+        
+        jobs = []
+        for job_id in (1, 2, 3):
+            job = DBJob()
+            job.id = job_id
+            job.title = f"Job {job_id}"
+            jobs.append(job)
+        
+        manager = JobManager()
+        manager.get_unsent_jobs = AsyncMock(return_value=jobs)
+        manager.count_unsent_jobs = AsyncMock(return_value=len(jobs))
+        manager.mark_jobs_as_sent = AsyncMock(side_effect=lambda ids: len(ids))
+        
+        bot = TelegramJobBot()
+        bot.send_job = AsyncMock(return_value=True)
+        
+        with patch('france_chomage.telegram.bot.job_manager', manager):
+            result = await bot.send_jobs_from_database("communication", topic_id=123)
+        
+        assert result == 3
+        calls = [call.args[0] for call in manager.mark_jobs_as_sent.call_args_list]
+        assert calls == [[1, 2], [3]]
+    
+    @pytest.mark.asyncio
+    @patch('asyncio.sleep', new_callable=AsyncMock)
+    async def test_send_jobs_from_database_caps_run(self, mock_sleep, mock_settings):
+        """Test plafond d'envois par exécution et reliquat pour la suite"""
+        from france_chomage.database.manager import JobManager
+        
+        mock_settings.send_mark_batch_size = 10
+        mock_settings.send_mark_interval = 3600
+        mock_settings.send_max_per_run = 2
+        mock_settings.send_page_size = 2
+        mock_settings.send_run_budget = 3600
+        
+        jobs = []
+        for job_id in range(1, 6):
+            job = DBJob()
+            job.id = job_id
+            job.title = f"Job {job_id}"
+            job.date_posted = date(2024, 1, 20 - job_id)
+            job.created_at = None
+            jobs.append(job)
+        
+        async def get_page(category, max_age_days=30, limit=None, after=None):
+            start = 0 if after is None else [j.id for j in jobs].index(after[2]) + 1
+            return jobs[start:start + limit]
+        
+        manager = JobManager()
+        manager.get_unsent_jobs = AsyncMock(side_effect=get_page)
+        manager.count_unsent_jobs = AsyncMock(return_value=len(jobs))
+        manager.mark_jobs_as_sent = AsyncMock(side_effect=lambda ids: len(ids))
+        
+        bot = TelegramJobBot()
+        bot.send_job = AsyncMock(return_value=True)
+        
+        with patch('france_chomage.telegram.bot.job_manager', manager):
+            result = await bot.send_jobs_from_database("communication", topic_id=123)
+        
+        assert result == 2
+        sent_ids = [call.args[0].id for call in bot.send_job.call_args_list]
+        assert sent_ids == [1, 2]
+        assert bot.unsent_backlog["communication"] == 3
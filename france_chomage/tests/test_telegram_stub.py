@@ -0,0 +1,91 @@
+"""
+Tests du serveur local imitant l'API Bot Telegram
+"""
+import pytest
+from unittest.mock import patch
+from telegram import Bot
+from telegram.error import BadRequest, RetryAfter
+
+from france_chomage.telegram.bot import TelegramJobBot
+from france_chomage.telegram.stub_server import StubTelegramServer
+from france_chomage.database.models import Job as DBJob
+
+
+@pytest.fixture
+def stub_job():
+    """Job minimal pour les envois"""
+    job = DBJob()
+    job.id = 1
+    job.title = "Développeur Python"
+    job.message_markdown = None
+    return job
+
+
+def make_bot(server: StubTelegramServer) -> TelegramJobBot:
+    """TelegramJobBot pointé vers le serveur local"""
+    with patch('france_chomage.telegram.bot.settings') as mock:
+        mock.telegram_bot_token = "123:stub"
+        mock.telegram_group_id = "-1001234567890"
+        mock.telegram_base_url = server.base_url
+        mock.telegram_max_retry_after = 3
+        return TelegramJobBot()
+
+
+class TestStubTelegramServer:
+    """Tests pour StubTelegramServer"""
+    
+    @pytest.mark.asyncio
+    async def test_get_me_and_send_message(self):
+        """Test getMe et sendMessage via python-telegram-bot"""
+        with StubTelegramServer() as server:
+            bot = Bot(token="123:stub", base_url=server.base_url)
+            
+            me = await bot.get_me()
+            message = await bot.send_message(chat_id=-100123, message_thread_id=7, text="Bonjour")
+            
+            assert me.username == "france_chomage_stub_bot"
+            assert message.text == "Bonjour"
+            assert server.stats["messages_sent"] == 1
+            assert server.messages[0]["message_thread_id"] == 7
+    
+    @pytest.mark.asyncio
+    async def test_injected_errors(self):
+        """Test erreurs 429 et parsing MarkdownV2 injectées"""
+        with StubTelegramServer(retry_after_rate=1.0) as server:
+            bot = Bot(token="123:stub", base_url=server.base_url)
+            with pytest.raises(RetryAfter):
+                await bot.send_message(chat_id=-100123, text="x")
+        
+        with StubTelegramServer(parse_error_rate=1.0) as server:
+            bot = Bot(token="123:stub", base_url=server.base_url)
+            with pytest.raises(BadRequest):
+                await bot.send_message(chat_id=-100123, text="x", parse_mode="MarkdownV2")
+            # Le texte brut n'est pas concerné
+            await bot.send_message(chat_id=-100123, text="x")
+            assert server.stats["parse_errors"] == 1
+            assert server.stats["messages_sent"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_send_job_markdown_fallback(self, stub_job):
+        """Test fallback texte brut de TelegramJobBot sur erreur de parsing"""
+        with StubTelegramServer(parse_error_rate=1.0) as server:
+            bot = make_bot(server)
+            bot.get_job_messages = lambda job, job_type: ("*x*", "x")
+            
+            assert await bot.send_job(stub_job, topic_id=7, job_type="communication")
+            assert server.messages[-1]["text"] == "x"
+    
+    @pytest.mark.asyncio
+    async def test_send_job_retry_after_backoff(self, stub_job):
+        """Test attente puis nouvel essai sur 429 RetryAfter"""
+        with StubTelegramServer(retry_after_rate=0.5, seed=3) as server:
+            bot = make_bot(server)
+            bot.get_job_messages = lambda job, job_type: ("*x*", "x")
+            
+            with patch('france_chomage.telegram.bot.settings') as mock:
+                mock.telegram_max_retry_after = 10
+                sent = [await bot.send_job(stub_job, topic_id=7, job_type="c") for _ in range(3)]
+            
+            assert all(sent)
+            assert server.stats["retry_after"] > 0
+            assert server.stats["messages_sent"] == 3
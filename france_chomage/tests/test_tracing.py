@@ -0,0 +1,79 @@
+"""
+Tests des spans de tracing
+"""
+import asyncio
+import json
+
+import pytest
+
+from france_chomage import tracing
+from france_chomage.tracing import span, traced
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracing.configure("file", str(path))
+    yield path
+    tracing.configure("off")
+
+
+def _read(path):
+    tracing.exporter.close()
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_spans_nest_and_inherit_category(trace_file):
+    """Test que les spans enfants partagent la trace et la catégorie"""
+    with span("scrape", category="design"):
+        with span("scrape.fetch", site="linkedin"):
+            pass
+
+    fetch, scrape = _read(trace_file)
+    assert scrape["parent_id"] is None
+    assert fetch["parent_id"] == scrape["span_id"]
+    assert fetch["trace_id"] == scrape["trace_id"]
+    assert fetch["attributes"] == {"category": "design", "site": "linkedin"}
+    assert fetch["status"] == "ok"
+
+
+def test_span_records_error(trace_file):
+    """Test qu'une exception marque le span en erreur"""
+    with pytest.raises(ValueError):
+        with span("scrape.parse"):
+            raise ValueError("bad row")
+
+    (record,) = _read(trace_file)
+    assert record["status"] == "error"
+    assert record["error"] == "ValueError"
+
+
+@pytest.mark.asyncio
+async def test_traced_keeps_concurrent_traces_apart(trace_file):
+    """Test que des runs concurrents gardent des traces séparées"""
+    @traced("db.query")
+    async def query():
+        await asyncio.sleep(0.01)
+
+    async def run(category):
+        with span("send", category=category):
+            await query()
+
+    await asyncio.gather(run("design"), run("vente"))
+
+    records = _read(trace_file)
+    roots = {r["span_id"]: r for r in records if r["name"] == "send"}
+    for record in (r for r in records if r["name"] == "db.query"):
+        parent = roots[record["parent_id"]]
+        assert record["trace_id"] == parent["trace_id"]
+        assert record["attributes"]["category"] == parent["attributes"]["category"]
+
+
+def test_spans_are_noops_when_off(tmp_path):
+    """Test qu'aucun span n'est exporté quand le tracing est désactivé"""
+    tracing.configure("off", str(tmp_path / "traces.jsonl"))
+    with span("scrape", category="design") as current:
+        current.set_attribute("rows", 3)
+
+    assert tracing.current_span() is None
+    assert not (tmp_path / "traces.jsonl").exists()
@@ -0,0 +1,57 @@
+"""
+Tests du watchdog de la boucle d'événements
+"""
+import asyncio
+import logging
+import sys
+import time
+
+import pytest
+
+from france_chomage.metrics import EVENT_LOOP_BLOCKED
+from france_chomage.watchdog import LoopWatchdog, blocking_location
+
+
+def _blocking_parse():
+    time.sleep(0.4)
+
+
+def test_blocking_location_prefers_project_frames():
+    """Test que l'emplacement pointe vers le code du projet"""
+    expected = "test_watchdog.py:test_blocking_location_prefers_project_frames"
+    assert blocking_location(sys._getframe()) == expected
+
+
+@pytest.mark.asyncio
+async def test_watchdog_reports_blocking_callback(caplog):
+    """Test qu'un appel bloquant est journalisé avec sa pile et compté"""
+    location = "test_watchdog.py:_blocking_parse"
+    before = EVENT_LOOP_BLOCKED.get(location=location)
+    watchdog = LoopWatchdog(threshold=0.1, interval=0.02)
+    task = asyncio.create_task(watchdog.run())
+    await asyncio.sleep(0.05)
+
+    with caplog.at_level(logging.WARNING, logger="france_chomage.watchdog"):
+        _blocking_parse()
+        await asyncio.sleep(0.05)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert watchdog.stalls == 1
+    assert EVENT_LOOP_BLOCKED.get(location=location) == before + 1
+    assert any("_blocking_parse" in record.getMessage() for record in caplog.records)
+    assert any("unblocked" in record.getMessage() for record in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_watchdog_quiet_when_loop_is_free(caplog):
+    """Test qu'aucune alerte n'est émise sans blocage"""
+    watchdog = LoopWatchdog(threshold=0.2, interval=0.02)
+    task = asyncio.create_task(watchdog.run())
+    with caplog.at_level(logging.WARNING, logger="france_chomage.watchdog"):
+        await asyncio.sleep(0.3)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert watchdog.stalls == 0
+    assert not caplog.records
@@ -0,0 +1,176 @@
+"""
+Opt-in tracing spans for the scrape → persist → send pipeline
+
+`span(name, **attributes)` times a block and `traced(name)` an async
+function. Spans nest through a context variable, so concurrent runs keep
+separate traces, and children inherit the `category` of their parent.
+Finished spans are exported as one JSON object per line to TRACE_FILE
+(TRACE_EXPORT=file) or to the log (TRACE_EXPORT=console); no collector
+is needed. With TRACE_EXPORT=off (default) spans cost a function call.
+"""
+import atexit
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from france_chomage.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MODES = ("off", "console", "file")
+INHERITED_ATTRIBUTES = ("category",)
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "attributes",
+        "start", "_started", "duration", "error"
+    )
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = {
+            key: parent.attributes[key]
+            for key in INHERITED_ATTRIBUTES
+            if parent and key in parent.attributes
+        }
+        self.attributes.update(attributes)
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self._started
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": datetime.fromtimestamp(self.start, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Returned when tracing is off"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Optional[Span]] = ContextVar("france_chomage_span", default=None)
+
+
+class SpanExporter:
+    """Writes finished spans as JSON lines to a file or the log"""
+
+    def __init__(self, mode: str = "off", path: str = "traces.jsonl"):
+        if mode not in EXPORT_MODES:
+            raise ValueError(f"Unknown trace export '{mode}', expected one of {EXPORT_MODES}")
+        self.mode = mode
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.as_dict(), ensure_ascii=False, default=str)
+        if self.mode == "console":
+            logger.info("🔭 %s", line)
+            return
+        with self._lock:
+            if self._file is None:
+                # Buffered appends, written out by the OS buffer or at close()
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+exporter = SpanExporter(settings.trace_export, settings.trace_file)
+
+
+def configure(mode: str, path: Optional[str] = None) -> SpanExporter:
+    """Replace the global exporter (CLI flags, tests)"""
+    global exporter
+    exporter.close()
+    exporter = SpanExporter(mode, path or settings.trace_file)
+    return exporter
+
+
+atexit.register(lambda: exporter.close())
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Time the enclosed block as a child of the current span"""
+    if not exporter.enabled:
+        yield _NOOP_SPAN
+        return
+
+    current = Span(name, _current_span.get(), attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = type(exc).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+        try:
+            exporter.export(current)
+        except Exception as exc:
+            logger.debug("Span export failed: %s", exc)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorate an async function so each call is a span"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not exporter.enabled:
+                return await func(*args, **kwargs)
+            with span(span_name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+    return decorator
+
@@ -0,0 +1,88 @@
+"""
+Event loop watchdog: finds synchronous work that blocks the scheduler
+
+A coroutine ticks every `interval` seconds and a background thread checks
+the tick. When the loop has not ticked for `threshold` seconds, the thread
+logs the stack of the event loop thread, i.e. the callback blocking it, and
+counts the blocking location in `france_chomage_event_loop_blocked_total`.
+Opt-in with LOOP_WATCHDOG_THRESHOLD; the cost is one wake-up per interval.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from types import FrameType
+from typing import Optional
+
+from france_chomage.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_STALL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_DIR = str(Path(__file__).resolve().parent)
+
+
+def blocking_location(frame: FrameType) -> str:
+    """`file.py:function` of the innermost project frame (else the innermost frame)"""
+    innermost = frame
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(PACKAGE_DIR):
+            break
+        frame = frame.f_back
+    frame = frame or innermost
+    return f"{Path(frame.f_code.co_filename).name}:{frame.f_code.co_name}"
+
+
+class LoopWatchdog:
+    """Reports event loop stalls longer than `threshold` seconds with their stack"""
+
+    def __init__(self, threshold: float = 0.5, interval: float = 0.1):
+        self.threshold = threshold
+        self.interval = min(interval, threshold / 2)
+        self.stalls = 0
+        self._last_tick = time.monotonic()
+        self._stall_reported = False
+        self._loop_thread: Optional[int] = None
+        self._stop = threading.Event()
+
+    async def run(self) -> None:
+        """Tick forever and watch the ticks from a background thread"""
+        self._loop_thread = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop.clear()
+        thread = threading.Thread(target=self._watch, daemon=True, name="loop-watchdog")
+        thread.start()
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                now = time.monotonic()
+                if self._stall_reported:
+                    stalled = now - self._last_tick - self.interval
+                    EVENT_LOOP_STALL_SECONDS.observe(stalled)
+                    logger.warning("🐢 Event loop unblocked after %.2fs", stalled)
+                    self._stall_reported = False
+                self._last_tick = now
+        finally:
+            self._stop.set()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            stalled = time.monotonic() - self._last_tick - self.interval
+            if stalled >= self.threshold and not self._stall_reported:
+                self._stall_reported = True
+                self._report(stalled)
+
+    def _report(self, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return
+        location = blocking_location(frame)
+        self.stalls += 1
+        EVENT_LOOP_BLOCKED.inc(location=location)
+        logger.warning(
+            "🐢 Event loop blocked for %.2fs in %s:\n%s",
+            stalled, location, "".join(traceback.format_stack(frame)),
+            extra={"blocking_location": location}
+        )